@@ -1,34 +1,79 @@
-import json
+import asyncio
 import logging
 import os
-import pandas as pd
 
 from datetime import datetime
-from fastmcp import FastMCP
+from fastmcp import Context, FastMCP
 from pathlib import Path
-from typing import Optional
-
-from google.cloud import secretmanager
-
-from sayou.stock.opendart import OpenDartCrawler
+from typing import AsyncIterator, Optional
+
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from utils.aio_client import AsyncOpenDartClient
+from utils.cache import ResponseCache, Revalidator
+from utils.changefeed import ChangeFeed
+from utils.columnar import to_records
+from utils.corp_refresh import CorpCodeRefresher
+from utils.disclosures import MAX_PAGE_COUNT, DisclosureStream, search_disclosures
+from utils.docstore import DocumentStore
+from utils.executor import CrawlerExecutor
+from utils.factstore import FactStore
+from utils.filing_index import FilingIndex
+from utils.http import http_stats
+from utils.period import PeriodResolver
+from utils.prefetch import FilingPrefetcher
+from utils.ratelimit import BACKGROUND, RateLimiter, priority
+from utils.runtime import OpenDartRuntime
+from utils.singleflight import SingleFlight
+from utils.viewer import DocumentViewer
+from utils.xbrl import parse_package, statement_labels
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(format="[%(levelname)s]: %(message)s", level=logging.INFO)
 
-sm_client = secretmanager.SecretManagerServiceClient()
-name = "projects/1037372895180/secrets/DART_API_KEY/versions/latest"
-response = sm_client.access_secret_version(name=name)
-dart_api_key = response.payload.data.decode("UTF-8")
-print(f"DART API Key: {dart_api_key}")
-os.environ["DART_API_KEY"] = dart_api_key
-
-corpcode_filename = "corpcode.json"
-    
-# OpenDartCrawler를 초기화
-crawler = OpenDartCrawler(api_key=dart_api_key)
-if not crawler.corp_data:
-    corp_data = crawler.corp_data
-    crawler.save_corp_data(corpcode_filename)
+# 모든 DART API 요청의 속도 및 일일 한도 제한
+limiter = RateLimiter()
+# OpenDartCrawler는 처음 사용할 때(또는 서버 시작 후 warmup에서) 초기화
+runtime = OpenDartRuntime(limiter=limiter)
+# 동기식 크롤러 호출을 실행할 작업자 풀
+executor = CrawlerExecutor()
+# 공시 원본(문서, XBRL, PDF, 뷰어 페이지)의 내용 주소 저장소 (로컬 LRU + GCS)
+docstore = DocumentStore(executor=executor)
+# 이벤트 루프에서 DART API를 호출하는 비동기 클라이언트 (OPENDART_ASYNC_CLIENT=0이면 작업자 풀 사용)
+aio_client = AsyncOpenDartClient(runtime, store=docstore)
+# 공시가 존재하는 최근 분기 탐색
+resolver = PeriodResolver()
+# (corp_code, 보고서 유형, 연도, 분기)별 공시 제출 여부
+filing_index = FilingIndex()
+# OpenDART 응답 캐시 (LRU + GCS)
+cache = ResponseCache()
+# 오래된 캐시 항목의 백그라운드 갱신
+revalidator = Revalidator()
+# 동일한 동시 요청의 업스트림 호출 병합
+flights = SingleFlight()
+# 기업코드 목록의 주기적 증분 갱신
+corp_refresher = CorpCodeRefresher(runtime)
+# 공시 문서의 목차 항목별 조회 (rcpNo, eleId 단위 캐시)
+viewer = DocumentViewer(aio_client, cache, executor, flights)
+# 재무제표 원본파일(XBRL)의 팩트 인덱스 (기업별 Parquet)
+factstore = FactStore()
+# 새 공시 확인 및 영향을 받는 캐시 항목 무효화 (접수번호 워터마크)
+changefeed = ChangeFeed(aio_client, cache, filing_index)
+# 관심 종목 정기보고서 미리 조회
+prefetcher = FilingPrefetcher(aio_client, filing_index, limiter, resolve=lambda stock: _corp_code(stock), warm=lambda *args: _prefetch(*args))
+
+# 배치 도구: DART 다중회사 API의 요청당 최대 회사 수, 회사별 조회 동시 실행 수
+BATCH_CHUNK_SIZE = 100
+BATCH_CONCURRENCY = int(os.getenv("OPENDART_BATCH_CONCURRENCY", "8"))
+# 공시검색 도구 호출 한 번에 요청하는 최대 페이지 수
+DISCLOSURE_MAX_PAGES = int(os.getenv("OPENDART_DISCLOSURE_MAX_PAGES", "10"))
+# 배치 보고서 유형: (다중회사 메서드, 단일회사 메서드)
+BATCH_REPORTS = {
+    "main_accounts": ("multi_company_main_accounts", "single_company_main_accounts"),
+    "key_indicators": ("multi_company_key_financial_indicators", "single_company_key_financial_indicators"),
+    "financial_statements": (None, "financial_statements"),
+}
 
 mcp = FastMCP("OpenDart MCP Server")
 
@@ -54,7 +99,7 @@ mcp = FastMCP("OpenDart MCP Server")
     """,
     tags={"opendart", "fundamentals", "korea", "standardized", "cached"}
 )
-async def find_opendart_finance(stock: str, year: Optional[int] = None, quarter: Optional[int] = None):
+async def find_opendart_finance(stock: str, year: Optional[int] = None, quarter: Optional[int] = None, use_cache: bool = True):
     """
     OpenDART에서 한국 주식 재무제표 3종을 수집합니다.
 
@@ -62,6 +107,7 @@ async def find_opendart_finance(stock: str, year: Optional[int] = None, quarter:
         stock: 종목 코드 (예: "005930", "삼성전자")
         year: 연도
         quarter: 분기
+        use_cache: 캐시 사용 여부
 
     Returns:
         dict: 재무제표 3종
@@ -72,33 +118,21 @@ async def find_opendart_finance(stock: str, year: Optional[int] = None, quarter:
     """
     logger.info(f">>> 🛠️ Tool: 'find_opendart_finance' called for '{stock}'")
 
+    async with executor.limit("find_opendart_finance"):
+        return await _find_finance(stock, year, quarter, use_cache)
+
+async def _find_finance(stock: str, year: Optional[int] = None, quarter: Optional[int] = None, use_cache: bool = True):
+    """Find financial statements of a company."""
+
     # 년도와 분기 정보가 있는지 확인하고, 
     # 없으면 오늘 기준으로 이전 분기를 설정합니다.
     is_date = year is not None and quarter is not None
     year, quarter = _year_quarter(year, quarter)
 
-    if not crawler.corp_data:
-        corp_data = crawler.corp_data
-        crawler.save_corp_data(corpcode_filename)
-
-    corp_code = crawler.fetch_corp_code(stock)
+    corp_code = await _corp_code(stock)
 
     # 단일회사 전체 재무제표
-    count = 1
-    while True:
-        logger.info(f"fetching finance data: {year}Q{quarter}")
-        data = crawler.financial_statements(corp_code, year, quarter=quarter)
-        if is_date or len(data) > 0 or count > 4:
-            break
-        quarter = quarter - 1 if quarter > 1 else 4
-        year = year - 1 if quarter == 4 else year
-        count += 1
-
-    outputs = []
-    for item in data:
-        outputs.append(item.to_dict())
-
-    return outputs
+    return await _latest("financial_statements", corp_code, year, quarter, exact=is_date, use_cache=use_cache)
 
 
 @mcp.tool(
@@ -121,7 +155,7 @@ async def find_opendart_finance(stock: str, year: Optional[int] = None, quarter:
     """,
     tags={"opendart", "dividend", "korea", "standardized", "cached"}
 )
-async def find_opendart_dividend(stock: str, year: Optional[int] = None, quarter: Optional[int] = None):
+async def find_opendart_dividend(stock: str, year: Optional[int] = None, quarter: Optional[int] = None, use_cache: bool = True):
     """
     OpenDART에서 한국 주식 배당 정보를 수집합니다.
 
@@ -129,6 +163,7 @@ async def find_opendart_dividend(stock: str, year: Optional[int] = None, quarter
         stock: 종목 코드 (예: "005930", "삼성전자")
         year: 연도
         quarter: 분기
+        use_cache: 캐시 사용 여부
 
     Returns:
         dict: 배당 정보
@@ -139,13 +174,8 @@ async def find_opendart_dividend(stock: str, year: Optional[int] = None, quarter
     """
     logger.info(f">>> 🛠️ Tool: 'find_opendart_dividend' called for '{stock}'")
 
-    data = _find_dividend(stock, year, quarter)
-
-    outputs = []
-    for item in data:
-        outputs.append(item.to_dict())
-
-    return outputs
+    async with executor.limit("find_opendart_dividend"):
+        return await _find_dividend(stock, year, quarter, use_cache)
 
 @mcp.tool(
     name="find_opendart_compensation",
@@ -167,7 +197,7 @@ async def find_opendart_dividend(stock: str, year: Optional[int] = None, quarter
     """,
     tags={"opendart", "dividend", "korea", "standardized", "cached"}
 )
-async def find_opendart_compensation(stock: str, year: Optional[int] = None, quarter: Optional[int] = None):
+async def find_opendart_compensation(stock: str, year: Optional[int] = None, quarter: Optional[int] = None, use_cache: bool = True):
     """
     OpenDART에서 기업의 이사 및 감사 보수 정보를 수집합니다.
 
@@ -175,6 +205,7 @@ async def find_opendart_compensation(stock: str, year: Optional[int] = None, qua
         year: 연도
         quarter: 분기
         stock: 종목 코드 (예: "005930", "삼성전자")
+        use_cache: 캐시 사용 여부
 
     Returns:
         dict: 이사 및 감사 보수 정보
@@ -185,60 +216,497 @@ async def find_opendart_compensation(stock: str, year: Optional[int] = None, qua
     """
     logger.info(f">>> 🛠️ Tool: 'find_opendart_compensation' called for '{stock}'")
 
+    async with executor.limit("find_opendart_compensation"):
+        return await _find_compensation(stock, year, quarter, use_cache)
+
+async def _find_compensation(stock: str, year: Optional[int] = None, quarter: Optional[int] = None, use_cache: bool = True):
+    """Find director's compensation of a company."""
+
     is_date = year is not None and quarter is not None
     year, quarter = _year_quarter(year, quarter)
 
-    if not crawler.corp_data:
-        corp_data = crawler.corp_data
-        crawler.save_corp_data(corpcode_filename)
+    corp_code = await _corp_code(stock)
 
-    corp_code = crawler.fetch_corp_code(stock)
+    # 이사·감사의 개인별 보수현황(5억원 이상)
+    # 이사·감사 전체의 보수현황(보수지급금액 - 이사·감사 전체)
+    # 개인별 보수지급 금액(5억이상 상위5인)
+    results = await asyncio.gather(
+        _latest("director_compensation", corp_code, year, quarter, exact=is_date, use_cache=use_cache),
+        _latest("total_director_compensation", corp_code, year, quarter, exact=is_date, use_cache=use_cache),
+        _latest("top5_director_compensation", corp_code, year, quarter, exact=is_date, use_cache=use_cache),
+    )
 
     outputs = []
+    for data in results:
+        outputs.extend(data)
 
-    # 이사·감사의 개인별 보수현황(5억원 이상)
-    count = 1
-    while True:
-        logger.info(f"fetching finance data: {year}Q{quarter}")
-        data = crawler.director_compensation(corp_code, year=year, quarter=quarter)
-        if is_date or len(data) > 0 or count > 4:
-            break
-        quarter = quarter - 1 if quarter > 1 else 4
-        year = year - 1 if quarter == 4 else year
-        count += 1
+    return outputs
 
-    for item in data:
-        outputs.append(item.to_dict())
+@mcp.tool(
+    name="find_opendart_finance_batch",
+    description="""OpenDART에서 여러 기업의 재무 정보를 한 번에 수집합니다.
+    사용 대상:
+    - 종목 코드/기업명 목록: ["005930", "000660.KS", "카카오"]
 
-    # 이사·감사 전체의 보수현황(보수지급금액 - 이사·감사 전체)
-    count = 1
-    while True:
-        logger.info(f"fetching finance data: {year}Q{quarter}")
-        data = crawler.total_director_compensation(corp_code, year=year, quarter=quarter)
-        if is_date or len(data) > 0 or count > 4:
-            break
-        quarter = quarter - 1 if quarter > 1 else 4
-        year = year - 1 if quarter == 4 else year
-        count += 1
+    report:
+    - "main_accounts" (기본값): 주요계정 (다중회사 API로 최대 100개씩 조회)
+    - "key_indicators": 주요 재무지표(수익성) (다중회사 API로 최대 100개씩 조회)
+    - "financial_statements": 전체 재무제표 (회사별 동시 조회)
 
-    for item in data:
-        outputs.append(item.to_dict())
+    반환: [{
+        "stock": str,
+        "corp_code": str | None,
+        "year": int,
+        "quarter": int,
+        "data": list | None,
+        "error": str | None
+    }]
 
-    # 개인별 보수지급 금액(5억이상 상위5인)
-    count = 1
+    참고: 다중회사 API에 없는 기업은 회사별 조회로 최근 공시 분기를 찾습니다.
+    진행 상황은 기업별로 보고됩니다.
+    """,
+    tags={"opendart", "fundamentals", "korea", "batch", "cached"}
+)
+async def find_opendart_finance_batch(
+    stocks: list[str],
+    year: Optional[int] = None,
+    quarter: Optional[int] = None,
+    report: str = "main_accounts",
+    use_cache: bool = True,
+    ctx: Context | None = None,
+):
+    """
+    OpenDART에서 여러 기업의 재무 정보를 수집합니다.
+
+    Args:
+        stocks: 종목 코드 또는 기업명 목록 (예: ["005930", "삼성전자"])
+        year: 연도
+        quarter: 분기
+        report: "main_accounts", "key_indicators", "financial_statements"
+        use_cache: 캐시 사용 여부
+
+    Returns:
+        list: 기업별 결과 (완료된 순서)
+    """
+    logger.info(f">>> 🛠️ Tool: 'find_opendart_finance_batch' called for {len(stocks)} stocks")
+
+    results = []
+    async with executor.limit("find_opendart_finance_batch"):
+        async for result in iter_finance_batch(stocks, year, quarter, report, use_cache):
+            results.append(result)
+            if ctx is not None:
+                await ctx.report_progress(len(results), len(stocks), f"{result['stock']} 완료")
+    return results
+
+@mcp.tool(
+    name="find_opendart_document_sections",
+    description="""DART 공시 문서에서 필요한 목차 항목만 가져옵니다.
+    사용 대상:
+    - rcept_no: 공시 접수번호 (예: "20251201000783")
+    - sections: 목차 제목, 제목 일부, 번호 또는 eleId (예: ["3. 특정증권등의 소유상황"], ["3."])
+      생략하면 목차만 반환합니다.
+
+    반환:
+    - sections 생략: [{"eleId": str, "title": str, "level": int, "length": int}]
+    - sections 지정: [{"rcpNo": str, "eleId": str, "title": str, "text": str, "tables": list}]
+
+    참고: 전체 문서 대신 요청한 항목만 내려받으며, 항목별로 캐시합니다.
+    """,
+    tags={"opendart", "disclosure", "korea", "document", "cached"}
+)
+async def find_opendart_document_sections(rcept_no: str, sections: Optional[list[str]] = None):
+    """
+    DART 공시 문서의 목차 항목을 조회합니다.
+
+    Args:
+        rcept_no: 공시 접수번호
+        sections: 조회할 목차 항목 (생략하면 목차만 반환)
+
+    Returns:
+        list: 목차 또는 항목별 본문과 표
+    """
+    logger.info(f">>> 🛠️ Tool: 'find_opendart_document_sections' called for '{rcept_no}'")
+
+    async with executor.limit("find_opendart_document_sections"):
+        if not sections:
+            toc = await viewer.toc(rcept_no)
+            return [
+                {"eleId": node["eleId"], "title": node.get("text"), "level": node["level"], "length": int(node.get("length") or 0)}
+                for node in toc
+            ]
+        return await viewer.sections(rcept_no, sections)
+
+@mcp.tool(
+    name="find_opendart_disclosures",
+    description="""DART 공시검색으로 기업, 시장 또는 기간의 공시 목록을 최신순으로 조회합니다.
+    사용 대상:
+    - stock: 6자리 숫자 티커 또는 한국 기업명 (생략하면 전체 기업)
+    - start, end: 조회 기간 (YYYY-MM-DD 또는 YYYYMMDD, 기본값: 기업은 최근 1년, 전체는 최근 1주일)
+    - market: 법인구분 (Y: 유가증권, K: 코스닥, N: 코넥스, E: 기타)
+    - kind: 공시유형 (A: 정기공시, B: 주요사항보고, C: 발행공시, D: 지분공시, E: 기타공시,
+      F: 외부감사관련, G: 펀드공시, H: 자산유동화, I: 거래소공시, J: 공정위공시)
+    - report_nm: 보고서명에 포함된 문자열 (예: "사업보고서", "유상증자")
+    - limit: 최대 건수 (기본값 20)
+    - final_only: True이면 최종 보고서만 (정정 전 보고서 제외)
+    - cursor: 이전 결과의 cursor (같은 조건으로 이어서 조회)
+
+    반환: {
+        "disclosures": [{
+            "rcept_no": str, "rcept_dt": str, "corp_code": str, "corp_name": str, "corp_cls": str,
+            "stock_code": str, "report_nm": str, "flr_nm": str, "rm": str
+        }],
+        "cursor": str | null
+    }
+
+    참고: 페이지를 넘기며 조회하고 limit건을 찾으면 남은 페이지는 요청하지 않습니다.
+    한 번에 요청하는 페이지 수에는 한도가 있으며, 한도에 도달하면 cursor를 반환합니다.
+    cursor가 있으면 같은 조건에 cursor를 넘겨 남은 기간을 이어서 조회합니다.
+    """,
+    tags={"opendart", "disclosure", "korea", "search"}
+)
+async def find_opendart_disclosures(
+    stock: Optional[str] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    market: Optional[str] = None,
+    kind: Optional[str] = None,
+    report_nm: Optional[str] = None,
+    limit: int = 20,
+    final_only: bool = False,
+    cursor: Optional[str] = None,
+):
+    """
+    DART 공시 목록을 조회합니다.
+
+    Args:
+        stock: 종목 코드 또는 기업명 (생략하면 전체 기업)
+        start: 시작일
+        end: 종료일
+        market: 법인구분 (Y, K, N, E)
+        kind: 공시유형 (A ~ J)
+        report_nm: 보고서명 검색어
+        limit: 최대 건수
+        final_only: 최종 보고서만 조회
+        cursor: 이어서 조회할 위치
+
+    Returns:
+        dict: 공시 목록 (최신순)과 이어서 조회할 cursor
+    """
+    logger.info(f">>> 🛠️ Tool: 'find_opendart_disclosures' called for '{stock or market or '전체'}'")
+
+    async with executor.limit("find_opendart_disclosures"):
+        corp_code = await _corp_code(stock) if stock else None
+        keyword = "".join(report_nm.split()) if report_nm else None
+        stream = DisclosureStream(
+            aio_client,
+            corp_code=corp_code,
+            start=start,
+            end=end,
+            market=market.upper() if market else None,
+            kind=kind.upper() if kind else None,
+            final_only=final_only,
+            # 보고서명으로 거르지 않으면 limit건만 요청하면 됩니다.
+            page_count=MAX_PAGE_COUNT if keyword else max(1, limit),
+            max_pages=DISCLOSURE_MAX_PAGES,
+            cursor=cursor,
+        )
+        match = (lambda disclosure: keyword in disclosure.report_nm.replace(" ", "")) if keyword else None
+        disclosures = await search_disclosures(stream, limit=max(1, limit), match=match)
+        return {"disclosures": [disclosure.to_dict() for disclosure in disclosures], "cursor": stream.cursor}
+
+@mcp.tool(
+    name="find_opendart_xbrl_facts",
+    description="""DART 재무제표 원본파일(XBRL)에서 임의의 계정(개념)을 여러 연도에 걸쳐 조회합니다.
+    사용 대상:
+    - stock: 6자리 숫자 티커 또는 한국 기업명 (예: "005930", "삼성전자")
+    - concepts: XBRL 개념 ID 또는 표준 레이블 (예: ["ifrs-full_Revenue", "dart_OperatingIncomeLoss", "매출원가"])
+    - start_year, end_year: 조회할 사업연도 범위 (생략하면 최근 사업연도)
+    - quarter: 보고서 분기 (기본값 4: 사업보고서)
+    - dimensions: True이면 부문·구성요소별 값도 포함
+
+    반환: [{
+        "concept": str, "label": str | None,
+        "period_start": str | None, "period_end": str, "instant": bool,
+        "dimensions": str, "unit": str | None, "decimals": str | None,
+        "value": str | None, "amount": float | None,
+        "rcept_no": str, "year": int, "quarter": int
+    }]
+
+    참고: 처음 조회하는 공시만 XBRL을 내려받아 팩트 인덱스에 저장하며,
+    이후에는 DART 호출 없이 인덱스에서 조회합니다.
+    label은 XBRL 패키지의 한국어 레이블이며, 패키지에 없는 표준 개념은 DART 재무제표의 계정명으로 채웁니다.
+    둘 다 없는 개념(주석 항목 등)은 label이 null이므로 concept로 조회하세요.
+    """,
+    tags={"opendart", "fundamentals", "korea", "xbrl", "cached"}
+)
+async def find_opendart_xbrl_facts(
+    stock: str,
+    concepts: list[str],
+    start_year: Optional[int] = None,
+    end_year: Optional[int] = None,
+    quarter: int = 4,
+    dimensions: bool = False,
+):
+    """
+    XBRL 팩트 인덱스에서 계정을 조회합니다.
+
+    Args:
+        stock: 종목 코드 (예: "005930", "삼성전자")
+        concepts: XBRL 개념 ID 또는 레이블 목록
+        start_year: 시작 사업연도
+        end_year: 마지막 사업연도
+        quarter: 보고서 분기
+        dimensions: 차원별 값 포함 여부
+
+    Returns:
+        list: 개념, 차원, 기간 순으로 정렬한 팩트
+    """
+    logger.info(f">>> 🛠️ Tool: 'find_opendart_xbrl_facts' called for '{stock}'")
+
+    if quarter not in (1, 2, 3, 4):
+        raise ValueError(f"잘못된 분기입니다: {quarter}")
+    # 기본값은 해당 분기 보고서가 있을 수 있는 가장 최근 연도입니다.
+    latest_year, latest_quarter = _year_quarter(None, None)
+    end_year = end_year or (latest_year if quarter <= latest_quarter else latest_year - 1)
+    start_year = min(start_year or end_year, end_year)
+
+    async with executor.limit("find_opendart_xbrl_facts"):
+        corp_code = await _corp_code(stock)
+        await asyncio.gather(*(_ingest_xbrl(corp_code, year, quarter) for year in range(start_year, end_year + 1)))
+        # 사업보고서에는 전기 비교 값이 있으므로 팩트 기간은 한 해 앞까지 포함합니다.
+        return await executor.run(factstore.query, corp_code, concepts, start_year - 1, end_year, dimensions)
+
+async def _ingest_xbrl(corp_code: str, year: int, quarter: int):
+    """해당 분기 공시의 XBRL을 팩트 인덱스에 저장합니다. 공시가 없거나 이미 저장했으면 건너뜁니다.
+
+    접수번호는 공시 인덱스에서 찾고, 없으면 재무제표 조회(캐시 우선)로 확인합니다.
+    """
+    entry = filing_index.lookup(corp_code, "financial_statements", year, quarter)
+    rcept_no = entry.get("rcept_no") if entry else None
+    if rcept_no is None:
+        # 미제출로 기록된 분기는 _latest()가 DART를 호출하지 않고 빈 결과를 반환합니다.
+        data = await _latest("financial_statements", corp_code, year, quarter, exact=True)
+        rcept_no = data[0].get("rcept_no") if data else None
+    if rcept_no is None or await executor.run(factstore.has, corp_code, rcept_no):
+        return
+
+    async def ingest():
+        package = await aio_client.finance_file(rcept_no, quarter=quarter)
+        if package is None:
+            logger.info(f"XBRL 원본파일이 없습니다: {corp_code}/{rcept_no}")
+            return 0
+        table = await executor.run(parse_package, package)
+        # 패키지에 레이블이 없는 표준 개념은 재무제표(캐시 우선)의 계정명으로 채웁니다.
+        try:
+            statements = await _latest("financial_statements", corp_code, year, quarter, exact=True)
+            table.fill_labels(statement_labels(statements))
+        except Exception as e:
+            logger.warning(f"XBRL 표준 개념의 레이블을 채우지 못했습니다 ({corp_code}/{rcept_no}): {e}")
+        return await executor.run(factstore.put, corp_code, rcept_no, year, quarter, table)
+
+    await flights.do(("xbrl", rcept_no), ingest)
+
+async def iter_finance_batch(
+    stocks: list[str],
+    year: Optional[int] = None,
+    quarter: Optional[int] = None,
+    report: str = "main_accounts",
+    use_cache: bool = True,
+) -> AsyncIterator[dict]:
+    """여러 기업의 재무 정보를 조회하여 완료되는 순서대로 기업별 결과를 반환합니다.
+
+    1. 종목 코드/기업명을 기업코드 인덱스로 한 번에 변환합니다.
+    2. 다중회사 API가 있는 보고서는 캐시에 없는 기업을 100개씩 묶어 조회합니다.
+    3. 남은 기업은 회사별로 최근 공시 분기를 찾아 동시에 조회합니다.
+    """
+    if report not in BATCH_REPORTS:
+        raise ValueError(f"지원하지 않는 report입니다: {report} ({', '.join(BATCH_REPORTS)})")
+    multi_report, single_report = BATCH_REPORTS[report]
+
+    is_date = year is not None and quarter is not None
+    year, quarter = _year_quarter(year, quarter)
+
+    # 유사 기업명 검색이 이벤트 루프를 막지 않도록 작업자 풀에서 한 번에 찾습니다.
+    resolved = await executor.run(_resolve_stocks, list(dict.fromkeys(stocks)))
+    # 같은 기업을 가리키는 입력(예: "005930", "삼성전자")은 한 번만 조회합니다.
+    targets: dict[str, list[str]] = {}
+    for stock, (corp_code, error) in resolved.items():
+        if corp_code is None:
+            yield _batch_result(stock, None, year, quarter, error=error)
+        else:
+            targets.setdefault(corp_code, []).append(stock)
+
+    if multi_report is not None:
+        async for corp_code, data in _multi_company(multi_report, single_report, list(targets), year, quarter, use_cache):
+            for stock in targets.pop(corp_code):
+                yield _batch_result(stock, corp_code, year, quarter, data=data)
+
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def fetch(corp_code: str):
+        async with semaphore:
+            try:
+                return corp_code, await _latest_period(single_report, corp_code, year, quarter, exact=is_date, use_cache=use_cache), None
+            except Exception as e:
+                logger.error(f"배치 조회 실패 ({corp_code}): {e}")
+                return corp_code, (year, quarter, None), str(e)
+
+    tasks = [asyncio.ensure_future(fetch(corp_code)) for corp_code in targets]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            corp_code, (found_year, found_quarter, data), error = await next_done
+            for stock in targets[corp_code]:
+                yield _batch_result(stock, corp_code, found_year, found_quarter, data=data, error=error)
+    finally:
+        # 호출자가 중간에 반복을 멈추면 남은 조회를 취소합니다.
+        for task in tasks:
+            task.cancel()
+
+async def _multi_company(multi_report: str, single_report: str, corp_codes: list[str], year: int, quarter: int, use_cache: bool):
+    """다중회사 API로 조회하여 (corp_code, data)를 반환합니다.
+
+    결과는 단일회사 보고서의 캐시 키와 공시 인덱스에 기록하므로 이후 회사별 조회에서도 재사용됩니다.
+    결과에 없는 기업은 해당 분기 미제출로 기록하고 반환하지 않습니다.
+    """
+    remaining = []
+    for corp_code in corp_codes:
+        if use_cache:
+            entry = cache.get_local(cache.key(single_report, corp_code, year, quarter))
+            if entry is not None and cache.is_fresh(entry):
+                yield corp_code, entry["data"]
+                continue
+        if filing_index.status(corp_code, single_report, year, quarter) is False:
+            continue
+        remaining.append(corp_code)
+
+    chunks = [remaining[i:i + BATCH_CHUNK_SIZE] for i in range(0, len(remaining), BATCH_CHUNK_SIZE)]
+
+    async def fetch(chunk: list[str]):
+        try:
+            items = await _fetch(multi_report, ",".join(chunk), year, quarter)
+        except Exception as e:
+            logger.error(f"다중회사 조회 실패 ({len(chunk)}개): {e}")
+            return chunk, None
+        return chunk, to_records(items)
+
+    tasks = [asyncio.ensure_future(fetch(chunk)) for chunk in chunks]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            chunk, rows = await next_done
+            if rows is None:
+                continue
+            for corp_code, data in _group_by_corp(chunk, rows).items():
+                key = cache.key(single_report, corp_code, year, quarter)
+                if data:
+                    filing_index.mark_filed(corp_code, single_report, year, quarter, data[0].get("rcept_no"))
+                    entry = cache.put(key, data)
+                    executor.submit(cache.put_remote, key, entry)
+                    yield corp_code, data
+                else:
+                    filing_index.mark_not_filed(corp_code, single_report, year, quarter)
+    finally:
+        for task in tasks:
+            task.cancel()
+        if filing_index.dirty:
+            executor.submit(filing_index.save)
+
+def _group_by_corp(corp_codes: list[str], rows: list[dict]) -> dict[str, list[dict]]:
+    """다중회사 응답을 기업별로 나눕니다. corp_code가 없는 행은 stock_code로 찾습니다."""
+    by_stock = {}
+    for corp_code in corp_codes:
+        record = runtime.corp_index.get(corp_code)
+        if record and record["stock_code"]:
+            by_stock[record["stock_code"]] = corp_code
+
+    grouped = {corp_code: [] for corp_code in corp_codes}
+    for row in rows:
+        corp_code = row.get("corp_code") or by_stock.get((row.get("stock_code") or "").strip())
+        if corp_code in grouped:
+            grouped[corp_code].append(row)
+    return grouped
+
+def _batch_result(stock: str, corp_code: str | None, year: int, quarter: int, data: list | None = None, error: str | None = None):
+    return {
+        "stock": stock,
+        "corp_code": corp_code,
+        "year": year,
+        "quarter": quarter,
+        "data": data,
+        "error": error,
+    }
+
+async def warmup():
+    """크롤러와 기업코드 데이터를 백그라운드에서 초기화합니다."""
+    return await executor.run(runtime.warmup)
+
+async def refresh_corp_codes():
+    """기업코드 목록을 주기적으로 갱신합니다. (OPENDART_CORP_REFRESH=0이면 사용 안 함)"""
+    if not corp_refresher.enabled:
+        return
     while True:
-        logger.info(f"fetching finance data: {year}Q{quarter}")
-        data = crawler.top5_director_compensation(corp_code, year=year, quarter=quarter)
-        if is_date or len(data) > 0 or count > 4:
-            break
-        quarter = quarter - 1 if quarter > 1 else 4
-        year = year - 1 if quarter == 4 else year
-        count += 1
+        await asyncio.sleep(corp_refresher.interval)
+        await executor.run(corp_refresher.refresh)
 
-    for item in data:
-        outputs.append(item.to_dict())
+async def watch_filings():
+    """새 공시를 주기적으로 확인하여 캐시를 무효화합니다. (OPENDART_CHANGEFEED_INTERVAL=0이면 사용 안 함)
 
-    return outputs
+    OPENDART_CHANGEFEED_PREFETCH=1이면 무효화한 항목을 백그라운드 우선순위로 다시 조회합니다.
+    """
+    if not changefeed.enabled:
+        return
+    while True:
+        await asyncio.sleep(changefeed.interval)
+        try:
+            with priority(BACKGROUND):
+                changes = await changefeed.poll(executor)
+        except Exception as e:
+            logger.warning(f"새 공시 확인 실패: {e}")
+            continue
+        if not changefeed.prefetch:
+            continue
+        for change in changes:
+            key = cache.key(change.report, change.corp_code, change.year, change.quarter)
+            revalidator.schedule(
+                key, lambda change=change: _background_refresh(change.report, change.corp_code, change.year, change.quarter)
+            )
+
+async def prefetch_watchlist():
+    """공시 일정에 맞춰 관심 종목의 정기보고서를 미리 조회합니다. (OPENDART_WATCHLIST가 비어 있으면 사용 안 함)"""
+    if not prefetcher.enabled:
+        return
+    while True:
+        await asyncio.sleep(prefetcher.next_interval())
+        try:
+            with priority(BACKGROUND):
+                await prefetcher.run_once()
+        except Exception as e:
+            logger.warning(f"관심 종목 미리 조회 실패: {e}")
+
+@mcp.custom_route("/ready", methods=["GET"])
+async def ready(request: Request) -> JSONResponse:
+    """기업코드 데이터가 준비되었으면 200, 아니면 503을 반환합니다."""
+    status = runtime.status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+@mcp.custom_route("/stats", methods=["GET"])
+async def stats(request: Request) -> JSONResponse:
+    """작업자 풀, 공시 인덱스, 캐시, 요청 병합 통계를 반환합니다."""
+    return JSONResponse({
+        "executor": executor.stats(),
+        "filing_index": filing_index.stats(),
+        "cache": cache.stats(),
+        "revalidator": revalidator.stats(),
+        "single_flight": flights.stats(),
+        "corp_refresh": corp_refresher.stats(),
+        "rate_limit": limiter.stats(),
+        "http": http_stats(),
+        "async_http": aio_client.stats(),
+        "viewer": viewer.stats(),
+        "docstore": docstore.stats(),
+        "factstore": factstore.stats(),
+        "changefeed": changefeed.stats(),
+        "prefetch": prefetcher.stats(),
+    })
 
 @mcp.prompt()
 def dividend(stock: str, year: Optional[int] = None, quarter: Optional[int] = None):
@@ -267,31 +735,127 @@ def compensation(stock: str, year: Optional[int] = None):
         #f"문서번호, 기업코드, 기업명, 당기순이익(백만원), 현금배당수익률(%), 주당순이익(원), 주당 현금배당금(원), 현금배당성향(%), 현금배당금총액(백만원)을 응답합니다."
     )
 
-def _find_dividend(stock: str, year: Optional[int] = None, quarter: Optional[int] = None):
+async def _find_dividend(stock: str, year: Optional[int] = None, quarter: Optional[int] = None, use_cache: bool = True):
     """Find dividend information of a company."""
 
     is_date = year is not None and quarter is not None
     year, quarter = _year_quarter(year, quarter)
 
-    if not crawler.corp_data:
-        corp_data = crawler.corp_data
-        crawler.save_corp_data(corpcode_filename)
-
-    corp_code = crawler.fetch_corp_code(stock)
+    corp_code = await _corp_code(stock)
 
     # 배당에 관한 사항
-    count = 1
-    while True:
-        logger.info(f"fetching finance data: {year}Q{quarter}")
-        data = crawler.dividends(corp_code, year=year, quarter=quarter)
-        if is_date or len(data) > 0 or count > 4:
-            break
-        quarter = quarter - 1 if quarter > 1 else 4
-        year = year - 1 if quarter == 4 else year
-        count += 1
-
+    return await _latest("dividends", corp_code, year, quarter, exact=is_date, use_cache=use_cache)
+
+async def _corp_code(stock: str):
+    """종목 코드 또는 기업명으로 DART 기업코드를 찾습니다. 찾지 못하면 ValueError를 발생시킵니다."""
+    corp_code = runtime.resolve_ready(stock)
+    if corp_code is None:
+        # 인덱스가 아직 없으면 작업자 풀에서 기업코드 데이터를 준비합니다.
+        corp_code = await flights.do(("corp_code", stock), lambda: executor.run(_fetch_corp_code, stock))
+    if corp_code is None:
+        raise ValueError(f"기업을 찾을 수 없습니다: {stock}")
+    return corp_code
+
+async def _latest(report: str, corp_code: str, year: int, quarter: int, exact: bool = False, use_cache: bool = True):
+    """공시가 존재하는 가장 최근 분기의 데이터를 조회합니다."""
+    _, _, data = await _latest_period(report, corp_code, year, quarter, exact, use_cache)
     return data
 
+async def _latest_period(report: str, corp_code: str, year: int, quarter: int, exact: bool = False, use_cache: bool = True):
+    """공시가 존재하는 가장 최근 분기와 그 데이터를 (year, quarter, data)로 반환합니다.
+
+    공시 제출 여부 인덱스를 먼저 확인하여 미제출로 알려진 분기는 조회하지 않고,
+    use_cache=True이면 캐시(LRU → GCS)를 먼저 확인합니다.
+
+    Args:
+        report: OpenDartCrawler 메서드 이름 (예: "financial_statements")
+    """
+
+    def status(year: int, quarter: int):
+        return filing_index.status(corp_code, report, year, quarter)
+
+    async def fetch(year: int, quarter: int):
+        key = cache.key(report, corp_code, year, quarter)
+        if use_cache:
+            entry = cache.get_local(key)
+            if entry is None:
+                entry = await executor.run(cache.get_remote, key)
+            if entry is not None:
+                if cache.is_fresh(entry):
+                    return entry["data"]
+                if cache.stale_while_revalidate:
+                    revalidator.schedule(key, lambda: _background_refresh(report, corp_code, year, quarter))
+                    return entry["data"]
+
+        return await _refresh(report, corp_code, year, quarter)
+
+    try:
+        year, quarter, data = await resolver.resolve(fetch, year, quarter, exact=exact, status=status)
+    finally:
+        if filing_index.dirty:
+            executor.submit(filing_index.save)
+    return year, quarter, data
+
+async def _refresh(report: str, corp_code: str, year: int, quarter: int, keep_existing: bool = False):
+    """DART에서 데이터를 조회하여 공시 인덱스와 캐시를 갱신합니다.
+
+    keep_existing=True이면 조회 결과가 비어 있어도 기존 캐시 항목을 유지합니다.
+    같은 키로 진행 중인 조회가 있으면 그 결과를 함께 사용합니다.
+    """
+    key = cache.key(report, corp_code, year, quarter)
+
+    async def fetch():
+        items = await _fetch(report, corp_code, year, quarter)
+        data = to_records(items)
+        if len(data) > 0:
+            filing_index.mark_filed(corp_code, report, year, quarter, data[0].get("rcept_no"))
+            entry = cache.put(key, data)
+            executor.submit(cache.put_remote, key, entry)
+        elif not keep_existing:
+            filing_index.mark_not_filed(corp_code, report, year, quarter)
+        return data
+
+    return await flights.do(key, fetch)
+
+async def _background_refresh(report: str, corp_code: str, year: int, quarter: int):
+    """오래된 캐시 항목을 백그라운드 우선순위로 갱신합니다."""
+    with priority(BACKGROUND):
+        return await _refresh(report, corp_code, year, quarter, keep_existing=True)
+
+def _prefetch(report: str, corp_code: str, year: int, quarter: int):
+    """관심 종목의 보고서를 백그라운드에서 조회합니다. (같은 키의 갱신과 합쳐짐)"""
+    key = cache.key(report, corp_code, year, quarter)
+    return revalidator.schedule(key, lambda: _background_refresh(report, corp_code, year, quarter))
+
+async def _fetch(report: str, corp_code: str, year: int, quarter: int):
+    """DART에서 보고서를 조회합니다.
+
+    비동기 클라이언트를 사용하지 않으면 작업자 풀에서 OpenDartCrawler를 호출합니다.
+    """
+    if aio_client.enabled:
+        return await aio_client.call(report, corp_code, year=year, quarter=quarter)
+    return await executor.run(_call, report, corp_code, year, quarter)
+
+def _call(report: str, corp_code: str, year: int, quarter: int):
+    method = getattr(runtime.crawler, report)
+    return method(corp_code, year=year, quarter=quarter)
+
+def _fetch_corp_code(stock: str):
+    return runtime.corp_index.resolve(stock)
+
+def _resolve_stocks(stocks: list[str]) -> dict[str, tuple[str | None, str | None]]:
+    """종목 코드/기업명별 (corp_code, 오류 메시지)를 반환합니다. (블로킹 호출)"""
+    corp_index = runtime.corp_index
+    resolved = {}
+    for stock in stocks:
+        try:
+            corp_code = corp_index.resolve(stock)
+        except ValueError as e:
+            resolved[stock] = (None, str(e))
+            continue
+        resolved[stock] = (corp_code, None if corp_code else f"기업을 찾을 수 없습니다: {stock}")
+    return resolved
+
 def _year_quarter(year, quarter):
     """Year and Quarter """
     now = datetime.now()
@@ -302,11 +866,3 @@ def _year_quarter(year, quarter):
     quarter = quarter or (4 if year < now.year else default_quarter)
 
     return year, quarter
-
-def _to_json(data):
-    if isinstance(data, pd.DataFrame):
-        return json.loads(data.to_json(orient="records", date_format="iso"))
-    if isinstance(data, pd.Series):
-        return data.to_dict()
-    if isinstance(data, dict):
-        return data
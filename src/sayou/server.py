@@ -5,21 +5,36 @@ from typing import List, Dict, Any
 
 from fastmcp import FastMCP
 
-from opendarts import mcp
+from opendarts import aio_client, mcp, prefetch_watchlist, refresh_corp_codes, warmup, watch_filings
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(format="[%(levelname)s]: %(message)s", level=logging.INFO)
 
+async def main(port: int):
+    # 서버가 포트를 여는 동안 크롤러와 기업코드 데이터를 백그라운드에서 초기화합니다.
+    # 이후 기업코드 목록은 주기적으로 변경분만 갱신하고, 새 공시가 나오면 해당 캐시 항목을 무효화합니다.
+    # 정기보고서 제출 기간에는 관심 종목(OPENDART_WATCHLIST)의 보고서를 미리 조회합니다.
+    background_tasks = [
+        asyncio.create_task(warmup()),
+        asyncio.create_task(refresh_corp_codes()),
+        asyncio.create_task(watch_filings()),
+        asyncio.create_task(prefetch_watchlist()),
+    ]
+    try:
+        await mcp.run_async(
+            transport="http",
+            host="0.0.0.0",
+            port=port,
+        )
+    finally:
+        for task in background_tasks:
+            task.cancel()
+        await aio_client.aclose()
+
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8080))
     logger.info(f"🚀 Stocks MCP server started on port {port}")
     #mcp.run()
     """"""
-    asyncio.run(
-        mcp.run_async(
-            transport="http",
-            host="0.0.0.0",
-            port=port,
-        )
-    )
+    asyncio.run(main(port))
     """"""
\ No newline at end of file
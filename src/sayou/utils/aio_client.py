@@ -0,0 +1,291 @@
+import asyncio
+import dataclasses
+import logging
+import os
+
+import httpx
+
+from .http import DEFAULT_TIMEOUT, USER_AGENT
+from .ratelimit import DartApiError, KeyRejectedError, response_status
+
+logger = logging.getLogger(__name__)
+# httpx는 요청마다 INFO 로그를 남기므로 경고 이상만 기록합니다.
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+# 모델 필드와 엔드포인트를 확인한 sayou-stock 버전 (pyproject.toml의 고정 버전과 같아야 합니다)
+SAYOU_STOCK_VERSION = "0.2.12"
+
+API_URL = "https://opendart.fss.or.kr/api"
+
+# 보고서 코드 (1분기, 반기, 3분기, 사업보고서)
+REPORT_CODES = {1: "11013", 2: "11012", 3: "11014", 4: "11011"}
+
+# 비동기로 직접 호출하는 OpenDartCrawler 메서드: (엔드포인트, sayou-stock 모델, 추가 파라미터)
+# 추가 파라미터는 OpenDartCrawler 메서드의 기본값과 같습니다.
+ENDPOINTS = {
+    "dividends": ("alotMatter.json", "DividendsData", {}),
+    "director_compensation": ("hmvAuditIndvdlBySttus.json", "DirectorCompensationData", {}),
+    "total_director_compensation": ("hmvAuditAllSttus.json", "TotalDirectorCompensationData", {}),
+    "top5_director_compensation": ("indvdlByPay.json", "DirectorCompensationData", {}),
+    "single_company_main_accounts": ("fnlttSinglAcnt.json", "SingleCompanyMainAccountsData", {}),
+    "multi_company_main_accounts": ("fnlttMultiAcnt.json", "MultiCompanyMainAccountsData", {}),
+    "financial_statements": ("fnlttSinglAcntAll.json", "SingleFinancialStatementData", {"fs_div": "OFS"}),
+    "single_company_key_financial_indicators": ("fnlttSinglIndx.json", "SingleCompanyKeyFinancialIndicatorData", {"idx_cl_code": "M210000"}),
+    "multi_company_key_financial_indicators": ("fnlttCmpnyIndx.json", "MultiCompanyKeyFinancialIndicatorData", {"idx_cl_code": "M210000"}),
+}
+
+
+def parse_list(model_name: str, data: dict) -> list:
+    """OpenDART 응답의 list를 sayou-stock 모델 목록으로 바꿉니다.
+
+    status가 "000"이 아니면 빈 목록입니다. (OpenDartCrawler와 같음)
+    모델에 없는 필드는 버리므로 DART가 응답 필드를 추가해도 실패하지 않습니다.
+    """
+    if data.get("status") != "000":
+        if data.get("status") != "013":
+            logger.warning(f"OpenDART 응답 오류 ({data.get('status')}): {data.get('message')}")
+        return []
+    from sayou.stock.opendart import models
+
+    model = getattr(models, model_name)
+    names = {field.name for field in dataclasses.fields(model)}
+    return [model(**{key: value for key, value in row.items() if key in names}) for row in data.get("list", [])]
+
+
+class AsyncOpenDartClient:
+    """httpx 기반 비동기 OpenDART 클라이언트
+
+    OpenDartCrawler와 같은 메서드를 제공하며, 요청은 이벤트 루프에서 비동기로 보내므로
+    작업자 스레드 수와 관계없이 많은 DART 호출을 동시에 기다릴 수 있습니다.
+
+    - ENDPOINTS의 정기보고서·재무정보 API는 직접 호출하고 JSON을 sayou-stock 모델로 바꿉니다.
+      그 밖의 메서드는 동기 OpenDartCrawler를 스레드에서 실행합니다.
+    - 모든 요청은 하나의 httpx.AsyncClient 연결 풀(keep-alive)을 공유합니다.
+    - RateLimiter의 토큰 버킷, 키별 일일 한도, 상태 코드 처리를 동기 경로와 함께 적용합니다.
+    - 공시 원본 파일은 store(DocumentStore)를 거쳐 가져오므로 같은 파일을 다시 내려받지 않습니다.
+    """
+
+    def __init__(self, runtime, store=None, max_connections: int | None = None, keepalive_connections: int | None = None):
+        self.runtime = runtime
+        self.limiter = runtime.limiter
+        # 공시 원본(문서, XBRL, PDF, 뷰어 페이지)을 읽고 쓰는 DocumentStore
+        self.store = store
+        self.enabled = os.getenv("OPENDART_ASYNC_CLIENT", "1") != "0"
+        self.max_connections = max_connections or int(os.getenv("OPENDART_HTTP_MAX_CONNECTIONS", "100"))
+        self.keepalive_connections = keepalive_connections or int(os.getenv("OPENDART_HTTP_POOL_SIZE", "32"))
+        self._http: httpx.AsyncClient | None = None
+        self._api_key: str | None = None
+        self._requests = 0
+        self._retries = 0
+        self._errors = 0
+        self._in_flight = 0
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """공유 httpx.AsyncClient (처음 사용하는 이벤트 루프에서 생성)"""
+        if self._http is None:
+            connect_timeout, read_timeout = DEFAULT_TIMEOUT
+            self._http = httpx.AsyncClient(
+                headers={"User-Agent": USER_AGENT, "Accept-Encoding": "gzip, deflate"},
+                timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.keepalive_connections,
+                ),
+                # 연결 단계 오류만 재시도합니다. (PooledAdapter와 같음)
+                transport=httpx.AsyncHTTPTransport(retries=2),
+            )
+        return self._http
+
+    async def aclose(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    async def _ensure_api_key(self) -> str:
+        if self._api_key is None:
+            # Secret Manager 조회는 블로킹 호출이므로 스레드에서 한 번만 실행합니다.
+            api_keys = await asyncio.to_thread(self.runtime.ensure_api_keys)
+            self._api_key = api_keys[0]
+        return self._api_key
+
+    async def _get(self, url: str, params: dict | None = None) -> httpx.Response:
+        """GET 요청 (속도 제한 적용, 키가 거절되면 다른 키로 다시 시도)"""
+        params = dict(params or {})
+        attempts = max(1, len(self.limiter.keys)) if self.limiter is not None else 1
+        self._in_flight += 1
+        try:
+            for attempt in range(attempts):
+                api_key = await self.limiter.acquire_async() if self.limiter is not None else None
+                if api_key is not None and "crtfc_key" in params:
+                    params["crtfc_key"] = api_key
+                self._requests += 1
+                response = await self.http.get(url, params=params)
+                if self.limiter is not None:
+                    try:
+                        self.limiter.after_response(api_key, response.status_code, response.content[:256])
+                    except KeyRejectedError:
+                        if attempt + 1 >= attempts:
+                            raise
+                        self._retries += 1
+                        continue
+                response.raise_for_status()
+                return response
+        except Exception:
+            self._errors += 1
+            raise
+        finally:
+            self._in_flight -= 1
+
+    async def get_json(self, url: str, params: dict | None = None) -> dict:
+        """OpenDART JSON API를 호출합니다. crtfc_key는 자동으로 채웁니다."""
+        params = {"crtfc_key": await self._ensure_api_key(), **(params or {})}
+        response = await self._get(url, params)
+        return response.json()
+
+    async def _stored(self, rcept_no: str, name: str, fetch, content_type: str | None = None) -> bytes | None:
+        """store가 있으면 저장소를 거쳐 가져옵니다."""
+        if self.store is None:
+            return await fetch()
+        return await self.store.read_through(rcept_no, name, fetch, content_type)
+
+    async def get_bytes(self, url: str, params: dict | None = None, referer: str | None = None) -> bytes:
+        """DART 웹 페이지(공시 뷰어, PDF 등)를 가져옵니다. API 키와 일일 한도를 사용하지 않습니다."""
+        headers = {"Referer": referer} if referer else None
+        self._requests += 1
+        response = await self.http.get(url, params=params, headers=headers)
+        response.raise_for_status()
+        return response.content
+
+    async def get_page(
+        self,
+        url: str,
+        params: dict | None = None,
+        referer: str | None = None,
+        rcept_no: str | None = None,
+        name: str | None = None,
+    ) -> str:
+        """DART 웹 페이지를 텍스트로 가져옵니다. rcept_no와 name을 주면 저장소를 거칩니다."""
+        fetch = lambda: self.get_bytes(url, params=params, referer=referer)
+        if rcept_no and name:
+            content = await self._stored(rcept_no, name, fetch, "text/html")
+        else:
+            content = await fetch()
+        return content.decode("utf-8", errors="replace")
+
+    async def _get_file(self, url: str, params: dict) -> bytes | None:
+        """OpenDART 파일 API(ZIP)를 호출합니다. 파일이 없으면 None."""
+        response = await self._get(url, params)
+        content = response.content
+        if content.startswith(b"PK\x03\x04"):
+            return content
+        status = response_status(content[:512])
+        if status in ("013", "014"):
+            return None
+        raise DartApiError(f"DART 파일을 받지 못했습니다 ({status}): {content[:200]!r}", status)
+
+    async def document(self, rcept_no: str) -> bytes | None:
+        """공시서류원본파일 (ZIP)"""
+        from sayou.stock.opendart.models import DisclosureStatus
+
+        api_key = await self._ensure_api_key()
+        fetch = lambda: self._get_file(DisclosureStatus.DOCUMENT.url, {"crtfc_key": api_key, "rcept_no": rcept_no})
+        return await self._stored(rcept_no, "document.zip", fetch, "application/zip")
+
+    async def finance_file(self, rcept_no: str, report_code: str | None = None, quarter: int = 4) -> bytes | None:
+        """재무제표 원본파일 (XBRL ZIP)"""
+        from sayou.stock.opendart.models import FinanceStatus
+        from sayou.stock.opendart.utils import quarters
+
+        report_code = report_code or quarters.get(str(quarter), "11011")
+        url = FinanceStatus.FINANCIAL_STATEMENT_ORIGINAL_FILE_XBRL.url
+        api_key = await self._ensure_api_key()
+        fetch = lambda: self._get_file(url, {"crtfc_key": api_key, "rcept_no": rcept_no, "reprt_code": report_code})
+        return await self._stored(rcept_no, f"xbrl/{report_code}.zip", fetch, "application/zip")
+
+    async def pdf(self, rcept_no: str, dcm_no: str) -> bytes:
+        """공시 문서 PDF"""
+        from .viewer import MAIN_URL, PDF_URL
+
+        fetch = lambda: self.get_bytes(PDF_URL, {"rcp_no": rcept_no, "dcm_no": dcm_no}, referer=f"{MAIN_URL}?rcpNo={rcept_no}")
+        return await self._stored(rcept_no, f"pdf/{dcm_no}.pdf", fetch, "application/pdf")
+
+    async def call(self, method: str, *args, **kwargs):
+        """OpenDartCrawler 메서드를 비동기로 실행합니다.
+
+        ENDPOINTS에 있는 메서드는 API를 직접 호출하고, 그 밖의 메서드는 동기 크롤러를 스레드에서 실행합니다.
+
+        Args:
+            method: OpenDartCrawler 메서드 이름 (예: "dividends")
+        """
+        if method in ENDPOINTS and not set(kwargs) - {"corp_code", "year", "quarter"}:
+            return await self.periodic(method, *args, **kwargs)
+        func = getattr(self.runtime.crawler, method)
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    async def periodic(self, method: str, corp_code: str, year: str | int, quarter: int) -> list:
+        """정기보고서·재무정보 API (method: ENDPOINTS의 키)"""
+        path, model_name, extra = ENDPOINTS[method]
+        params = {
+            "corp_code": corp_code,
+            "bsns_year": str(year),
+            "reprt_code": REPORT_CODES.get(int(quarter), "11011"),
+            **extra,
+        }
+        return parse_list(model_name, await self.get_json(f"{API_URL}/{path}", params))
+
+    async def fetch_corp_code(self, company: str) -> str | None:
+        """종목 코드 또는 기업명으로 DART 기업코드를 찾습니다."""
+        corp_code = self.runtime.resolve_ready(company)
+        if corp_code is not None:
+            return corp_code
+        # 인덱스 준비와 유사 기업명 검색은 이벤트 루프 밖에서 실행합니다.
+        return await asyncio.to_thread(lambda: self.runtime.corp_index.resolve(company))
+
+    async def financial_statements(self, corp_code: str, year: str | int, quarter: int, financial_statement: str = "OFS"):
+        """단일회사 전체 재무제표"""
+        if financial_statement != "OFS":
+            return await self.call("financial_statements", corp_code, year, quarter, financial_statement=financial_statement)
+        return await self.call("financial_statements", corp_code, year, quarter)
+
+    async def dividends(self, corp_code: str, year: str | int, quarter: int):
+        """배당에 관한 사항"""
+        return await self.call("dividends", corp_code, year, quarter)
+
+    async def director_compensation(self, corp_code: str, year: str | int, quarter: int):
+        """이사·감사의 개인별 보수현황(5억원 이상)"""
+        return await self.call("director_compensation", corp_code, year, quarter)
+
+    async def total_director_compensation(self, corp_code: str, year: str | int, quarter: int):
+        """이사·감사 전체의 보수현황(보수지급금액 - 이사·감사 전체)"""
+        return await self.call("total_director_compensation", corp_code, year, quarter)
+
+    async def top5_director_compensation(self, corp_code: str, year: str | int, quarter: int):
+        """개인별 보수지급 금액(5억이상 상위5인)"""
+        return await self.call("top5_director_compensation", corp_code, year, quarter)
+
+    async def reports(self, corp_code: str, year: str | int, quarter: int, api_no: int = -1):
+        """정기보고서 주요정보 (api_no: ReportStatus)"""
+        return await self.call("reports", corp_code, year, quarter, api_no)
+
+    async def material_facts(self, corp_code: str, start_date: str, end_date: str, api_no: int = -1):
+        """주요사항보고서 주요정보 (api_no: MaterialFactStatus)"""
+        return await self.call("material_facts", corp_code, start_date, end_date, api_no)
+
+    async def registration(self, corp_code: str, start_date: str, end_date: str, api_no: int = -1):
+        """증권신고서 주요정보 (api_no: RegistrationStatus)"""
+        return await self.call("registration", corp_code, start_date, end_date, api_no)
+
+    async def major_ownership(self, corp_code: str):
+        """대량보유 상황보고"""
+        return await self.call("major_ownership", corp_code)
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "requests": self._requests,
+            "retries": self._retries,
+            "errors": self._errors,
+            "in_flight": self._in_flight,
+        }
@@ -0,0 +1,218 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+# 캐시 항목(레코드) 형식 버전. 형식이 바뀌면 올려서 이전 형식의 GCS 항목을 읽지 않습니다.
+# 2: 금액 열(thstrm_amount 등)을 문자열 대신 정수로 저장 ("-", 빈 값은 None)
+SCHEMA_VERSION = 2
+
+
+class ResponseCache:
+    """OpenDART 응답 캐시 (프로세스 내 LRU + GCS 객체 저장소).
+
+    키는 (tool, corp_code, year, quarter)를 정규화한 문자열이며, 항목은
+    {"stored_at": 저장 시각, "data": 결과 목록} 형태로 저장됩니다.
+
+    저장 후 fresh_ttl이 지난 항목은 오래된(stale) 항목으로 간주합니다.
+    stale_while_revalidate가 켜져 있으면 오래된 항목도 즉시 응답에 사용하고
+    백그라운드에서 갱신하며, max_stale이 지난 항목은 사용하지 않습니다.
+    """
+
+    def __init__(
+        self,
+        maxsize: int | None = None,
+        bucket_name: str | None = None,
+        prefix: str | None = None,
+        use_gcs: bool | None = None,
+        fresh_ttl: float | None = None,
+        max_stale: float | None = None,
+        stale_while_revalidate: bool | None = None,
+    ):
+        self.maxsize = maxsize if maxsize is not None else int(os.getenv("OPENDART_CACHE_SIZE", 1024))
+        self.bucket_name = bucket_name or os.getenv("OPENDART_CACHE_BUCKET", "sayouzone-ai-stocks")
+        self.prefix = (prefix or os.getenv("OPENDART_CACHE_PREFIX", "OpenDart/cache")).strip("/")
+        self.use_gcs = use_gcs if use_gcs is not None else os.getenv("OPENDART_CACHE_GCS", "1") != "0"
+        # 0도 유효한 값입니다. (fresh_ttl=0이면 항상 다시 확인)
+        self.fresh_ttl = fresh_ttl if fresh_ttl is not None else float(os.getenv("OPENDART_CACHE_TTL", 86400))
+        self.max_stale = max_stale if max_stale is not None else float(os.getenv("OPENDART_CACHE_MAX_STALE", 180 * 86400))
+        self.stale_while_revalidate = (
+            stale_while_revalidate if stale_while_revalidate is not None
+            else os.getenv("OPENDART_CACHE_SWR", "1") != "0"
+        )
+
+        self._memory: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._gcs = None
+        self._gcs_lock = threading.Lock()
+
+        self._memory_hits = 0
+        self._remote_hits = 0
+        self._misses = 0
+        self._stale_hits = 0
+        self._invalidated = 0
+
+    @staticmethod
+    def key(tool: str, corp_code: str, year: int, quarter: int) -> str:
+        return f"{tool}/{corp_code.strip()}/{int(year)}Q{int(quarter)}"
+
+    @property
+    def gcs(self):
+        """GCSManager는 처음 사용할 때 생성합니다."""
+        if self._gcs is None:
+            with self._gcs_lock:
+                if self._gcs is None:
+                    from .gcpmanager import GCSManager
+                    self._gcs = GCSManager(bucket_name=self.bucket_name)
+        return self._gcs
+
+    def _blob_name(self, key: str) -> str:
+        return f"{self.prefix}/v{SCHEMA_VERSION}/{key}.json"
+
+    def is_fresh(self, entry: dict) -> bool:
+        return time.time() - entry.get("stored_at", 0) < self.fresh_ttl
+
+    def _is_usable(self, entry: dict) -> bool:
+        return time.time() - entry.get("stored_at", 0) < self.max_stale
+
+    def get_local(self, key: str) -> dict | None:
+        """프로세스 내 LRU에서 항목을 찾습니다."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None or not self._is_usable(entry):
+                return None
+            self._memory.move_to_end(key)
+            self._memory_hits += 1
+            if not self.is_fresh(entry):
+                self._stale_hits += 1
+            return entry
+
+    def get_remote(self, key: str) -> dict | None:
+        """GCS에서 항목을 찾아 LRU에 적재합니다. (블로킹 호출)"""
+        entry = None
+        if self.use_gcs:
+            content = self.gcs.read_file(self._blob_name(key))
+            if content:
+                try:
+                    entry = json.loads(content)
+                except ValueError as e:
+                    logger.warning(f"캐시 항목을 해석하지 못했습니다 ({key}): {e}")
+            if isinstance(entry, list):
+                # 저장 시각이 없는 이전 형식은 오래된 항목으로 취급합니다.
+                entry = {"stored_at": 0, "data": entry}
+
+        if entry is None or not self._is_usable(entry):
+            with self._lock:
+                self._misses += 1
+            return None
+
+        with self._lock:
+            self._remote_hits += 1
+            if not self.is_fresh(entry):
+                self._stale_hits += 1
+            self._store(key, entry)
+        return entry
+
+    def get(self, key: str) -> dict | None:
+        entry = self.get_local(key)
+        if entry is None:
+            entry = self.get_remote(key)
+        return entry
+
+    def put(self, key: str, data: Any) -> dict:
+        """LRU에 값을 저장하고 저장된 항목을 반환합니다."""
+        entry = {"stored_at": time.time(), "data": data}
+        with self._lock:
+            self._store(key, entry)
+        return entry
+
+    def _store(self, key: str, entry: dict):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def put_remote(self, key: str, entry: dict) -> bool:
+        """GCS에 항목을 저장합니다. (블로킹 호출)"""
+        if not self.use_gcs:
+            return False
+        payload = json.dumps(entry, ensure_ascii=False)
+        return self.gcs.upload_file(payload, self._blob_name(key), content_type="application/json")
+
+    def invalidate(self, key: str) -> bool:
+        """LRU에서 항목을 지웁니다. 지운 항목이 있으면 True."""
+        with self._lock:
+            found = self._memory.pop(key, None) is not None
+            if found:
+                self._invalidated += 1
+        return found
+
+    def delete_remote(self, key: str) -> bool:
+        """GCS에서 항목을 지웁니다. (블로킹 호출)"""
+        if not self.use_gcs:
+            return False
+        return self.gcs.delete(self._blob_name(key))
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._memory)
+            memory_hits, remote_hits, misses = self._memory_hits, self._remote_hits, self._misses
+            stale_hits, invalidated = self._stale_hits, self._invalidated
+        lookups = memory_hits + remote_hits + misses
+        return {
+            "size": size,
+            "maxsize": self.maxsize,
+            "memory_hits": memory_hits,
+            "remote_hits": remote_hits,
+            "misses": misses,
+            "stale_hits": stale_hits,
+            "invalidated": invalidated,
+            "hit_ratio": round((memory_hits + remote_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+class Revalidator:
+    """캐시 항목의 백그라운드 갱신을 키별로 하나씩만 실행합니다."""
+
+    def __init__(self):
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._started = 0
+        self._coalesced = 0
+        self._failed = 0
+
+    def schedule(self, key: str, refresh: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """key에 대한 갱신을 예약합니다. 이미 진행 중이면 기존 작업을 반환합니다."""
+        task = self._tasks.get(key)
+        if task is not None and not task.done():
+            self._coalesced += 1
+            return task
+
+        self._started += 1
+        task = asyncio.create_task(self._run(key, refresh))
+        self._tasks[key] = task
+        return task
+
+    async def _run(self, key: str, refresh: Callable[[], Awaitable[Any]]):
+        try:
+            await refresh()
+            logger.info(f"캐시 항목을 갱신했습니다: {key}")
+        except Exception as e:
+            self._failed += 1
+            logger.warning(f"캐시 항목 갱신 실패 ({key}): {e}")
+        finally:
+            self._tasks.pop(key, None)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._tasks),
+            "started": self._started,
+            "coalesced": self._coalesced,
+            "failed": self._failed,
+        }
@@ -0,0 +1,205 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from .disclosures import Disclosure, DisclosureStream
+from .filing_index import KST
+
+logger = logging.getLogger(__name__)
+
+# 정기보고서 제출로 바뀌는 보고서 유형 (응답 캐시와 공시 인덱스의 키)
+PERIODIC_REPORTS = (
+    "financial_statements",
+    "single_company_main_accounts",
+    "single_company_key_financial_indicators",
+    "dividends",
+    "director_compensation",
+    "total_director_compensation",
+    "top5_director_compensation",
+)
+
+# 예) "[기재정정]사업보고서 (2025.12)", "분기보고서 (2026.03)"
+_PERIODIC_PATTERN = re.compile(r"(사업|반기|분기)보고서\s*\((\d{4})\.(\d{2})\)")
+# 워터마크 이하의 공시가 이만큼 이어지면 더 읽지 않습니다. (같은 날 공시의 순서가 조금 어긋나도 놓치지 않도록)
+_OVERLAP = 20
+
+
+@dataclass(slots=True, frozen=True)
+class Change:
+    """새 공시로 바뀌었을 수 있는 보고서"""
+
+    report: str
+    corp_code: str
+    year: int
+    quarter: int
+
+
+def report_period(report_nm: str) -> tuple[int, int] | None:
+    """정기보고서 이름에서 (사업연도, 분기)를 찾습니다. 정기보고서가 아니면 None.
+
+    보고서명의 기간은 보고 기간 종료 연월이며, 분기는 보고서 종류로 정합니다.
+    (사업보고서는 4, 반기보고서는 2, 분기보고서는 종료월이 상반기이면 1, 하반기이면 3)
+    """
+    match = _PERIODIC_PATTERN.search(report_nm)
+    if match is None:
+        return None
+    kind, year, month = match.group(1), int(match.group(2)), int(match.group(3))
+    if kind == "사업":
+        return year, 4
+    if kind == "반기":
+        return year, 2
+    return year, 1 if (month - 1) // 3 + 1 <= 2 else 3
+
+
+def changes_for(disclosure: Disclosure) -> list[Change]:
+    """공시 한 건으로 바뀌었을 수 있는 보고서 목록을 반환합니다."""
+    period = report_period(disclosure.report_nm)
+    if period is None:
+        return []
+    year, quarter = period
+    return [Change(report, disclosure.corp_code, year, quarter) for report in PERIODIC_REPORTS]
+
+
+class ChangeFeed:
+    """새 공시를 주기적으로 확인하여 영향을 받는 캐시 항목만 무효화합니다.
+
+    - 마지막으로 확인한 접수번호(rcept_no)를 워터마크로 저장하고, 그 이후의 공시만 읽습니다.
+      공시검색은 최신순이므로 워터마크에 도달하면 남은 페이지는 요청하지 않습니다.
+    - 정기공시(A)만 읽습니다. 거래소 공시의 접수번호(YYYYMMDD80xxxx)는 같은 날 DART 공시
+      (YYYYMMDD00xxxx)보다 크므로, 섞어서 비교하면 그날 이후의 정기보고서를 놓칩니다.
+    - 정기보고서는 (기업, 사업연도, 분기)의 재무·배당·보수 캐시와 공시 인덱스 항목을 지웁니다.
+      GCS 항목은 다른 인스턴스가 저장했을 수 있으므로 로컬 상태와 관계없이 같은 규칙의 키로 모두 지웁니다.
+    - 워터마크가 없으면(처음 실행) 최신 접수번호만 기록하고 무효화하지 않습니다.
+    """
+
+    def __init__(self, client, cache, filing_index, interval: float | None = None, filename: str | None = None, prefetch: bool | None = None):
+        self.client = client
+        self.cache = cache
+        self.filing_index = filing_index
+        self.interval = interval if interval is not None else float(os.getenv("OPENDART_CHANGEFEED_INTERVAL", "300"))
+        self.filename = filename or os.getenv("OPENDART_CHANGEFEED_FILE", "changefeed.json")
+        # 무효화한 항목을 바로 다시 조회할지 여부
+        self.prefetch = prefetch if prefetch is not None else os.getenv("OPENDART_CHANGEFEED_PREFETCH", "0") == "1"
+        self.watermark: str | None = None
+        self._polls = 0
+        self._disclosures = 0
+        self._invalidated = 0
+        self._last_poll: float | None = None
+        self._last_error: str | None = None
+        self.load()
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0
+
+    def load(self):
+        try:
+            with open(self.filename, "r", encoding="utf-8") as json_file:
+                self.watermark = json.load(json_file).get("watermark")
+        except (OSError, ValueError):
+            self.watermark = None
+        if self.watermark and self.watermark[8:10] != "00":
+            # 이전에 거래소 공시 접수번호가 저장되었으면 그날의 DART 공시부터 다시 읽습니다.
+            self.watermark = f"{self.watermark[:8]}000000"
+
+    def save(self):
+        """워터마크를 파일에 원자적으로 저장합니다. (블로킹 호출)"""
+        directory = os.path.dirname(os.path.abspath(self.filename))
+        try:
+            fd, tmp_filename = tempfile.mkstemp(prefix=".changefeed.", suffix=".tmp", dir=directory)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as json_file:
+                    json.dump({"watermark": self.watermark, "updated_at": time.time()}, json_file)
+                os.replace(tmp_filename, self.filename)
+            except BaseException:
+                os.unlink(tmp_filename)
+                raise
+        except OSError as e:
+            logger.warning(f"공시 워터마크를 저장하지 못했습니다: {e}")
+
+    async def read_new(self) -> tuple[list[Disclosure], str | None]:
+        """워터마크 이후의 공시와 새 워터마크를 반환합니다."""
+        today = datetime.now(KST).date()
+        start = datetime.strptime(self.watermark[:8], "%Y%m%d").date() if self.watermark else today
+        stream = DisclosureStream(self.client, start=min(start, today), end=today, kind="A", prefetch=False)
+
+        disclosures: list[Disclosure] = []
+        newest = self.watermark
+        old = 0
+        items = stream.__aiter__()
+        try:
+            async for disclosure in items:
+                if newest is None or disclosure.rcept_no > newest:
+                    newest = disclosure.rcept_no
+                if self.watermark is None:
+                    # 처음 실행하면 최신 접수번호만 기록합니다.
+                    break
+                if disclosure.rcept_no <= self.watermark:
+                    old += 1
+                    if old >= _OVERLAP:
+                        break
+                    continue
+                old = 0
+                disclosures.append(disclosure)
+        finally:
+            await items.aclose()
+        return disclosures, newest
+
+    def invalidate(self, change: Change) -> bool:
+        """변경된 보고서의 LRU 항목과 공시 인덱스 항목을 지웁니다. 지운 항목이 있으면 True."""
+        key = self.cache.key(change.report, change.corp_code, change.year, change.quarter)
+        local = self.cache.invalidate(key)
+        indexed = self.filing_index.invalidate(change.corp_code, change.report, change.year, change.quarter)
+        return local or indexed
+
+    async def poll(self, executor) -> list[Change]:
+        """새 공시를 읽고 영향을 받는 항목을 무효화합니다.
+
+        Returns:
+            캐시나 공시 인덱스에 항목이 있었던(이전에 조회된) 보고서 목록 (미리 다시 조회할 대상)
+        """
+        self._polls += 1
+        self._last_poll = time.time()
+        try:
+            disclosures, newest = await self.read_new()
+        except Exception as e:
+            self._last_error = str(e)
+            raise
+
+        changes = list(dict.fromkeys(change for disclosure in disclosures for change in changes_for(disclosure)))
+        affected = [change for change in changes if self.invalidate(change)]
+        remote = [self.cache.key(change.report, change.corp_code, change.year, change.quarter) for change in changes]
+        # GCS 삭제만 작업자 풀에서 실행합니다. (없는 항목은 False)
+        deleted = await asyncio.gather(*(executor.run(self.cache.delete_remote, key) for key in remote))
+        self._invalidated += len(affected) + sum(deleted)
+        if affected and self.filing_index.dirty:
+            executor.submit(self.filing_index.save)
+
+        self._disclosures += len(disclosures)
+        self._last_error = None
+        if newest is not None and newest != self.watermark:
+            self.watermark = newest
+            await executor.run(self.save)
+        if disclosures:
+            logger.info(f"새 공시 {len(disclosures)}건, 무효화한 보고서 {len(affected)}건 (워터마크 {self.watermark})")
+        return affected
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "interval": self.interval,
+            "watermark": self.watermark,
+            "prefetch": self.prefetch,
+            "polls": self._polls,
+            "disclosures": self._disclosures,
+            "invalidated": self._invalidated,
+            "last_poll": self._last_poll,
+            "last_error": self._last_error,
+        }
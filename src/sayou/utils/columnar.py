@@ -0,0 +1,111 @@
+import dataclasses
+import logging
+
+from enum import Enum
+from operator import attrgetter
+from typing import Any, Sequence
+
+logger = logging.getLogger(__name__)
+
+# 재무제표·주요계정 응답의 금액 열 (DART는 "9,999,999,999", "-", "" 형식의 문자열로 반환)
+AMOUNT_COLUMNS = (
+    "thstrm_amount",
+    "thstrm_add_amount",
+    "frmtrm_amount",
+    "frmtrm_q_amount",
+    "frmtrm_add_amount",
+    "bfefrmtrm_amount",
+)
+
+_INTEGER_PATTERN = r"^-?\d{1,18}$"
+_SCALARS = (str, int, float, bool)
+
+
+def _plain(value: Any) -> Any:
+    """Enum, 데이터 클래스, 목록을 JSON으로 바꿀 수 있는 값으로 변환합니다. (BaseOpenDartData.to_dict()와 같은 규칙)"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    return value
+
+
+def item_columns(items: Sequence[Any]) -> dict[str, list]:
+    """데이터 클래스 목록을 열 목록으로 바꿉니다. (행마다 to_dict()를 호출하지 않음)
+
+    필드 목록은 첫 항목에서 한 번만 읽습니다. 값의 형식은 열의 첫 값으로 판단하여
+    Enum·중첩 데이터 클래스가 있는 열만 변환합니다.
+    """
+    if not items:
+        return {}
+    columns = {}
+    for field in dataclasses.fields(items[0]):
+        values = list(map(attrgetter(field.name), items))
+        sample = next((value for value in values if value is not None), None)
+        if sample is not None and not isinstance(sample, _SCALARS):
+            values = [_plain(value) for value in values]
+        columns[field.name] = values
+    return columns
+
+
+def _scalar_array(values: list):
+    """열을 Arrow 배열로 바꿉니다. 숫자와 문자열이 섞인 열은 문자열로 맞춥니다."""
+    import pyarrow as pa
+
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        if not all(value is None or isinstance(value, _SCALARS) for value in values):
+            raise
+        return pa.array([None if value is None else str(value) for value in values], type=pa.string())
+
+
+def parse_amounts(values: Sequence[Any]):
+    """금액 문자열을 int64 Arrow 배열로 바꿉니다. 숫자가 아닌 값("-", "")은 null입니다.
+
+    쉼표 제거, 형식 확인, 형 변환을 모두 Arrow 연산으로 처리하므로 행 단위 파이썬 코드가 없습니다.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    array = _scalar_array(list(values))
+    if pa.types.is_integer(array.type) or pa.types.is_null(array.type):
+        return array.cast(pa.int64())
+    if pa.types.is_floating(array.type):
+        return pc.cast(array, pa.int64(), safe=False)
+
+    text = pc.utf8_trim_whitespace(pc.replace_substring(array.cast(pa.string()), ",", ""))
+    valid = pc.match_substring_regex(text, _INTEGER_PATTERN)
+    return pc.cast(pc.if_else(valid, text, pa.scalar(None, pa.string())), pa.int64())
+
+
+def to_records(items: Sequence[Any]) -> list[dict]:
+    """크롤러 결과를 도구 결과(레코드 목록)로 바꿉니다.
+
+    금액 열만 Arrow로 정수 변환하고, 레코드는 열 목록을 묶어 한 번에 만듭니다.
+    """
+    if not items:
+        return []
+    columns = item_columns(items)
+    for name in AMOUNT_COLUMNS:
+        if name in columns:
+            columns[name] = parse_amounts(columns[name]).to_pylist()
+    names = list(columns)
+    return [dict(zip(names, row)) for row in zip(*columns.values())]
+
+
+def frame_records(frame) -> list[dict]:
+    """DataFrame을 레코드 목록으로 바꿉니다. (JSON 문자열을 거치지 않음)
+
+    날짜·시간 열은 ISO 8601 문자열로, 결측값은 None으로 바꿉니다.
+    """
+    import pandas as pd
+
+    frame = frame.copy(deep=False)
+    for name in frame.columns:
+        column = frame[name]
+        if pd.api.types.is_datetime64_any_dtype(column):
+            frame[name] = column.map(lambda value: None if pd.isna(value) else value.isoformat())
+    return frame.astype(object).where(frame.notna(), None).to_dict(orient="records")
@@ -0,0 +1,63 @@
+import logging
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_API_KEY_SECRET = "projects/1037372895180/secrets/DART_API_KEY/versions/latest"
+
+
+def resolve_api_key() -> str:
+    """DART API 키를 찾습니다.
+
+    다음 순서로 확인합니다. 찾은 키는 반환만 하고 환경 변수에는 쓰지 않으므로
+    (하위 프로세스나 환경 변수 덤프로 새지 않도록) 호출한 쪽에서 명시적으로 전달합니다.
+    1. DART_API_KEY 환경 변수
+    2. DART_API_KEY_FILE 환경 변수가 가리키는 로컬 파일
+    3. Secret Manager (DART_API_KEY_SECRET, 기본값: 프로젝트의 DART_API_KEY 시크릿)
+
+    Raises:
+        RuntimeError: 어디에서도 키를 찾지 못한 경우
+    """
+    api_key = os.getenv("DART_API_KEY")
+    if api_key:
+        logger.info("DART API 키를 환경 변수에서 가져왔습니다.")
+        return api_key
+
+    key_file = os.getenv("DART_API_KEY_FILE")
+    if key_file and os.path.exists(key_file):
+        with open(key_file, "r", encoding="utf-8") as file:
+            api_key = file.read().strip()
+        if api_key:
+            logger.info(f"DART API 키를 파일에서 가져왔습니다: {key_file}")
+            return api_key
+
+    name = os.getenv("DART_API_KEY_SECRET", DEFAULT_API_KEY_SECRET)
+    try:
+        from google.cloud import secretmanager
+
+        sm_client = secretmanager.SecretManagerServiceClient()
+        response = sm_client.access_secret_version(name=name)
+        api_key = response.payload.data.decode("UTF-8")
+    except Exception as e:
+        raise RuntimeError(f"DART API 키를 가져오지 못했습니다: {e}") from e
+
+    logger.info("DART API 키를 Secret Manager에서 가져왔습니다.")
+    return api_key
+
+
+def resolve_api_keys() -> list[str]:
+    """사용할 DART API 키 목록을 찾습니다.
+
+    DART_API_KEYS 환경 변수(쉼표 또는 줄바꿈으로 구분)가 있으면 사용하고,
+    없으면 resolve_api_key()로 찾은 값을 같은 방식으로 나눕니다.
+    (Secret Manager 시크릿에 여러 키를 저장할 수 있습니다.)
+
+    Raises:
+        RuntimeError: 키를 찾지 못한 경우
+    """
+    value = os.getenv("DART_API_KEYS") or resolve_api_key()
+    api_keys = [key for key in re.split(r"[\s,]+", value) if key]
+    if not api_keys:
+        raise RuntimeError("DART API 키가 비어 있습니다.")
+    return api_keys
@@ -0,0 +1,256 @@
+import logging
+import re
+import sys
+
+from array import array
+from bisect import bisect_left
+from typing import Iterable
+
+logger = logging.getLogger(__name__)
+
+_MARKET_SUFFIX = re.compile(r"\.(KS|KQ|KRX)$", re.IGNORECASE)
+_CORP_FORMS = re.compile(
+    r"\(주\)|㈜|\(株\)|주식회사|유한회사|"
+    r"\b(co\.?,?\s*ltd\.?|corporation|corp\.?|inc\.?|limited|ltd\.?|company)\b",
+    re.IGNORECASE,
+)
+_PUNCTUATION = re.compile(r"[\s.,·&()\[\]'\"-]+")
+
+# 유사 기업명 검색 결과를 그대로 사용하려면 가장 높은 점수가 FUZZY_ACCEPT 이상이고
+# 다음 후보보다 FUZZY_MARGIN 이상 높아야 합니다. (오타로 다른 기업의 데이터를 반환하지 않도록)
+FUZZY_ACCEPT = 0.5
+FUZZY_MARGIN = 0.1
+
+
+def normalize_code(query: str) -> str:
+    """종목 코드의 시장 접미사(.KS/.KQ)와 공백을 제거합니다."""
+    return _MARKET_SUFFIX.sub("", query.strip()).upper()
+
+
+def normalize_name(name: str) -> str:
+    """기업명에서 회사 형태 표기((주), 주식회사, Co., Ltd. 등)와 공백·기호를 제거합니다."""
+    name = _CORP_FORMS.sub("", name or "")
+    return _PUNCTUATION.sub("", name).lower()
+
+
+class AmbiguousCorpError(ValueError):
+    """유사 기업명 검색 결과 중 하나를 고를 수 없는 경우 (후보 목록 포함)"""
+
+    def __init__(self, query: str, candidates: list[dict]):
+        names = ", ".join(
+            f"{candidate['corp_name']}({candidate['stock_code'] or candidate['corp_code']})" for candidate in candidates
+        )
+        super().__init__(f"기업을 특정할 수 없습니다: {query} (후보: {names})")
+        self.query = query
+        self.candidates = candidates
+
+
+def pick_fuzzy(query: str, matches: list[tuple[int, float]], record) -> int | None:
+    """유사 기업명 검색 결과에서 확실한 하나를 고릅니다.
+
+    후보가 없으면 None, 가장 높은 점수가 충분히 높고 다음 후보와 차이가 나면 그 행 번호를 반환하고,
+    그렇지 않으면 후보 목록과 함께 AmbiguousCorpError를 발생시킵니다.
+    """
+    if not matches:
+        return None
+    row, score = matches[0]
+    runner_up = matches[1][1] if len(matches) > 1 else 0.0
+    if score >= FUZZY_ACCEPT and score - runner_up >= FUZZY_MARGIN:
+        return row
+    candidates = [{**record(row), "score": round(score, 3)} for row, score in matches]
+    raise AmbiguousCorpError(query, candidates)
+
+
+def trigrams(text: str) -> set[str]:
+    """문자 단위 3-gram 집합을 반환합니다. (짧은 문자열은 그대로 사용)"""
+    if len(text) < 3:
+        return {text} if text else set()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class CorpCodeIndex:
+    """corp_data(기업코드 목록)에 대한 메모리 인덱스.
+
+    - stock_code, corp_code: 해시 맵으로 O(1) 조회
+    - 정규화된 한글/영문 기업명: 해시 맵으로 O(1) 조회
+    - 기업명 접두사: 정렬된 이름 목록에서 이진 탐색
+    - 유사 기업명: 3-gram 역색인 (첫 사용 시 생성)
+
+    문자열은 intern하여 열(column) 단위 리스트에 저장하고,
+    맵에는 행 번호만 저장하여 작업자당 메모리 사용량을 줄입니다.
+    """
+
+    def __init__(self, records: Iterable[dict]):
+        self.corp_codes: list[str] = []
+        self.corp_names: list[str] = []
+        self.eng_names: list[str] = []
+        self.stock_codes: list[str] = []
+        self.modify_dates: list[str] = []
+
+        self._by_corp: dict[str, int] = {}
+        self._by_stock: dict[str, int] = {}
+        self._by_name: dict[str, int] = {}
+        self._trigrams: TrigramIndex | None = None
+
+        for record in records:
+            self._append(record)
+
+        self._sorted_names = sorted(self._by_name)
+        logger.info(f"기업코드 인덱스 생성: {len(self)}건 (상장 {len(self._by_stock)}건)")
+
+    @staticmethod
+    def _field(record: dict, name: str) -> str:
+        return sys.intern((record.get(name) or "").strip())
+
+    def _append(self, record: dict):
+        corp_code = self._field(record, "corp_code")
+        if not corp_code:
+            return
+        row = len(self.corp_codes)
+        stock_code = self._field(record, "stock_code")
+
+        self.corp_codes.append(corp_code)
+        self.corp_names.append(self._field(record, "corp_name"))
+        self.eng_names.append(self._field(record, "corp_eng_name"))
+        self.stock_codes.append(stock_code)
+        self.modify_dates.append(self._field(record, "modify_date"))
+
+        self._by_corp[corp_code] = row
+        if stock_code:
+            self._by_stock[stock_code] = row
+        for name in (self.corp_names[row], self.eng_names[row]):
+            key = sys.intern(normalize_name(name))
+            if key:
+                self._add_name(key, row)
+
+    def _add_name(self, key: str, row: int):
+        """같은 이름이 여러 개면 상장 기업을 우선합니다."""
+        current = self._by_name.get(key)
+        if current is None or (not self.stock_codes[current] and self.stock_codes[row]):
+            self._by_name[key] = row
+
+    def __len__(self) -> int:
+        return len(self.corp_codes)
+
+    def record(self, row: int) -> dict:
+        return {
+            "corp_code": self.corp_codes[row],
+            "corp_name": self.corp_names[row],
+            "corp_eng_name": self.eng_names[row],
+            "stock_code": self.stock_codes[row],
+            "modify_date": self.modify_dates[row],
+        }
+
+    def records(self) -> Iterable[dict]:
+        for row in range(len(self)):
+            yield self.record(row)
+
+    def get(self, corp_code: str) -> dict | None:
+        row = self._by_corp.get(corp_code)
+        return None if row is None else self.record(row)
+
+    def corp_name(self, corp_code: str) -> str | None:
+        row = self._by_corp.get(corp_code)
+        return None if row is None else self.corp_names[row]
+
+    def resolve(self, query: str, listed_only: bool = True, fuzzy: bool = True) -> str | None:
+        """종목 코드, corp_code 또는 기업명으로 corp_code를 찾습니다."""
+        row = self.find(query, listed_only, fuzzy)
+        return None if row is None else self.corp_codes[row]
+
+    def find(self, query: str, listed_only: bool = True, fuzzy: bool = True) -> int | None:
+        """query에 해당하는 행 번호를 반환합니다.
+
+        순서: 종목 코드 → corp_code → 정확한 기업명 → 기업명 접두사 → 유사 기업명
+        유사 기업명 검색은 역색인 생성과 검색 비용이 크므로 fuzzy=False이면 하지 않습니다.
+        (이벤트 루프에서는 fuzzy=False로 호출하고, 찾지 못하면 작업자 스레드에서 다시 찾습니다)
+
+        Raises:
+            AmbiguousCorpError: 유사 기업명 후보 중 하나를 고를 수 없는 경우
+        """
+        if not query:
+            return None
+        code = normalize_code(query)
+        row = self._by_stock.get(code)
+        if row is not None:
+            return row
+        row = self._by_corp.get(code)
+        if row is not None:
+            return row
+
+        key = normalize_name(query)
+        if not key:
+            return None
+        row = self._by_name.get(key)
+        if row is not None and self._eligible(row, listed_only):
+            return row
+
+        row = self._find_prefix(key, listed_only)
+        if row is not None or not fuzzy:
+            return row
+
+        return pick_fuzzy(query, self.search(query, limit=5, listed_only=listed_only), self.record)
+
+    def _eligible(self, row: int, listed_only: bool) -> bool:
+        return not listed_only or bool(self.stock_codes[row])
+
+    def _find_prefix(self, key: str, listed_only: bool) -> int | None:
+        """key로 시작하는 이름 중 가장 짧은 이름의 행을 반환합니다."""
+        best = None
+        index = bisect_left(self._sorted_names, key)
+        while index < len(self._sorted_names) and self._sorted_names[index].startswith(key):
+            name = self._sorted_names[index]
+            row = self._by_name[name]
+            if self._eligible(row, listed_only) and (best is None or len(name) < len(best[0])):
+                best = (name, row)
+            index += 1
+        return None if best is None else best[1]
+
+    def prepare_fuzzy(self):
+        """유사 기업명 검색용 역색인을 미리 생성합니다."""
+        if self._trigrams is None:
+            self._trigrams = TrigramIndex(self._sorted_names)
+
+    def search(self, query: str, limit: int = 10, listed_only: bool = True, threshold: float = 0.3) -> list[tuple[int, float]]:
+        """3-gram 유사도(Jaccard)로 기업명을 검색하여 (행 번호, 점수) 목록을 반환합니다."""
+        self.prepare_fuzzy()
+        best: dict[int, float] = {}
+        for position, score in self._trigrams.match(normalize_name(query), threshold):
+            row = self._by_name[self._sorted_names[position]]
+            if self._eligible(row, listed_only) and score > best.get(row, 0.0):
+                best[row] = score
+        scored = sorted(best.items(), key=lambda item: (-item[1], len(self.corp_names[item[0]])))
+        return scored[:limit]
+
+
+class TrigramIndex:
+    """이름 목록의 위치(position)를 값으로 하는 3-gram 역색인."""
+
+    def __init__(self, names: Iterable[str]):
+        self._postings: dict[str, array] = {}
+        self._counts = array("H")
+        for position, name in enumerate(names):
+            grams = trigrams(name)
+            self._counts.append(min(len(grams), 0xFFFF))
+            for gram in grams:
+                posting = self._postings.get(gram)
+                if posting is None:
+                    posting = self._postings[gram] = array("I")
+                posting.append(position)
+
+    def match(self, key: str, threshold: float) -> list[tuple[int, float]]:
+        """Jaccard 유사도가 threshold 이상인 (위치, 점수) 목록을 반환합니다."""
+        grams = trigrams(key)
+        if not grams:
+            return []
+        counts: dict[int, int] = {}
+        for gram in grams:
+            for position in self._postings.get(gram, ()):
+                counts[position] = counts.get(position, 0) + 1
+
+        matches = []
+        for position, common in counts.items():
+            score = common / (len(grams) + self._counts[position] - common)
+            if score >= threshold:
+                matches.append((position, score))
+        return matches
@@ -0,0 +1,188 @@
+import io
+import logging
+import os
+import threading
+import time
+import zipfile
+
+from dataclasses import dataclass, field
+from typing import IO, Iterator
+
+from lxml import etree
+
+from .corp_index import CorpCodeIndex
+from .corp_snapshot import CorpCodeSnapshot, SnapshotError, write_snapshot
+
+logger = logging.getLogger(__name__)
+
+CORP_CODE_URL = "https://opendart.fss.or.kr/api/corpCode.xml"
+CORP_CODE_FIELDS = ("corp_code", "corp_name", "corp_eng_name", "stock_code", "modify_date")
+
+
+def iter_corp_codes(stream: IO[bytes]) -> Iterator[dict]:
+    """CORPCODE.xml을 <list> 요소 단위로 스트리밍 파싱합니다.
+
+    처리한 요소는 바로 해제하므로 문서 전체를 메모리에 올리지 않습니다.
+    """
+    for _, element in etree.iterparse(stream, events=("end",), tag="list"):
+        record = {child.tag: (child.text or "").strip() for child in element if child.tag in CORP_CODE_FIELDS}
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+        if record.get("corp_code"):
+            yield record
+
+
+@dataclass
+class CorpCodeDiff:
+    """현재 인덱스와 새 기업코드 목록의 차이"""
+
+    added: list[dict] = field(default_factory=list)
+    modified: list[dict] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.modified or self.removed)
+
+    def summary(self) -> dict:
+        return {"added": len(self.added), "modified": len(self.modified), "removed": len(self.removed)}
+
+
+def diff_corp_codes(current, records: Iterator[dict]) -> CorpCodeDiff:
+    """corp_code로 대조하여 새로 생기거나 modify_date 등이 바뀐 항목만 골라냅니다.
+
+    Args:
+        current: CorpCodeIndex 또는 CorpCodeSnapshot
+        records: 새 기업코드 목록
+    """
+    diff = CorpCodeDiff()
+    seen = set()
+    for record in records:
+        corp_code = record["corp_code"]
+        seen.add(corp_code)
+        existing = current.get(corp_code)
+        if existing is None:
+            diff.added.append(record)
+        elif any(existing.get(name, "") != record.get(name, "") for name in CORP_CODE_FIELDS):
+            # modify_date가 바뀌지 않아도 상장/폐지 등으로 종목코드가 달라질 수 있습니다.
+            diff.modified.append(record)
+
+    for existing in current.records():
+        if existing["corp_code"] not in seen:
+            diff.removed.append(existing["corp_code"])
+    return diff
+
+
+def apply_diff(current, diff: CorpCodeDiff) -> list[dict]:
+    """현재 인덱스의 레코드에 변경분을 반영한 새 레코드 목록을 만듭니다."""
+    changes = {record["corp_code"]: record for record in diff.added + diff.modified}
+    removed = set(diff.removed)
+    records = []
+    for record in current.records():
+        corp_code = record["corp_code"]
+        if corp_code in removed:
+            continue
+        records.append(changes.pop(corp_code, record))
+    records.extend(changes.values())
+    return records
+
+
+class CorpCodeRefresher:
+    """DART 기업코드 목록을 주기적으로 내려받아 변경분만 인덱스에 반영합니다.
+
+    - corpCode.xml ZIP을 내려받아 CORPCODE.xml을 스트리밍으로 파싱합니다.
+      비상장 기업도 공시를 내므로 상장 여부와 관계없이 전체 목록과 비교합니다.
+      (처음 스냅샷도 크롤러가 내려받은 전체 CORPCODE 목록으로 만들어집니다)
+    - 현재 인덱스와 비교하여 변경이 없으면 아무것도 바꾸지 않습니다.
+    - 변경이 있으면 새 스냅샷 파일을 원자적으로 교체하고, 런타임의 인덱스 참조를 바꿉니다.
+      다른 작업자 프로세스는 스냅샷 파일 교체를 감지하여 다시 매핑합니다.
+    - 스냅샷이 interval보다 최근에 만들어졌으면(다른 작업자가 갱신한 경우) 내려받지 않습니다.
+    """
+
+    def __init__(self, runtime, interval: float | None = None):
+        self.runtime = runtime
+        self.interval = interval if interval is not None else float(os.getenv("OPENDART_CORP_REFRESH", "86400"))
+        self._lock = threading.Lock()
+        self._last_refresh: float | None = None
+        self._last_diff: dict | None = None
+        self._last_error: str | None = None
+        self._refreshes = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval > 0
+
+    def download(self) -> bytes:
+        """corpCode.xml ZIP을 내려받습니다. (블로킹 호출)"""
+        client = self.runtime.crawler.client
+        response = client._get(CORP_CODE_URL, params={"crtfc_key": client.api_key})
+        content = response.content
+        if not zipfile.is_zipfile(io.BytesIO(content)):
+            # 인증키 오류 등은 ZIP 대신 XML/JSON 오류 메시지로 응답합니다.
+            raise RuntimeError(f"기업코드 ZIP이 아닙니다: {content[:200]!r}")
+        return content
+
+    def _is_recent(self) -> bool:
+        """스냅샷 파일의 수정 시각이 interval 이내인지 확인합니다."""
+        try:
+            return time.time() - os.path.getmtime(self.runtime.snapshot_filename) < self.interval
+        except OSError:
+            return False
+
+    def refresh(self, force: bool = False) -> CorpCodeDiff | None:
+        """기업코드 목록을 갱신합니다. 변경분을 반환합니다. (블로킹 호출)"""
+        if not self._lock.acquire(blocking=False):
+            logger.info("기업코드 갱신이 이미 진행 중입니다.")
+            return None
+        try:
+            current = self.runtime.corp_index
+            if not force and self._is_recent():
+                logger.info("기업코드 스냅샷이 최근에 갱신되어 내려받지 않습니다.")
+                return None
+
+            started = time.perf_counter()
+            content = self.download()
+            with zipfile.ZipFile(io.BytesIO(content)) as zf:
+                with zf.open("CORPCODE.xml") as stream:
+                    diff = diff_corp_codes(current, iter_corp_codes(stream))
+
+            if diff:
+                self._apply(current, diff)
+            elif isinstance(current, CorpCodeSnapshot):
+                # 변경이 없어도 수정 시각을 갱신하여 다른 작업자가 다시 내려받지 않도록 합니다.
+                os.utime(current.filename)
+
+            self._refreshes += 1
+            self._last_refresh = time.time()
+            self._last_diff = diff.summary()
+            self._last_error = None
+            logger.info(f"기업코드 갱신 완료: {self._last_diff} ({time.perf_counter() - started:.2f}s)")
+            return diff
+        except Exception as e:
+            self._last_error = str(e)
+            logger.error(f"기업코드 갱신 실패: {e}")
+            return None
+        finally:
+            self._lock.release()
+
+    def _apply(self, current, diff: CorpCodeDiff):
+        records = apply_diff(current, diff)
+        filename = self.runtime.snapshot_filename
+        try:
+            write_snapshot(records, filename)
+            updated = CorpCodeSnapshot(filename)
+        except (OSError, SnapshotError) as e:
+            logger.warning(f"기업코드 스냅샷을 저장하지 못해 메모리 인덱스를 갱신합니다: {e}")
+            updated = CorpCodeIndex(records)
+        # 교체 전에 역색인을 만들어 두어 다음 유사 기업명 검색이 기다리지 않게 합니다.
+        updated.prepare_fuzzy()
+        self.runtime.replace_corp_index(updated)
+
+    def stats(self) -> dict:
+        return {
+            "interval": self.interval,
+            "refreshes": self._refreshes,
+            "last_refresh": self._last_refresh,
+            "last_diff": self._last_diff,
+            "last_error": self._last_error,
+        }
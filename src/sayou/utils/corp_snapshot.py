@@ -0,0 +1,323 @@
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import time
+
+from typing import Iterable
+
+from .corp_index import TrigramIndex, normalize_code, normalize_name, pick_fuzzy
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SYCORPIX"
+VERSION = 1
+
+# magic, version, flags, 레코드 수, 상장 레코드 수, 이름 수, 생성 시각,
+# 레코드/종목코드 순열/이름 테이블/문자열 힙 오프셋, 힙 길이
+HEADER = struct.Struct("<8sHHIIIQQQQQQ")
+# corp_code, stock_code, modify_date, 기업명 (오프셋, 길이), 영문명 (오프셋, 길이)
+RECORD = struct.Struct("<8s6s8sIHIH")
+# 정규화된 이름 (오프셋, 길이), 레코드 번호
+NAME_ENTRY = struct.Struct("<IHI")
+ROW = struct.Struct("<I")
+
+
+class SnapshotError(Exception):
+    """스냅샷 파일이 없거나 형식(버전)이 맞지 않는 경우"""
+
+
+def _ascii(value: str, size: int) -> bytes:
+    return (value or "").strip().encode("ascii", "ignore")[:size].ljust(size, b"\0")
+
+
+def write_snapshot(records: Iterable[dict], filename: str) -> int:
+    """corp_data를 바이너리 스냅샷으로 저장합니다.
+
+    레코드는 corp_code 순으로 정렬된 고정 길이 구조체이고, 문자열은 중복을
+    제거하여 힙에 저장합니다. 임시 파일에 쓴 뒤 os.replace로 교체하므로
+    다른 프로세스는 항상 완전한 파일만 보게 됩니다.
+
+    Returns:
+        저장한 레코드 수
+    """
+    rows = sorted(
+        (record for record in records if (record.get("corp_code") or "").strip()),
+        key=lambda record: record["corp_code"].strip(),
+    )
+
+    heap = bytearray()
+    offsets: dict[str, tuple[int, int]] = {}
+
+    def intern(text: str) -> tuple[int, int]:
+        if text not in offsets:
+            data = text.encode("utf-8")[:0xFFFF]
+            offsets[text] = (len(heap), len(data))
+            heap.extend(data)
+        return offsets[text]
+
+    record_bytes = bytearray()
+    listed = []
+    names = []
+    for row, record in enumerate(rows):
+        corp_name = (record.get("corp_name") or "").strip()
+        eng_name = (record.get("corp_eng_name") or "").strip()
+        stock_code = (record.get("stock_code") or "").strip()
+        record_bytes += RECORD.pack(
+            _ascii(record["corp_code"], 8),
+            _ascii(stock_code, 6),
+            _ascii(record.get("modify_date"), 8),
+            *intern(corp_name),
+            *intern(eng_name),
+        )
+        if stock_code:
+            listed.append((stock_code, row))
+        for name in {normalize_name(corp_name), normalize_name(eng_name)}:
+            if name:
+                names.append((name.encode("utf-8"), row))
+
+    listed.sort()
+    names.sort()
+    stock_bytes = b"".join(ROW.pack(row) for _, row in listed)
+    name_bytes = bytearray()
+    for name, row in names:
+        offset, length = intern(name.decode("utf-8"))
+        name_bytes += NAME_ENTRY.pack(offset, length, row)
+
+    records_offset = HEADER.size
+    stock_offset = records_offset + len(record_bytes)
+    names_offset = stock_offset + len(stock_bytes)
+    heap_offset = names_offset + len(name_bytes)
+    header = HEADER.pack(
+        MAGIC, VERSION, 0, len(rows), len(listed), len(names), int(time.time()),
+        records_offset, stock_offset, names_offset, heap_offset, len(heap),
+    )
+
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, tmp_path = tempfile.mkstemp(prefix=".corpcode-", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as file:
+            for chunk in (header, record_bytes, stock_bytes, name_bytes, heap):
+                file.write(chunk)
+            file.flush()
+            os.fsync(file.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, filename)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    logger.info(f"기업코드 스냅샷 저장: {filename} ({len(rows)}건, {heap_offset + len(heap)} bytes)")
+    return len(rows)
+
+
+class CorpCodeSnapshot:
+    """write_snapshot으로 저장한 파일을 mmap으로 읽는 기업코드 조회 구조.
+
+    CorpCodeIndex와 같은 조회 API를 제공합니다. 파일은 읽기 전용으로 매핑되므로
+    여러 작업자 프로세스가 같은 페이지를 공유하고, 시작 시 파싱 비용이 없습니다.
+    유사 기업명 검색용 역색인만 처음 사용할 때 프로세스 메모리에 생성합니다.
+
+    한 번 연 스냅샷은 바뀌지 않습니다. 파일이 교체되면(changed()) 새 객체를 열어
+    참조를 바꿉니다. 이전 매핑은 참조가 사라질 때 닫힙니다.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._open()
+
+    def _open(self):
+        try:
+            with open(self.filename, "rb") as file:
+                stat = os.fstat(file.fileno())
+                mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise SnapshotError(f"스냅샷을 열 수 없습니다: {self.filename}: {e}") from e
+
+        if mm.size() < HEADER.size:
+            raise SnapshotError(f"스냅샷 헤더가 없습니다: {self.filename}")
+        (magic, version, _flags, count, stock_count, name_count, created_at,
+         records_offset, stock_offset, names_offset, heap_offset, heap_length) = HEADER.unpack_from(mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise SnapshotError(f"지원하지 않는 스냅샷 형식입니다: {self.filename} (version {version})")
+        if heap_offset + heap_length > mm.size():
+            raise SnapshotError(f"스냅샷 파일이 잘렸습니다: {self.filename}")
+
+        self._mm = mm
+        self._inode = (stat.st_dev, stat.st_ino)
+        self._count = count
+        self._stock_count = stock_count
+        self._name_count = name_count
+        self.created_at = created_at
+        self._records = records_offset
+        self._stocks = stock_offset
+        self._names = names_offset
+        self._heap = heap_offset
+        self._trigrams: TrigramIndex | None = None
+
+    def changed(self) -> bool:
+        """파일이 다른 파일로 교체되었는지(inode 변경) 확인합니다."""
+        try:
+            stat = os.stat(self.filename)
+        except OSError:
+            return False
+        return (stat.st_dev, stat.st_ino) != self._inode
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _text(self, offset: int, length: int) -> str:
+        start = self._heap + offset
+        return self._mm[start:start + length].decode("utf-8")
+
+    def _row(self, row: int) -> tuple:
+        return RECORD.unpack_from(self._mm, self._records + row * RECORD.size)
+
+    def _corp_code_at(self, row: int) -> bytes:
+        start = self._records + row * RECORD.size
+        return self._mm[start:start + 8]
+
+    def _stock_code_at(self, row: int) -> bytes:
+        start = self._records + row * RECORD.size + 8
+        return self._mm[start:start + 6].rstrip(b"\0")
+
+    def _stock_row(self, position: int) -> int:
+        return ROW.unpack_from(self._mm, self._stocks + position * ROW.size)[0]
+
+    def _name_entry(self, position: int) -> tuple[bytes, int]:
+        offset, length, row = NAME_ENTRY.unpack_from(self._mm, self._names + position * NAME_ENTRY.size)
+        start = self._heap + offset
+        return self._mm[start:start + length], row
+
+    @staticmethod
+    def _lower_bound(size: int, key_at, key: bytes) -> int:
+        low, high = 0, size
+        while low < high:
+            middle = (low + high) // 2
+            if key_at(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def record(self, row: int) -> dict:
+        corp_code, stock_code, modify_date, name_offset, name_length, eng_offset, eng_length = self._row(row)
+        return {
+            "corp_code": corp_code.decode("ascii"),
+            "corp_name": self._text(name_offset, name_length),
+            "corp_eng_name": self._text(eng_offset, eng_length),
+            "stock_code": stock_code.rstrip(b"\0").decode("ascii"),
+            "modify_date": modify_date.rstrip(b"\0").decode("ascii"),
+        }
+
+    def records(self) -> Iterable[dict]:
+        for row in range(self._count):
+            yield self.record(row)
+
+    def _find_corp(self, corp_code: str) -> int | None:
+        key = corp_code.encode("ascii", "ignore")
+        if len(key) != 8:
+            return None
+        row = self._lower_bound(self._count, self._corp_code_at, key)
+        if row < self._count and self._corp_code_at(row) == key:
+            return row
+        return None
+
+    def _find_stock(self, stock_code: str) -> int | None:
+        key = stock_code.encode("ascii", "ignore")
+        if not key or len(key) > 6:
+            return None
+        position = self._lower_bound(self._stock_count, lambda p: self._stock_code_at(self._stock_row(p)), key)
+        if position < self._stock_count:
+            row = self._stock_row(position)
+            if self._stock_code_at(row) == key:
+                return row
+        return None
+
+    def get(self, corp_code: str) -> dict | None:
+        row = self._find_corp(corp_code)
+        return None if row is None else self.record(row)
+
+    def corp_name(self, corp_code: str) -> str | None:
+        row = self._find_corp(corp_code)
+        if row is None:
+            return None
+        _, _, _, name_offset, name_length, _, _ = self._row(row)
+        return self._text(name_offset, name_length)
+
+    def resolve(self, query: str, listed_only: bool = True, fuzzy: bool = True) -> str | None:
+        """종목 코드, corp_code 또는 기업명으로 corp_code를 찾습니다."""
+        row = self.find(query, listed_only, fuzzy)
+        return None if row is None else self._corp_code_at(row).decode("ascii")
+
+    def find(self, query: str, listed_only: bool = True, fuzzy: bool = True) -> int | None:
+        """query에 해당하는 행 번호를 반환합니다. (CorpCodeIndex.find와 같은 순서)"""
+        if not query:
+            return None
+        code = normalize_code(query)
+        row = self._find_stock(code)
+        if row is not None:
+            return row
+        row = self._find_corp(code)
+        if row is not None:
+            return row
+
+        key = normalize_name(query).encode("utf-8")
+        if not key:
+            return None
+        row = self._find_name(key, listed_only, prefix=False)
+        if row is not None:
+            return row
+        row = self._find_name(key, listed_only, prefix=True)
+        if row is not None or not fuzzy:
+            return row
+
+        return pick_fuzzy(query, self.search(query, limit=5, listed_only=listed_only), self.record)
+
+    def _eligible(self, row: int, listed_only: bool) -> bool:
+        return not listed_only or bool(self._stock_code_at(row))
+
+    def _find_name(self, key: bytes, listed_only: bool, prefix: bool) -> int | None:
+        """정확히 같은 이름(상장 기업 우선) 또는 key로 시작하는 가장 짧은 이름을 찾습니다."""
+        position = self._lower_bound(self._name_count, lambda p: self._name_entry(p)[0], key)
+        best = None
+        while position < self._name_count:
+            name, row = self._name_entry(position)
+            if not (name.startswith(key) if prefix else name == key):
+                break
+            if self._eligible(row, listed_only):
+                if not prefix:
+                    if self._stock_code_at(row):
+                        return row
+                    best = best or (name, row)
+                elif best is None or len(name) < len(best[0]):
+                    best = (name, row)
+            position += 1
+        return None if best is None else best[1]
+
+    def prepare_fuzzy(self):
+        """유사 기업명 검색용 역색인을 생성합니다. (프로세스 메모리 사용)"""
+        if self._trigrams is None:
+            names = (self._name_entry(p)[0].decode("utf-8") for p in range(self._name_count))
+            self._trigrams = TrigramIndex(names)
+
+    def search(self, query: str, limit: int = 10, listed_only: bool = True, threshold: float = 0.3) -> list[tuple[int, float]]:
+        """3-gram 유사도(Jaccard)로 기업명을 검색하여 (행 번호, 점수) 목록을 반환합니다."""
+        self.prepare_fuzzy()
+        best: dict[int, float] = {}
+        for position, score in self._trigrams.match(normalize_name(query), threshold):
+            row = self._name_entry(position)[1]
+            if self._eligible(row, listed_only) and score > best.get(row, 0.0):
+                best[row] = score
+        return sorted(best.items(), key=lambda item: -item[1])[:limit]
+
+    def stats(self) -> dict:
+        return {
+            "filename": self.filename,
+            "records": self._count,
+            "listed": self._stock_count,
+            "bytes": self._mm.size(),
+            "created_at": self.created_at,
+        }
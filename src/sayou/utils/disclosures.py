@@ -0,0 +1,266 @@
+import asyncio
+import logging
+
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator, Callable
+
+from .ratelimit import KST, DartApiError
+
+logger = logging.getLogger(__name__)
+
+# DART 공시검색의 페이지당 최대 건수
+MAX_PAGE_COUNT = 100
+# 기업코드 없이 검색하면 조회 기간이 3개월로 제한됩니다.
+MARKET_WINDOW_DAYS = 90
+# 현재 페이지에서 남은 건수가 페이지 크기의 이 비율 이하가 되면 다음 페이지를 미리 요청합니다.
+_PREFETCH_RATIO = 0.1
+
+# 법인구분 (corp_cls)
+MARKETS = {"Y": "유가증권", "K": "코스닥", "N": "코넥스", "E": "기타"}
+# 공시유형 (pblntf_ty)
+KINDS = {
+    "A": "정기공시",
+    "B": "주요사항보고",
+    "C": "발행공시",
+    "D": "지분공시",
+    "E": "기타공시",
+    "F": "외부감사관련",
+    "G": "펀드공시",
+    "H": "자산유동화",
+    "I": "거래소공시",
+    "J": "공정위공시",
+}
+
+
+@dataclass(slots=True, frozen=True)
+class Disclosure:
+    """공시검색 결과 한 건"""
+
+    rcept_no: str
+    rcept_dt: str
+    corp_code: str
+    corp_name: str
+    corp_cls: str
+    stock_code: str
+    report_nm: str
+    flr_nm: str
+    rm: str
+
+    @classmethod
+    def from_raw(cls, raw: dict) -> "Disclosure":
+        return cls(
+            rcept_no=raw.get("rcept_no", ""),
+            rcept_dt=raw.get("rcept_dt", ""),
+            corp_code=raw.get("corp_code", ""),
+            corp_name=raw.get("corp_name", ""),
+            corp_cls=raw.get("corp_cls", ""),
+            stock_code=(raw.get("stock_code") or "").strip(),
+            # 정정공시 등은 보고서명에 공백이 여러 개 들어 있습니다.
+            report_nm=" ".join((raw.get("report_nm") or "").split()),
+            flr_nm=raw.get("flr_nm", ""),
+            rm=raw.get("rm", ""),
+        )
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def _date(value: str | date | None, default: date) -> date:
+    if value is None or value == "":
+        return default
+    if isinstance(value, date):
+        return value
+    digits = "".join(ch for ch in str(value) if ch.isdigit())
+    try:
+        return datetime.strptime(digits, "%Y%m%d").date()
+    except ValueError:
+        raise ValueError(f"잘못된 날짜입니다: {value} (YYYY-MM-DD 또는 YYYYMMDD)") from None
+
+
+def encode_cursor(start: date, end: date, page: int) -> str:
+    """이어서 조회할 위치 (조회 시작일, 구간 종료일, 페이지)를 문자열로 만듭니다."""
+    return f"{start:%Y%m%d}-{end:%Y%m%d}-{page}"
+
+
+def decode_cursor(cursor: str) -> tuple[date, date, int]:
+    try:
+        start, end, page = cursor.split("-")
+        return datetime.strptime(start, "%Y%m%d").date(), datetime.strptime(end, "%Y%m%d").date(), max(1, int(page))
+    except ValueError:
+        raise ValueError(f"잘못된 cursor입니다: {cursor}") from None
+
+
+def date_windows(start: date, end: date, days: int) -> list[tuple[date, date]]:
+    """[start, end] 기간을 최근 구간부터 days일 이하의 구간으로 나눕니다."""
+    windows = []
+    while end >= start:
+        window_start = max(start, end - timedelta(days=days - 1))
+        windows.append((window_start, end))
+        end = window_start - timedelta(days=1)
+    return windows
+
+
+class DisclosureStream:
+    """DART 공시검색(list.json) 결과를 페이지를 넘기며 한 건씩 반환합니다.
+
+    - 현재 페이지를 거의 다 읽으면 다음 페이지를 미리 요청합니다. (prefetch)
+      도중에 멈추는 경우가 많은 백그라운드 확인 작업은 prefetch=False로 사용합니다.
+    - 반복을 멈추면(limit, break, 취소) 미리 요청한 페이지를 취소하고 더 요청하지 않습니다.
+    - 기업코드 없이 긴 기간을 검색하면 DART 제한(3개월)에 맞춰 최근 구간부터 나누어 조회합니다.
+    - 결과는 최신 공시부터 반환합니다.
+    - max_pages개의 페이지를 요청하면 페이지 경계에서 멈추고, 이어서 조회할 위치를 cursor에 남깁니다.
+      같은 조건에 cursor를 주면 그 위치부터 조회합니다.
+    """
+
+    def __init__(
+        self,
+        client,
+        corp_code: str | None = None,
+        start: str | date | None = None,
+        end: str | date | None = None,
+        market: str | None = None,
+        kind: str | None = None,
+        final_only: bool = False,
+        page_count: int = MAX_PAGE_COUNT,
+        prefetch: bool = True,
+        max_pages: int | None = None,
+        cursor: str | None = None,
+    ):
+        if market is not None and market not in MARKETS:
+            raise ValueError(f"지원하지 않는 법인구분입니다: {market} ({', '.join(MARKETS)})")
+        if kind is not None and kind not in KINDS:
+            raise ValueError(f"지원하지 않는 공시유형입니다: {kind} ({', '.join(KINDS)})")
+
+        self.client = client
+        self.corp_code = corp_code
+        self.first_page = 1
+        if cursor:
+            self.start, self.end, self.first_page = decode_cursor(cursor)
+        else:
+            self.end = _date(end, datetime.now(KST).date())
+            # 기업코드가 있으면 1년, 없으면 최근 1주일을 기본 기간으로 사용합니다.
+            self.start = _date(start, self.end - timedelta(days=365 if corp_code else 6))
+        if self.start > self.end:
+            raise ValueError(f"시작일이 종료일보다 늦습니다: {self.start} > {self.end}")
+        self.market = market
+        self.kind = kind
+        self.final_only = final_only
+        self.page_count = max(1, min(int(page_count), MAX_PAGE_COUNT))
+        self.prefetch = prefetch
+        self.max_pages = max_pages
+
+        self.pages = 0
+        self.total_count: int | None = None
+        # max_pages에 도달하여 멈춘 경우 이어서 조회할 위치
+        self.cursor: str | None = None
+        self._requested = 0
+
+    def _params(self, start: date, end: date, page: int) -> dict:
+        params = {
+            "bgn_de": start.strftime("%Y%m%d"),
+            "end_de": end.strftime("%Y%m%d"),
+            "sort": "date",
+            "sort_mth": "desc",
+            "page_no": page,
+            "page_count": self.page_count,
+        }
+        if self.corp_code:
+            params["corp_code"] = self.corp_code
+        if self.market:
+            params["corp_cls"] = self.market
+        if self.kind:
+            params["pblntf_ty"] = self.kind
+        if self.final_only:
+            params["last_reprt_at"] = "Y"
+        return params
+
+    def _has_budget(self) -> bool:
+        return self.max_pages is None or self._requested < self.max_pages
+
+    async def _page(self, start: date, end: date, page: int) -> dict:
+        from sayou.stock.opendart.models import DisclosureStatus
+
+        self._requested += 1
+        data = await self.client.get_json(DisclosureStatus.DISCLOSURE_SEARCH.url, self._params(start, end, page))
+        status = data.get("status")
+        self.pages += 1
+        if status == "013":
+            return {"list": [], "total_page": 0, "total_count": 0}
+        if status != "000":
+            raise DartApiError(f"공시검색 실패 ({status}): {data.get('message')}", status)
+        return data
+
+    async def _iter_window(self, start: date, end: date, page: int = 1) -> AsyncIterator[Disclosure]:
+        pending: asyncio.Task | None = None
+        try:
+            if not self._has_budget():
+                self.cursor = encode_cursor(self.start, end, page)
+                return
+            data = await self._page(start, end, page)
+            total_page = int(data.get("total_page") or 0)
+            self.total_count = (self.total_count or 0) + int(data.get("total_count") or 0)
+            ahead = max(1, int(self.page_count * _PREFETCH_RATIO))
+            while True:
+                items = data.get("list", [])
+                for index, raw in enumerate(items):
+                    if (
+                        self.prefetch and pending is None and page < total_page
+                        and len(items) - index <= ahead and self._has_budget()
+                    ):
+                        pending = asyncio.ensure_future(self._page(start, end, page + 1))
+                    yield Disclosure.from_raw(raw)
+                if page >= total_page:
+                    return
+                page += 1
+                if pending is None:
+                    if not self._has_budget():
+                        self.cursor = encode_cursor(self.start, end, page)
+                        return
+                    data = await self._page(start, end, page)
+                else:
+                    data, pending = await pending, None
+        finally:
+            if pending is not None:
+                pending.cancel()
+                # 이미 실패한 요청의 예외는 여기서 확인하여 경고로 남지 않게 합니다.
+                pending.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+    async def __aiter__(self) -> AsyncIterator[Disclosure]:
+        windows = (
+            [(self.start, self.end)] if self.corp_code
+            else date_windows(self.start, self.end, MARKET_WINDOW_DAYS)
+        )
+        page = self.first_page
+        for start, end in windows:
+            window = self._iter_window(start, end, page)
+            try:
+                async for disclosure in window:
+                    yield disclosure
+            finally:
+                await window.aclose()
+            if self.cursor is not None:
+                return
+            page = 1
+
+
+async def search_disclosures(
+    stream: DisclosureStream,
+    limit: int | None = None,
+    match: Callable[[Disclosure], bool] | None = None,
+) -> list[Disclosure]:
+    """조건에 맞는 공시를 limit건까지 모읍니다. limit에 도달하면 남은 페이지를 요청하지 않습니다."""
+    results: list[Disclosure] = []
+    if limit is not None and limit <= 0:
+        return results
+    items = stream.__aiter__()
+    try:
+        async for disclosure in items:
+            if match is not None and not match(disclosure):
+                continue
+            results.append(disclosure)
+            if limit is not None and len(results) >= limit:
+                break
+    finally:
+        await items.aclose()
+    return results
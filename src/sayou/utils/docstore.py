@@ -0,0 +1,300 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import zlib
+
+from typing import Awaitable, Callable
+
+from .singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# 이미 압축된 형식(ZIP, PDF)은 다시 압축하지 않습니다.
+_COMPRESSED_MAGIC = (b"PK\x03\x04", b"%PDF")
+_NAME_PATTERN = re.compile(r"[\w.\-]+(/[\w.\-]+)*")
+
+
+class DocumentStore:
+    """공시 원본(HTML, ZIP, PDF)의 내용 주소 저장소
+
+    공시는 접수번호(rcept_no)로 제출된 뒤 바뀌지 않으므로 한 번 받은 파일은 다시 내려받지 않습니다.
+
+    - 객체: 원본 내용의 sha256으로 저장하여 같은 내용은 한 번만 저장합니다. (zlib 압축)
+    - 참조: (rcept_no, 이름) → {sha256, size, encoding, content_type}
+    - 로컬 디스크(크기 제한 LRU)와 GCS에 함께 저장하며, 로컬에 없으면 GCS에서 읽어 로컬에 적재합니다.
+      GCS 객체는 없을 때만 쓰므로(generation 0 조건) 여러 인스턴스가 같은 객체를 중복 저장하지 않습니다.
+    - 읽을 때 sha256과 크기를 확인하고, 손상된 객체는 버리고 다시 가져옵니다.
+    """
+
+    def __init__(
+        self,
+        root: str | None = None,
+        max_bytes: int | None = None,
+        bucket_name: str | None = None,
+        prefix: str | None = None,
+        use_gcs: bool | None = None,
+        executor=None,
+    ):
+        self.root = root or os.getenv("OPENDART_DOCSTORE_DIR", "docstore")
+        self.max_bytes = max_bytes or int(float(os.getenv("OPENDART_DOCSTORE_MAX_MB", "1024")) * 1024 * 1024)
+        self.bucket_name = bucket_name or os.getenv("OPENDART_CACHE_BUCKET", "sayouzone-ai-stocks")
+        self.prefix = (prefix or os.getenv("OPENDART_DOCSTORE_PREFIX", "OpenDart/docstore")).strip("/")
+        self.use_gcs = use_gcs if use_gcs is not None else os.getenv("OPENDART_CACHE_GCS", "1") != "0"
+        self.executor = executor
+
+        self._gcs = None
+        self._gcs_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+        # 로컬 객체 전체 크기 (처음 저장할 때 디렉터리를 훑어 계산)
+        self._local_bytes: int | None = None
+
+        self._local_hits = 0
+        self._remote_hits = 0
+        self._misses = 0
+        self._stored = 0
+        self._deduplicated = 0
+        self._evicted = 0
+        self._corrupt = 0
+        self._remote_failures = 0
+
+    @property
+    def gcs(self):
+        """GCSManager는 처음 사용할 때 생성합니다."""
+        if self._gcs is None:
+            with self._gcs_lock:
+                if self._gcs is None:
+                    from .gcpmanager import GCSManager
+                    self._gcs = GCSManager(bucket_name=self.bucket_name)
+        return self._gcs
+
+    @staticmethod
+    def _check_name(rcept_no: str, name: str):
+        if not rcept_no.isdigit() or not _NAME_PATTERN.fullmatch(name) or ".." in name:
+            raise ValueError(f"잘못된 문서 이름입니다: {rcept_no}/{name}")
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], digest)
+
+    def _ref_path(self, rcept_no: str, name: str) -> str:
+        return os.path.join(self.root, "refs", rcept_no, f"{name}.json")
+
+    def _object_blob(self, digest: str) -> str:
+        return f"{self.prefix}/objects/{digest[:2]}/{digest}"
+
+    def _ref_blob(self, rcept_no: str, name: str) -> str:
+        return f"{self.prefix}/refs/{rcept_no}/{name}.json"
+
+    @staticmethod
+    def _write_atomic(path: str, payload: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as file:
+            file.write(payload)
+        os.replace(tmp, path)
+
+    def _decode(self, ref: dict, blob: bytes) -> bytes | None:
+        """저장된 객체를 풀고 무결성을 확인합니다. 손상되었으면 None."""
+        try:
+            data = zlib.decompress(blob) if ref.get("encoding") == "zlib" else blob
+        except zlib.error:
+            data = None
+        if data is None or len(data) != ref["size"] or hashlib.sha256(data).hexdigest() != ref["sha256"]:
+            self._corrupt += 1
+            logger.warning(f"문서 객체가 손상되었습니다: {ref['sha256']}")
+            return None
+        return data
+
+    def _read_local(self, rcept_no: str, name: str) -> tuple[dict | None, bytes | None]:
+        try:
+            with open(self._ref_path(rcept_no, name), "rb") as file:
+                ref = json.loads(file.read())
+        except (OSError, ValueError):
+            return None, None
+        path = self._object_path(ref["sha256"])
+        try:
+            with open(path, "rb") as file:
+                blob = file.read()
+        except OSError:
+            return ref, None
+        data = self._decode(ref, blob)
+        if data is None:
+            self._remove_local(path)
+            return ref, None
+        # 최근 사용 시각을 갱신합니다. (LRU 정리 기준)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return ref, data
+
+    def _read_remote(self, rcept_no: str, name: str, ref: dict | None) -> tuple[dict | None, bytes | None]:
+        if ref is None:
+            content = self.gcs.read_bytes(self._ref_blob(rcept_no, name))
+            if content is None:
+                return None, None
+            try:
+                ref = json.loads(content)
+            except ValueError:
+                return None, None
+        blob = self.gcs.read_bytes(self._object_blob(ref["sha256"]))
+        if blob is None:
+            return ref, None
+        data = self._decode(ref, blob)
+        if data is not None:
+            self._store_local(rcept_no, name, ref, blob)
+        return ref, data
+
+    def get(self, rcept_no: str, name: str) -> bytes | None:
+        """저장된 문서를 반환합니다. 없으면 None. (블로킹 호출)"""
+        self._check_name(rcept_no, name)
+        ref, data = self._read_local(rcept_no, name)
+        if data is not None:
+            self._local_hits += 1
+            return data
+        if self.use_gcs:
+            ref, data = self._read_remote(rcept_no, name, ref)
+            if data is not None:
+                self._remote_hits += 1
+                return data
+        self._misses += 1
+        return None
+
+    def put(self, rcept_no: str, name: str, data: bytes, content_type: str | None = None) -> dict:
+        """문서를 로컬과 GCS에 저장하고 참조를 반환합니다. (블로킹 호출)"""
+        ref, blob = self.put_local(rcept_no, name, data, content_type)
+        self.put_remote(rcept_no, name, ref, blob)
+        return ref
+
+    def put_local(self, rcept_no: str, name: str, data: bytes, content_type: str | None = None) -> tuple[dict, bytes]:
+        """문서를 로컬에 저장하고 (참조, 저장된 객체)를 반환합니다. (블로킹 호출)"""
+        self._check_name(rcept_no, name)
+        digest = hashlib.sha256(data).hexdigest()
+        compress = not data.startswith(_COMPRESSED_MAGIC)
+        blob = zlib.compress(data, 6) if compress else data
+        ref = {
+            "sha256": digest,
+            "size": len(data),
+            "encoding": "zlib" if compress else "identity",
+            "content_type": content_type,
+            "stored_at": time.time(),
+        }
+        self._store_local(rcept_no, name, ref, blob)
+        self._stored += 1
+        return ref, blob
+
+    def put_remote(self, rcept_no: str, name: str, ref: dict, blob: bytes) -> bool:
+        """객체와 참조를 GCS에 저장합니다. 이미 있으면 쓰지 않습니다. (블로킹 호출)
+
+        참조는 객체가 GCS에 있는 것을 확인한 뒤에만 씁니다. 객체 업로드가 실패했는데 참조를 쓰면
+        다른 인스턴스가 그 참조로 없는 객체를 읽게 됩니다. 저장했거나 이미 있으면 True.
+        """
+        if not self.use_gcs:
+            return False
+        object_blob = self._object_blob(ref["sha256"])
+        if not self.gcs.upload_if_generation(blob, object_blob, 0, content_type="application/octet-stream"):
+            # 이미 있어서(generation 조건) 쓰지 않은 경우와 업로드 실패를 구분합니다.
+            if not self.gcs.exists(object_blob):
+                self._remote_failures += 1
+                logger.warning(f"문서 객체를 GCS에 저장하지 못해 참조를 쓰지 않습니다 ({rcept_no}/{name})")
+                return False
+            self._deduplicated += 1
+        self.gcs.upload_if_generation(json.dumps(ref), self._ref_blob(rcept_no, name), 0)
+        return True
+
+    def _store_local(self, rcept_no: str, name: str, ref: dict, blob: bytes):
+        path = self._object_path(ref["sha256"])
+        try:
+            if os.path.exists(path):
+                self._deduplicated += 1
+            else:
+                self._write_atomic(path, blob)
+                self._add_local_bytes(len(blob))
+            self._write_atomic(self._ref_path(rcept_no, name), json.dumps(ref).encode("utf-8"))
+        except OSError as e:
+            logger.warning(f"문서를 로컬에 저장하지 못했습니다 ({rcept_no}/{name}): {e}")
+
+    def _remove_local(self, path: str):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        self._add_local_bytes(-size)
+
+    def _scan_objects(self) -> list[tuple[float, int, str]]:
+        entries = []
+        for directory, _, files in os.walk(os.path.join(self.root, "objects")):
+            for filename in files:
+                path = os.path.join(directory, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _add_local_bytes(self, delta: int):
+        with self._lock:
+            if self._local_bytes is None:
+                self._local_bytes = sum(size for _, size, _ in self._scan_objects())
+            else:
+                self._local_bytes += delta
+            if self._local_bytes <= self.max_bytes:
+                return
+            # 가장 오래 사용하지 않은 객체부터 제한의 90%까지 지웁니다. (참조는 GCS에서 다시 읽을 수 있도록 유지)
+            target = int(self.max_bytes * 0.9)
+            for _, size, path in sorted(self._scan_objects()):
+                if self._local_bytes <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                self._local_bytes -= size
+                self._evicted += 1
+
+    async def read_through(
+        self,
+        rcept_no: str,
+        name: str,
+        fetch: Callable[[], Awaitable[bytes | None]],
+        content_type: str | None = None,
+    ) -> bytes | None:
+        """저장소에 있으면 반환하고, 없으면 fetch()로 가져와 저장합니다.
+
+        같은 문서를 동시에 요청하면 한 번만 가져옵니다. fetch()가 None을 반환하면 저장하지 않습니다.
+        """
+        data = await self.executor.run(self.get, rcept_no, name)
+        if data is not None:
+            return data
+
+        async def load():
+            data = await fetch()
+            if data is not None:
+                # 로컬 저장은 기다리고(다음 요청이 바로 읽도록) GCS 업로드는 백그라운드에서 실행합니다.
+                ref, blob = await self.executor.run(self.put_local, rcept_no, name, data, content_type)
+                self.executor.submit(self.put_remote, rcept_no, name, ref, blob)
+            return data
+
+        return await self._flights.do((rcept_no, name), load)
+
+    def stats(self) -> dict:
+        lookups = self._local_hits + self._remote_hits + self._misses
+        return {
+            "local_bytes": self._local_bytes,
+            "max_bytes": self.max_bytes,
+            "local_hits": self._local_hits,
+            "remote_hits": self._remote_hits,
+            "misses": self._misses,
+            "hit_ratio": round((self._local_hits + self._remote_hits) / lookups, 4) if lookups else 0.0,
+            "stored": self._stored,
+            "deduplicated": self._deduplicated,
+            "evicted": self._evicted,
+            "corrupt": self._corrupt,
+            "remote_failures": self._remote_failures,
+        }
@@ -0,0 +1,114 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import os
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_limits(value: str | None) -> dict[str, int]:
+    """"tool=4,tool2=8" 형식의 환경 변수를 파싱합니다."""
+    limits: dict[str, int] = {}
+    if not value:
+        return limits
+    for item in value.split(","):
+        name, _, limit = item.partition("=")
+        name = name.strip()
+        if not name or not limit.strip():
+            continue
+        try:
+            limits[name] = max(1, int(limit))
+        except ValueError:
+            logger.warning(f"잘못된 동시성 제한 설정을 무시합니다: '{item}'")
+    return limits
+
+
+class CrawlerExecutor:
+    """동기식 OpenDartCrawler 호출을 이벤트 루프 밖에서 실행하는 작업자 풀.
+
+    - 전체 동시 실행 수는 스레드 풀 크기(max_workers)로 제한됩니다.
+    - 도구별 동시 호출 수는 limit(tool) 컨텍스트로 제한됩니다.
+    - 호출한 태스크가 취소되면(MCP 클라이언트 연결 종료 등) 아직 시작되지 않은
+      작업은 풀에서 제거되고, 대기 중인 슬롯은 즉시 반환됩니다.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        default_limit: int | None = None,
+        tool_limits: dict[str, int] | None = None,
+    ):
+        self.max_workers = max_workers or int(os.getenv("OPENDART_MAX_WORKERS", 16))
+        self.default_limit = default_limit or int(os.getenv("OPENDART_TOOL_CONCURRENCY", 8))
+        self.tool_limits = tool_limits if tool_limits is not None else _parse_limits(os.getenv("OPENDART_TOOL_LIMITS"))
+
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="opendart")
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._active: dict[str, int] = {}
+        self._cancelled = 0
+        self._failed = 0
+
+    def _semaphore(self, tool: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(tool)
+        if semaphore is None:
+            limit = self.tool_limits.get(tool, self.default_limit)
+            semaphore = self._semaphores[tool] = asyncio.Semaphore(limit)
+        return semaphore
+
+    @asynccontextmanager
+    async def limit(self, tool: str):
+        """도구별 동시 실행 수를 제한합니다."""
+        async with self._semaphore(tool):
+            self._active[tool] = self._active.get(tool, 0) + 1
+            try:
+                yield
+            finally:
+                self._active[tool] -= 1
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """func를 작업자 스레드에서 실행하고 결과를 기다립니다.
+
+        호출 태스크의 contextvars는 작업자 스레드로 전달됩니다.
+        """
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, func, *args, **kwargs)
+        try:
+            return await loop.run_in_executor(self._pool, call)
+        except asyncio.CancelledError:
+            self._cancelled += 1
+            logger.info(f"작업이 취소되었습니다: {getattr(func, '__name__', func)}")
+            raise
+
+    def submit(self, func: Callable[..., Any], *args, **kwargs) -> Future:
+        """결과를 기다리지 않는 백그라운드 작업을 제출합니다. 실패하면 예외를 로그로 남깁니다."""
+        context = contextvars.copy_context()
+        future = self._pool.submit(context.run, func, *args, **kwargs)
+        future.add_done_callback(functools.partial(self._log_failure, getattr(func, "__qualname__", func)))
+        return future
+
+    def _log_failure(self, name: str, future: Future):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            self._failed += 1
+            logger.error(f"백그라운드 작업 실패 ({name}): {error!r}", exc_info=error)
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "default_limit": self.default_limit,
+            "tool_limits": dict(self.tool_limits),
+            "active": dict(self._active),
+            "cancelled": self._cancelled,
+            "failed": self._failed,
+        }
+
+    def shutdown(self, wait: bool = False):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
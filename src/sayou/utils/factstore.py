@@ -0,0 +1,173 @@
+import logging
+import os
+import re
+import threading
+
+from .columnar import frame_records
+from .xbrl import FactTable
+
+logger = logging.getLogger(__name__)
+
+# 같은 팩트를 나타내는 열 (공시마다 문맥 ID가 다르므로 기간과 차원으로 비교)
+FACT_KEY = ("corp_code", "period_start", "period_end", "dimensions", "concept", "unit")
+
+_CORP_CODE_PATTERN = re.compile(r"\d{8}")
+
+
+def _schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ("corp_code", pa.string()),
+        ("rcept_no", pa.string()),
+        ("year", pa.int16()),
+        ("quarter", pa.int8()),
+        ("concept", pa.string()),
+        ("label", pa.string()),
+        ("context", pa.string()),
+        ("period_start", pa.string()),
+        ("period_end", pa.string()),
+        ("instant", pa.bool_()),
+        ("dimensions", pa.string()),
+        ("unit", pa.string()),
+        ("decimals", pa.string()),
+        ("value", pa.string()),
+        ("amount", pa.float64()),
+    ])
+
+
+class FactStore:
+    """XBRL 팩트 인덱스 (기업별 Parquet 파일)
+
+    재무제표 원본파일(XBRL)에서 파싱한 팩트를 공시(rcept_no)마다 하나의 Parquet 파일로 저장합니다.
+
+    - 경로: <root>/<corp_code>/<rcept_no>.parquet (사전 인코딩 + zstd 압축)
+    - 조회: 기업의 파일들을 개념(concept) 또는 레이블 조건으로 읽고, 같은 팩트
+      (corp_code, 기간, 차원, concept, unit)가 여러 공시에 있으면 최근 공시의 값을 사용합니다.
+      (사업보고서의 전기 비교 값보다 해당 연도 보고서의 값, 정정공시는 원공시보다 우선)
+    - 원본 ZIP은 DocumentStore에 남아 있으므로 로컬 파일이 없어져도 DART 호출 없이 다시 만들 수 있습니다.
+    """
+
+    def __init__(self, root: str | None = None):
+        self.root = root or os.getenv("OPENDART_FACTSTORE_DIR", "factstore")
+        self._lock = threading.Lock()
+        # 기업별 저장된 접수번호 (처음 조회할 때 디렉터리를 읽음)
+        self._filings: dict[str, set[str]] = {}
+        self._ingested = 0
+        self._facts = 0
+        self._queries = 0
+
+    def _directory(self, corp_code: str) -> str:
+        if not _CORP_CODE_PATTERN.fullmatch(corp_code):
+            raise ValueError(f"잘못된 기업코드입니다: {corp_code}")
+        return os.path.join(self.root, corp_code)
+
+    def filings(self, corp_code: str) -> set[str]:
+        """저장된 공시의 접수번호 목록을 반환합니다."""
+        with self._lock:
+            filings = self._filings.get(corp_code)
+            if filings is None:
+                directory = self._directory(corp_code)
+                try:
+                    names = os.listdir(directory)
+                except OSError:
+                    names = []
+                filings = self._filings[corp_code] = {
+                    name[:-len(".parquet")] for name in names if name.endswith(".parquet")
+                }
+            return set(filings)
+
+    def has(self, corp_code: str, rcept_no: str) -> bool:
+        return rcept_no in self.filings(corp_code)
+
+    def put(self, corp_code: str, rcept_no: str, year: int, quarter: int, table: FactTable) -> int:
+        """공시의 팩트 표를 저장하고 팩트 수를 반환합니다. (블로킹 호출)"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not rcept_no.isdigit():
+            raise ValueError(f"잘못된 접수번호입니다: {rcept_no}")
+        directory = self._directory(corp_code)
+        count = len(table)
+        columns = {
+            "corp_code": [corp_code] * count,
+            "rcept_no": [rcept_no] * count,
+            "year": [int(year)] * count,
+            "quarter": [int(quarter)] * count,
+            **table.columns,
+        }
+        arrow_table = pa.Table.from_pydict(columns, schema=_schema())
+
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{rcept_no}.parquet")
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        pq.write_table(arrow_table, tmp, compression="zstd", use_dictionary=True)
+        os.replace(tmp, path)
+
+        self.filings(corp_code)
+        with self._lock:
+            self._filings[corp_code].add(rcept_no)
+            self._ingested += 1
+            self._facts += count
+        logger.info(f"XBRL 팩트 저장: {corp_code}/{rcept_no} ({count}건)")
+        return count
+
+    def query(
+        self,
+        corp_code: str,
+        concepts: list[str],
+        start_year: int | None = None,
+        end_year: int | None = None,
+        dimensions: bool = False,
+    ) -> list[dict]:
+        """개념 ID(예: ifrs-full_Revenue) 또는 레이블(예: 매출액)로 팩트를 조회합니다. (블로킹 호출)
+
+        Args:
+            start_year, end_year: 팩트 기간 종료일의 연도 범위
+            dimensions: False이면 차원(부문, 자본 구성요소 등)이 없는 전체 값만 반환합니다.
+
+        Returns:
+            [{"concept", "label", "period_start", "period_end", "dimensions", "unit", "value", "amount", "rcept_no", ...}]
+            개념, 차원, 기간 종료일 순으로 정렬합니다.
+        """
+        import pandas as pd
+        import pyarrow.dataset as ds
+
+        self._queries += 1
+        filings = sorted(self.filings(corp_code))
+        if not filings or not concepts:
+            return []
+
+        directory = self._directory(corp_code)
+        paths = [os.path.join(directory, f"{rcept_no}.parquet") for rcept_no in filings]
+        dataset = ds.dataset(paths, schema=_schema(), format="parquet")
+        names = [str(concept).strip() for concept in concepts]
+        condition = ds.field("concept").isin(names) | ds.field("label").isin(names)
+        if not dimensions:
+            condition &= ds.field("dimensions") == ""
+        table = dataset.to_table(filter=condition)
+        if table.num_rows == 0:
+            return []
+
+        frame = table.to_pandas()
+        year = pd.to_numeric(frame["period_end"].str.slice(0, 4), errors="coerce")
+        in_range = year.between(start_year or 0, end_year or 9999)
+        frame = frame[in_range]
+
+        # 최근 공시(접수번호가 큰 공시)의 값을 사용합니다.
+        frame = (
+            frame.sort_values("rcept_no")
+            .drop_duplicates(list(FACT_KEY), keep="last")
+            .sort_values(["concept", "dimensions", "period_end", "period_start"], na_position="first")
+        )
+        frame = frame.drop(columns=["corp_code", "context"])
+        return frame_records(frame)
+
+    def stats(self) -> dict:
+        return {
+            "corps": len(self._filings),
+            "filings": sum(len(filings) for filings in self._filings.values()),
+            "ingested": self._ingested,
+            "facts": self._facts,
+            "queries": self._queries,
+        }
@@ -0,0 +1,217 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from datetime import date, datetime, timedelta, timezone
+
+logger = logging.getLogger(__name__)
+
+FILED = "filed"
+NOT_FILED = "not_filed"
+
+# 공시 일정은 한국 시간 기준입니다.
+KST = timezone(timedelta(hours=9))
+
+# 분기별 정기보고서 제출 기한 (1분기·반기·3분기: 45일, 사업보고서: 90일)
+_DEADLINES = {
+    1: (0, 5, 15),
+    2: (0, 8, 14),
+    3: (0, 11, 14),
+    4: (1, 3, 31),
+}
+
+
+def period_end(year: int, quarter: int) -> date:
+    """보고 기간의 마지막 날을 반환합니다."""
+    month = quarter * 3
+    return (date(year, 12, 31) if month == 12
+            else date(year, month + 1, 1) - timedelta(days=1))
+
+
+def filing_deadline(year: int, quarter: int) -> date:
+    """정기보고서 제출 기한을 반환합니다."""
+    offset, month, day = _DEADLINES[quarter]
+    return date(year + offset, month, day)
+
+
+def negative_ttl(year: int, quarter: int, now: datetime | None = None) -> float:
+    """"미제출" 항목의 유효 시간(초)을 공시 일정에 맞춰 계산합니다.
+
+    - 보고 기간이 끝나지 않았으면 기간 종료일까지 유효합니다.
+    - 제출 기한 전후(기한 7일 전 ~ 기한 14일 후)에는 15분만 유효합니다.
+    - 제출 기간 중 그 외에는 3시간 유효합니다.
+    - 제출 기한이 한참 지났으면(늦은 제출, 상장폐지 등) 7일 유효합니다.
+    """
+    now = now or datetime.now(KST)
+    today = now.date()
+    end = period_end(year, quarter)
+    deadline = filing_deadline(year, quarter)
+
+    if today <= end:
+        expires = datetime.combine(end + timedelta(days=1), datetime.min.time(), tzinfo=KST)
+        return max((expires - now).total_seconds(), 60.0)
+    if deadline - timedelta(days=7) <= today <= deadline + timedelta(days=14):
+        return 15 * 60.0
+    if today < deadline:
+        return 3 * 3600.0
+    return 7 * 86400.0
+
+
+class FilingIndex:
+    """(corp_code, 보고서 유형, 연도, 분기)별 공시 제출 여부 인덱스.
+
+    제출된 항목(접수번호 포함)은 만료되지 않으며, 미제출 항목은
+    negative_ttl()에 따라 만료됩니다. 인덱스는 JSON 파일로 저장됩니다.
+    save()는 도구 호출마다 불리므로 save_interval초에 한 번만 쓰고, 그 사이의 변경은 모아서 씁니다.
+    """
+
+    def __init__(self, filename: str | None = None, save_interval: float = 5.0):
+        self.filename = filename or os.getenv("OPENDART_FILING_INDEX", "filing_index.json")
+        self.save_interval = save_interval
+        self._entries: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        # 파일 쓰기는 한 번에 하나만 실행합니다.
+        self._save_lock = threading.Lock()
+        self._saved_at = 0.0
+        self._timer: threading.Timer | None = None
+        self._saves = 0
+        self._dirty = False
+        self._hits = 0
+        self._misses = 0
+        self.load()
+
+    @staticmethod
+    def _key(corp_code: str, report: str, year: int, quarter: int) -> str:
+        return f"{corp_code}:{report}:{int(year)}Q{int(quarter)}"
+
+    def load(self):
+        if not os.path.exists(self.filename):
+            return
+        try:
+            with open(self.filename, "r", encoding="utf-8") as json_file:
+                self._entries = json.load(json_file)
+            logger.info(f"공시 인덱스 로드: {len(self._entries)}건")
+        except (OSError, ValueError) as e:
+            logger.warning(f"공시 인덱스를 읽지 못했습니다: {e}")
+            self._entries = {}
+
+    @property
+    def dirty(self) -> bool:
+        """저장하지 않은 변경이 있으면 True"""
+        return self._dirty
+
+    def save(self, force: bool = False):
+        """변경된 내용이 있으면 파일에 원자적으로 저장합니다. (블로킹 호출)
+
+        마지막 저장 후 save_interval초가 지나지 않았으면 남은 시간 뒤에 한 번 저장하도록 예약합니다.
+        force=True이면 바로 저장합니다.
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            wait = self._saved_at + self.save_interval - time.monotonic()
+            if not force and wait > 0:
+                if self._timer is None:
+                    self._timer = threading.Timer(wait, self._scheduled_save)
+                    self._timer.daemon = True
+                    self._timer.start()
+                return
+
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                entries = dict(self._entries)
+                self._dirty = False
+                self._saved_at = time.monotonic()
+            directory = os.path.dirname(os.path.abspath(self.filename))
+            try:
+                fd, tmp_filename = tempfile.mkstemp(prefix=".filing_index.", suffix=".tmp", dir=directory)
+                try:
+                    with os.fdopen(fd, "w", encoding="utf-8") as json_file:
+                        json.dump(entries, json_file, ensure_ascii=False)
+                    os.replace(tmp_filename, self.filename)
+                except BaseException:
+                    os.unlink(tmp_filename)
+                    raise
+                self._saves += 1
+            except OSError as e:
+                with self._lock:
+                    self._dirty = True
+                logger.warning(f"공시 인덱스를 저장하지 못했습니다: {e}")
+
+    def _scheduled_save(self):
+        with self._lock:
+            self._timer = None
+        self.save(force=True)
+
+    def lookup(self, corp_code: str, report: str, year: int, quarter: int) -> dict | None:
+        """유효한 항목을 반환합니다. 없거나 만료되었으면 None을 반환합니다."""
+        key = self._key(corp_code, report, year, quarter)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at = entry.get("expires_at")
+                if expires_at is not None and expires_at <= time.time():
+                    del self._entries[key]
+                    self._dirty = True
+                    entry = None
+            if entry is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return entry
+
+    def status(self, corp_code: str, report: str, year: int, quarter: int) -> bool | None:
+        """제출되었으면 True, 미제출이면 False, 알 수 없으면 None을 반환합니다."""
+        entry = self.lookup(corp_code, report, year, quarter)
+        if entry is None:
+            return None
+        return entry.get("status") == FILED
+
+    def mark_filed(self, corp_code: str, report: str, year: int, quarter: int, rcept_no: str | None = None):
+        self._set(corp_code, report, year, quarter, {
+            "status": FILED,
+            "rcept_no": rcept_no,
+            "checked_at": time.time(),
+            "expires_at": None,
+        })
+
+    def mark_not_filed(self, corp_code: str, report: str, year: int, quarter: int):
+        now = time.time()
+        self._set(corp_code, report, year, quarter, {
+            "status": NOT_FILED,
+            "rcept_no": None,
+            "checked_at": now,
+            "expires_at": now + negative_ttl(int(year), int(quarter)),
+        })
+
+    def invalidate(self, corp_code: str, report: str, year: int, quarter: int) -> bool:
+        """항목을 지워 다음 조회에서 DART를 다시 확인하게 합니다. 지운 항목이 있으면 True."""
+        with self._lock:
+            found = self._entries.pop(self._key(corp_code, report, year, quarter), None) is not None
+            if found:
+                self._dirty = True
+        return found
+
+    def _set(self, corp_code: str, report: str, year: int, quarter: int, entry: dict):
+        with self._lock:
+            self._entries[self._key(corp_code, report, year, quarter)] = entry
+            self._dirty = True
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = len(self._entries)
+            filed = sum(1 for entry in self._entries.values() if entry.get("status") == FILED)
+            hits, misses = self._hits, self._misses
+        return {
+            "entries": entries,
+            "filed": filed,
+            "not_filed": entries - filed,
+            "saves": self._saves,
+            "hits": hits,
+            "misses": misses,
+        }
@@ -1,6 +1,10 @@
+import importlib.util
 import logging
 import os
-from datetime import datetime
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 import pandas as pd
 import requests
 from google.cloud import storage, bigquery, exceptions, secretmanager
@@ -190,6 +194,79 @@ class GCSManager:
             print(f"파일 읽기 중 심각한 에러 발생: {e}")
             return None
 
+    def read_generation(self, blob_name) -> tuple[str | None, int | None]:
+        """파일 내용과 객체 generation을 반환합니다.
+
+        파일이 없으면 (None, 0), 읽지 못했으면(읽는 사이에 바뀐 경우 포함) (None, None).
+        """
+        if not getattr(self, "_storage_available", False):
+            return None, 0
+        blob = self.storage_client.bucket(self.bucket_name).blob(self._normalize_blob_name(blob_name))
+        try:
+            blob.reload()
+            # generation이 바뀌었으면 download가 실패하므로 읽은 내용과 generation이 일치합니다.
+            content = blob.download_as_text(if_generation_match=blob.generation)
+            return content, blob.generation
+        except exceptions.NotFound:
+            return None, 0
+        except exceptions.PreconditionFailed:
+            return None, None
+        except Exception as e:
+            logging.warning(f"GCS 파일 읽기 실패 ('{blob_name}'): {e}")
+            return None, None
+
+    def read_bytes(self, blob_name) -> bytes | None:
+        """파일 내용을 bytes로 반환합니다. 파일이 없거나 읽지 못했으면 None."""
+        if not getattr(self, "_storage_available", False):
+            return None
+        blob = self.storage_client.bucket(self.bucket_name).blob(self._normalize_blob_name(blob_name))
+        try:
+            return blob.download_as_bytes()
+        except exceptions.NotFound:
+            return None
+        except Exception as e:
+            logging.warning(f"GCS 파일 읽기 실패 ('{blob_name}'): {e}")
+            return None
+
+    def upload_if_generation(self, content: str | bytes, blob_name, generation: int, content_type: str = "application/json") -> bool:
+        """객체 generation이 같을 때만 씁니다. (0이면 객체가 없을 때만) 다른 쓰기와 충돌하거나 실패하면 False."""
+        if not getattr(self, "_storage_available", False):
+            return False
+        blob = self.storage_client.bucket(self.bucket_name).blob(self._normalize_blob_name(blob_name))
+        try:
+            blob.upload_from_string(content, content_type=content_type, if_generation_match=generation)
+            return True
+        except exceptions.PreconditionFailed:
+            return False
+        except Exception as e:
+            logging.warning(f"GCS 파일 쓰기 실패 ('{blob_name}'): {e}")
+            return False
+
+    def exists(self, blob_name) -> bool | None:
+        """파일이 있는지 확인합니다. 확인하지 못했으면 None."""
+        if not getattr(self, "_storage_available", False):
+            return None
+        blob = self.storage_client.bucket(self.bucket_name).blob(self._normalize_blob_name(blob_name))
+        try:
+            return blob.exists()
+        except Exception as e:
+            logging.warning(f"GCS 파일 확인 실패 ('{blob_name}'): {e}")
+            return None
+
+    def delete(self, blob_name) -> bool:
+        """파일을 삭제합니다. 파일이 없거나 삭제하지 못했으면 False."""
+        if not getattr(self, "_storage_available", False):
+            return False
+        blob = self.storage_client.bucket(self.bucket_name).blob(self._normalize_blob_name(blob_name))
+        try:
+            blob.delete()
+            return True
+        except exceptions.NotFound:
+            return False
+        except Exception as e:
+            logging.warning(f"GCS 파일 삭제 실패 ('{blob_name}'): {e}")
+            return False
+
     def ensure_folder(self, folder_name: str) -> bool:
         if not folder_name:
             return True
@@ -217,12 +294,23 @@ class GCSManager:
             print(f"폴더 생성 중 에러 발생: {e}")
             return False
 
+def _has_bqstorage() -> bool:
+    """BigQuery Storage Read API 클라이언트(google-cloud-bigquery-storage)가 설치되어 있는지 확인합니다."""
+    return importlib.util.find_spec("google.cloud.bigquery_storage") is not None
+
+
 class BQManager:
     _dataset_checked = False
 
-    def __init__(self, project_id="sayouzone-ai"):
+    def __init__(self, project_id="sayouzone-ai", metadata_ttl: float = 60.0, cache_size: int = 32, storage_read_rows: int = 100_000):
         self.project_id = project_id
         self.dataset_id = "stocks"
+        # query_table: 테이블 메타데이터 유효 시간(초), 결과 캐시 항목 수, Storage Read API를 사용할 최소 행 수
+        self.metadata_ttl = metadata_ttl
+        self.cache_size = cache_size
+        self.storage_read_rows = storage_read_rows
+        self._tables: dict[str, tuple[float, bigquery.Table]] = {}
+        self._results: OrderedDict = OrderedDict()
         try:
             self.bq_client = bigquery.Client(project=project_id)
         except Exception as e:
@@ -254,23 +342,37 @@ class BQManager:
             print(f"Dataset 검사 중 오류 발생: {e}")
             return False
 
-    def query_table(self, table_id: str, start_date: str | None = None, end_date: str | None = None, order_by_date: bool = True) -> pd.DataFrame | None:
+    def query_table(self,
+                    table_id: str,
+                    start_date: str | None = None,
+                    end_date: str | None = None,
+                    order_by_date: bool = True,
+                    columns: list[str] | None = None,
+                    filters: dict | None = None,
+                    use_cache: bool = True,
+                    ) -> pd.DataFrame | None:
         """
         Queries a table with optional date filtering and ordering.
         Returns a DataFrame or None if the table doesn't exist or an error occurs.
+
+        - columns: 조회할 열 (생략하면 전체), filters: {열: 값 또는 값 목록} (예: {"corp_code": "00126380", "year": [2024, 2025]})
+        - 조건은 열 형식에 맞춘 쿼리 매개변수로 보내며 열에 함수를 씌우지 않으므로 파티션·클러스터 열로 걸러집니다.
+          날짜 조건은 시간 파티션 열(없으면 date 열)에 적용합니다.
+        - 결과는 테이블의 마지막 수정 시각과 함께 캐시하므로 테이블이 바뀌지 않았으면 쿼리를 실행하지 않습니다.
+          수정 시각은 테이블 메타데이터에서 읽으며 메타데이터는 metadata_ttl초(기본 60초) 동안 재사용하므로,
+          다른 곳에서 적재한 내용은 최대 metadata_ttl초 늦게 보입니다. (이 객체의 load_dataframe은 바로 반영,
+          BQManager(metadata_ttl=0)이면 매번 확인)
+        - 행이 많으면 BigQuery Storage Read API로 Arrow 형식으로 내려받습니다.
         """
         if not self.bq_client:
             print("BigQuery 클라이언트가 비활성화되어 쿼리를 수행할 수 없습니다.")
             return None
-        if '.' not in table_id:
-            full_table_id = f"{self.project_id}.{self.dataset_id}.{table_id}"
-        else:
-            full_table_id = table_id
+        full_table_id = self._full_table_id(table_id)
 
         print(f"Querying BigQuery table: '{full_table_id}'...")
 
         try:
-            self.bq_client.get_table(full_table_id)
+            table = self._get_table(full_table_id)
         except exceptions.NotFound:
             print(f"Table '{full_table_id}' does not exist. Skipping query.")
             return None
@@ -278,33 +380,96 @@ class BQManager:
             print(f"Error checking table existence: {e}")
             return None
 
-        query = f"SELECT * FROM `{full_table_id}`"
-        
-        where_clauses = []
-        if start_date:
-            where_clauses.append(f"date >= '{start_date}'")
-        if end_date:
-            where_clauses.append(f"date <= '{end_date}'")
-        
-        if where_clauses:
-            query += " WHERE " + " AND ".join(where_clauses)
-            
-        if order_by_date:
-            query += " ORDER BY date DESC"
+        try:
+            query, parameters = self._select_query(table, start_date, end_date, order_by_date, columns, filters)
+        except ValueError as e:
+            print(f"Invalid query: {e}")
+            return None
+
+        # 스트리밍 버퍼가 있는 테이블은 수정 시각이 바뀌지 않고 행이 늘어날 수 있으므로 캐시하지 않습니다.
+        cacheable = use_cache and table.modified is not None and table.streaming_buffer is None
+        cache_key = (full_table_id, table.modified, query, tuple((p.name, repr(p.to_api_repr())) for p in parameters))
+        if cacheable and cache_key in self._results:
+            self._results.move_to_end(cache_key)
+            print("Returning cached query result.")
+            df = self._results[cache_key]
+            return None if df is None else df.copy()
 
         print(f"Executing query: {query}")
 
         try:
-            df = self.bq_client.query(query).to_dataframe()
-            if df.empty:
-                print("Query returned no data.")
-                return None
-            print(f"Successfully queried {len(df)} rows.")
-            return df
+            job_config = bigquery.QueryJobConfig(query_parameters=parameters)
+            rows = self.bq_client.query(query, job_config=job_config).result()
+            use_storage = (rows.total_rows or 0) >= self.storage_read_rows and _has_bqstorage()
+            df = rows.to_dataframe(create_bqstorage_client=use_storage)
         except Exception as e:
             print(f"Error querying BigQuery: {e}")
             return None
-        
+
+        if df.empty:
+            print("Query returned no data.")
+            df = None
+        else:
+            print(f"Successfully queried {len(df)} rows.")
+        if cacheable:
+            self._results[cache_key] = df
+            while len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
+        return None if df is None else df.copy()
+
+    def _get_table(self, full_table_id: str) -> bigquery.Table:
+        """테이블 메타데이터를 metadata_ttl초 동안 재사용합니다."""
+        now = time.monotonic()
+        cached = self._tables.get(full_table_id)
+        if cached is not None and now - cached[0] < self.metadata_ttl:
+            return cached[1]
+        table = self.bq_client.get_table(full_table_id)
+        self._tables[full_table_id] = (now, table)
+        return table
+
+    def _select_query(self, table: bigquery.Table, start_date, end_date, order_by_date: bool, columns: list[str] | None, filters: dict | None):
+        """SELECT 문과 쿼리 매개변수를 만듭니다. 열 이름은 테이블 스키마에 있는 것만 허용합니다."""
+        types = {field.name: field.field_type for field in table.schema}
+        unknown = [name for name in list(columns or []) + list(filters or {}) if name not in types]
+        if unknown:
+            raise ValueError(f"unknown columns {unknown} in '{table.table_id}'")
+
+        full_table_id = f"{table.project}.{table.dataset_id}.{table.table_id}"
+        projection = ", ".join(f"`{name}`" for name in columns) if columns else "*"
+        query = f"SELECT {projection} FROM `{full_table_id}`"
+
+        where_clauses = []
+        parameters = []
+        for index, (name, value) in enumerate((filters or {}).items()):
+            parameter_type = self._parameter_type(types[name])
+            if isinstance(value, (list, tuple, set)):
+                parameters.append(bigquery.ArrayQueryParameter(f"f{index}", parameter_type, list(value)))
+                where_clauses.append(f"`{name}` IN UNNEST(@f{index})")
+            elif value is None:
+                where_clauses.append(f"`{name}` IS NULL")
+            else:
+                parameters.append(bigquery.ScalarQueryParameter(f"f{index}", parameter_type, value))
+                where_clauses.append(f"`{name}` = @f{index}")
+
+        partitioning = table.time_partitioning
+        date_column = partitioning.field if partitioning is not None and partitioning.field else "date"
+        date_type = self._parameter_type(types.get(date_column, "STRING"))
+        for name, operator, value in (("start_date", ">=", start_date), ("end_date", "<=", end_date)):
+            if not value:
+                continue
+            if date_column not in types:
+                raise ValueError(f"'{table.table_id}' has no '{date_column}' column to filter by date")
+            parameters.append(bigquery.ScalarQueryParameter(name, date_type, value))
+            where_clauses.append(f"`{date_column}` {operator} @{name}")
+
+        if where_clauses:
+            query += " WHERE " + " AND ".join(where_clauses)
+
+        if order_by_date and date_column in types:
+            query += f" ORDER BY `{date_column}` DESC"
+
+        return query, parameters
+
     def _full_table_id(self, table_id: str) -> str:
         return table_id if '.' in table_id else f"{self.project_id}.{self.dataset_id}.{table_id}"
     
@@ -331,8 +496,16 @@ class BQManager:
                        df: pd.DataFrame, 
                        table_id: str,
                        if_exists: str = "append",
-                       deduplicate_on: list | None = None
+                       deduplicate_on: list | None = None,
+                       upsert: bool = False,
                        ):
+        """DataFrame을 테이블에 적재합니다.
+
+        deduplicate_on이 있고 테이블이 이미 있으면(if_exists="append") 임시 테이블에 적재한 뒤
+        MERGE로 키가 없는 행만 추가합니다. upsert=True이면 키가 있는 행은 새 값으로 바꿉니다.
+        중복 확인이 BigQuery 안에서 끝나므로 전송량과 메모리는 적재하는 행 수에만 비례합니다.
+        MERGE가 실패하면 적재할 키만 조회하여 로컬에서 걸러냅니다.
+        """
         if not self.bq_client:
             print("BigQuery 클라이언트가 비활성화되어 DataFrame 적재를 수행하지 않습니다.")
             return False
@@ -342,33 +515,26 @@ class BQManager:
         print(f"Loading dataframe into BigQuery table: '{full_table_id}'...")
 
         try:
-            self.bq_client.get_table(full_table_id)
-            table_exists = True
+            table = self.bq_client.get_table(full_table_id)
         except exceptions.NotFound:
-            table_exists = False
+            table = None
 
-        if table_exists and deduplicate_on and if_exists == "append":
+        if table is not None and deduplicate_on and if_exists == "append":
             if df.empty:
                 print("Dataframe is empty. Skipping load.")
                 return True
-            
-            key_cols = ", ".join(deduplicate_on)
-            duplication_query = f"SELECT DISTINCT {key_cols} FROM `{full_table_id}`"
 
-            print("Querying existing data for deduplication...")
             try:
-                query_job = self.bq_client.query(duplication_query)
-                existing_data_keys = {tuple(row.values()) for row in query_job.result()}
-                print(f"Found {len(existing_data_keys)} unique keys in existing data.")
-
-                df_keys = df[deduplicate_on].apply(tuple, axis=1)
-                fresh_data_mask = ~df_keys.isin(existing_data_keys)
-                df_to_load = df[fresh_data_mask]
+                return self._merge_dataframe(df, table, deduplicate_on, upsert)
+            except Exception as e:
+                print(f"Error during MERGE load: {e}. Falling back to client-side deduplication.")
 
+            try:
+                df_to_load = self._drop_existing_keys(df, table, deduplicate_on)
                 if df_to_load.empty:
                     print("No new data to load after deduplication. Skipping load.")
                     return True
-                
+
                 print(f"{len(df_to_load)} new rows remaining after deduplication. Proceeding to load...")
                 df = df_to_load
             except Exception as e:
@@ -391,6 +557,8 @@ class BQManager:
             )
 
             load_job.result()
+            # query_table이 바뀐 수정 시각을 바로 읽도록 메타데이터를 지웁니다.
+            self._tables.pop(full_table_id, None)
 
             print(f"Dataframe loaded successfully into '{full_table_id}'.")
             return True
@@ -398,6 +566,125 @@ class BQManager:
             print(f"Failed to load dataframe: {e}")
             return False
 
+    def _merge_dataframe(self, df: pd.DataFrame, table: bigquery.Table, keys: list, upsert: bool) -> bool:
+        """임시 테이블에 적재하고 MERGE로 대상 테이블에 반영합니다.
+
+        임시 테이블은 끝나면 삭제하며, 도중에 프로세스가 종료되어도 하루 뒤 만료되도록 만듭니다.
+        """
+        full_table_id = f"{table.project}.{table.dataset_id}.{table.table_id}"
+        staging_id = f"{full_table_id}_staging_{uuid.uuid4().hex[:12]}"
+
+        # 기존 열은 대상 테이블의 형식으로 적재하고, 새 열만 자동 감지합니다.
+        known = [field for field in table.schema if field.name in df.columns]
+        job_config = bigquery.LoadJobConfig(
+            schema=known,
+            write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+            create_disposition=bigquery.CreateDisposition.CREATE_NEVER,
+            schema_update_options=[bigquery.SchemaUpdateOption.ALLOW_FIELD_ADDITION],
+        )
+        print(f"Loading {len(df)} rows into staging table '{staging_id}'...")
+        try:
+            staging = bigquery.Table(staging_id, schema=known)
+            staging.expires = datetime.now(timezone.utc) + timedelta(days=1)
+            self.bq_client.create_table(staging)
+
+            self.bq_client.load_table_from_dataframe(
+                dataframe=df, destination=staging_id, job_config=job_config
+            ).result()
+
+            staging = self.bq_client.get_table(staging_id)
+            existing = {field.name for field in table.schema}
+            added = [field for field in staging.schema if field.name not in existing]
+            if added:
+                # ALLOW_FIELD_ADDITION과 같이 새 열은 대상 테이블에 추가합니다.
+                table.schema = list(table.schema) + [
+                    bigquery.SchemaField(field.name, field.field_type, mode="NULLABLE") for field in added
+                ]
+                table = self.bq_client.update_table(table, ["schema"])
+                print(f"Added {len(added)} new columns to '{full_table_id}'.")
+
+            query = self._merge_query(full_table_id, staging_id, [field.name for field in staging.schema], keys, upsert)
+            job = self.bq_client.query(query)
+            job.result()
+            self._tables.pop(full_table_id, None)
+            print(f"MERGE into '{full_table_id}' completed: {job.num_dml_affected_rows or 0} rows affected.")
+            return True
+        finally:
+            try:
+                self.bq_client.delete_table(staging_id, not_found_ok=True)
+            except Exception as e:
+                print(f"Failed to delete staging table '{staging_id}': {e}")
+
+    @staticmethod
+    def _merge_query(target_id: str, staging_id: str, columns: list[str], keys: list, upsert: bool) -> str:
+        """MERGE 문을 만듭니다. 키 비교는 NULL끼리도 같은 값으로 봅니다."""
+        source = f"`{staging_id}`"
+        if upsert:
+            # 같은 키의 행이 여러 개면 MERGE UPDATE가 실패하므로 하나만 남깁니다.
+            partition = ", ".join(f"`{key}`" for key in keys)
+            source = (
+                f"(SELECT * EXCEPT(_row) FROM (SELECT *, ROW_NUMBER() OVER (PARTITION BY {partition}) AS _row "
+                f"FROM `{staging_id}`) WHERE _row = 1)"
+            )
+        condition = " AND ".join(f"T.`{key}` IS NOT DISTINCT FROM S.`{key}`" for key in keys)
+        names = ", ".join(f"`{column}`" for column in columns)
+        values = ", ".join(f"S.`{column}`" for column in columns)
+        query = f"MERGE `{target_id}` T\nUSING {source} S\nON {condition}\n"
+        updates = [column for column in columns if column not in keys]
+        if upsert and updates:
+            query += "WHEN MATCHED THEN UPDATE SET " + ", ".join(f"`{column}` = S.`{column}`" for column in updates) + "\n"
+        query += f"WHEN NOT MATCHED THEN INSERT ({names}) VALUES ({values})"
+        return query
+
+    def _drop_existing_keys(self, df: pd.DataFrame, table: bigquery.Table, keys: list) -> pd.DataFrame:
+        """테이블에 이미 있는 키의 행을 뺍니다. (MERGE를 사용할 수 없을 때)
+
+        적재할 행의 키 값만 쿼리 매개변수로 보내 조회하고, 비교는 MultiIndex로 한 번에 처리합니다.
+        """
+        types = {field.name: field.field_type for field in table.schema}
+        filters = []
+        parameters = []
+        for index, key in enumerate(keys):
+            values = self._key_column(df[key].dropna().drop_duplicates(), types.get(key, "STRING"))
+            parameters.append(bigquery.ArrayQueryParameter(f"k{index}", self._parameter_type(types.get(key, "STRING")), list(values)))
+            filters.append(f"(`{key}` IN UNNEST(@k{index})" + (f" OR `{key}` IS NULL)" if df[key].isna().any() else ")"))
+        key_cols = ", ".join(f"`{key}`" for key in keys)
+        full_table_id = f"{table.project}.{table.dataset_id}.{table.table_id}"
+        duplication_query = f"SELECT DISTINCT {key_cols} FROM `{full_table_id}` WHERE " + " AND ".join(filters)
+
+        print("Querying existing keys of the batch for deduplication...")
+        job_config = bigquery.QueryJobConfig(query_parameters=parameters)
+        existing = self.bq_client.query(duplication_query, job_config=job_config).to_dataframe()
+        print(f"Found {len(existing)} matching keys in existing data.")
+        if existing.empty:
+            return df
+
+        def key_index(frame: pd.DataFrame) -> pd.MultiIndex:
+            return pd.MultiIndex.from_arrays(
+                [self._key_column(frame[key], types.get(key, "STRING")) for key in keys], names=keys
+            )
+
+        return df[~key_index(df).isin(key_index(existing))]
+
+    @staticmethod
+    def _parameter_type(field_type: str) -> str:
+        """레거시 SQL 형식 이름을 쿼리 매개변수 형식으로 바꿉니다."""
+        return {"INTEGER": "INT64", "FLOAT": "FLOAT64", "BOOLEAN": "BOOL"}.get(field_type, field_type)
+
+    @staticmethod
+    def _key_column(values: pd.Series, field_type: str) -> pd.Series:
+        """키 값을 테이블 열 형식에 맞춥니다. (DataFrame과 조회 결과를 같은 형식으로 비교)"""
+        if field_type == "DATE":
+            return pd.to_datetime(values).dt.date
+        if field_type in ("TIMESTAMP", "DATETIME"):
+            converted = pd.to_datetime(values, utc=field_type == "TIMESTAMP")
+            return converted.map(lambda value: None if pd.isna(value) else value.to_pydatetime())
+        if field_type in ("INTEGER", "INT64"):
+            return values.astype("Int64").astype(object).where(values.notna(), None)
+        if field_type in ("FLOAT", "FLOAT64", "BOOLEAN", "BOOL"):
+            return values.astype(object).where(values.notna(), None)
+        return values.astype(object).where(values.isna(), values.astype(str))
+
     def create_external_table(self):
         if not self.bq_client:
             print("BigQuery 클라이언트가 비활성화되어 테이블을 생성하지 않습니다.")
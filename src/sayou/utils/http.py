@@ -0,0 +1,221 @@
+import logging
+import os
+import socket
+import threading
+import time
+
+import requests
+
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+# (연결, 읽기) 제한 시간. requests는 기본값이 없어 응답이 없으면 작업자 스레드가 묶입니다.
+DEFAULT_TIMEOUT = (
+    float(os.getenv("OPENDART_HTTP_CONNECT_TIMEOUT", "5")),
+    float(os.getenv("OPENDART_HTTP_READ_TIMEOUT", "60")),
+)
+
+
+class DNSCache:
+    """호스트 이름 조회 결과를 ttl초 동안 재사용합니다."""
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._entries: dict[tuple[str, int], tuple[float, list[str]]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, host: str, port: int) -> str:
+        now = time.monotonic()
+        entry = self._entries.get((host, port))
+        if entry is not None and entry[0] > now:
+            self.hits += 1
+            return entry[1][0]
+
+        self.misses += 1
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        with self._lock:
+            self._entries[(host, port)] = (now + self.ttl, addresses)
+        return addresses[0]
+
+    def invalidate(self, host: str, port: int):
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+
+class ConnectionStats:
+    """호스트별 요청 수와 새 연결 수 (나머지는 keep-alive 연결 재사용)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts: dict[str, list[int]] = {}
+
+    def _count(self, host: str, index: int):
+        with self._lock:
+            counts = self._hosts.setdefault(host, [0, 0])
+            counts[index] += 1
+
+    def checkout(self, host: str):
+        self._count(host, 0)
+
+    def connect(self, host: str):
+        self._count(host, 1)
+
+    def stats(self) -> dict:
+        result = {}
+        for host, (checkouts, connections) in self._hosts.items():
+            reused = max(0, checkouts - connections)
+            result[host] = {
+                "requests": checkouts,
+                "new_connections": connections,
+                "reused": reused,
+                "reuse_ratio": round(reused / checkouts, 4) if checkouts else 0.0,
+            }
+        return result
+
+
+dns_cache = DNSCache(float(os.getenv("OPENDART_DNS_TTL", "300")))
+connection_stats = ConnectionStats()
+
+
+class _CachedDNSMixin:
+    """연결할 때 DNSCache로 조회한 주소를 사용합니다. (TLS SNI/인증서 검증은 원래 호스트 이름으로)"""
+
+    def _new_conn(self):
+        host = self._dns_host
+        connection_stats.connect(host)
+        try:
+            self._dns_host = dns_cache.resolve(host, self.port)
+        except OSError:
+            # 조회 실패는 원래 경로(urllib3)에서 오류로 처리되도록 합니다.
+            return super()._new_conn()
+        try:
+            return super()._new_conn()
+        except Exception:
+            dns_cache.invalidate(host, self.port)
+            raise
+        finally:
+            self._dns_host = host
+
+
+class CachedDNSHTTPConnection(_CachedDNSMixin, HTTPConnection):
+    pass
+
+
+class CachedDNSHTTPSConnection(_CachedDNSMixin, HTTPSConnection):
+    pass
+
+
+class _MeteredPoolMixin:
+    def _get_conn(self, timeout=None):
+        connection_stats.checkout(self.host)
+        return super()._get_conn(timeout)
+
+
+class MeteredHTTPConnectionPool(_MeteredPoolMixin, HTTPConnectionPool):
+    ConnectionCls = CachedDNSHTTPConnection
+
+
+class MeteredHTTPSConnectionPool(_MeteredPoolMixin, HTTPSConnectionPool):
+    ConnectionCls = CachedDNSHTTPSConnection
+
+
+class PooledAdapter(HTTPAdapter):
+    """keep-alive 연결 풀, DNS 캐시, 연결 재사용 통계, 기본 제한 시간을 적용하는 어댑터"""
+
+    def __init__(self, pool_connections: int | None = None, pool_maxsize: int | None = None, retries: int = 2, **kwargs):
+        super().__init__(
+            pool_connections=pool_connections or int(os.getenv("OPENDART_HTTP_POOL_CONNECTIONS", "4")),
+            pool_maxsize=pool_maxsize or int(os.getenv("OPENDART_HTTP_POOL_SIZE", "32")),
+            # 연결 단계 오류만 재시도합니다. (응답을 받은 요청은 다시 보내지 않음)
+            max_retries=Retry(total=retries, connect=retries, read=0, status=0, other=0, backoff_factor=0.2),
+            **kwargs,
+        )
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": MeteredHTTPConnectionPool,
+            "https": MeteredHTTPSConnectionPool,
+        }
+
+    def send(self, request, timeout=None, **kwargs):
+        return super().send(request, timeout=timeout or DEFAULT_TIMEOUT, **kwargs)
+
+
+class ThreadLocalHeadersSession(requests.Session):
+    """headers를 작업자 스레드별 사본으로 두는 세션
+
+    OpenDartClient._get은 referer가 있으면 session.headers를 바꾸므로, 여러 스레드가 한 세션을 공유하면
+    다른 요청의 Referer가 섞입니다. 어댑터(연결 풀)는 공유하고 headers만 스레드마다 따로 사용합니다.
+    headers에 대입하면 모든 스레드의 기본값이 바뀝니다.
+    """
+
+    def __init__(self, headers: dict | None = None):
+        super().__init__()
+        if headers:
+            self.headers = {**self._base_headers, **headers}
+
+    @property
+    def headers(self) -> CaseInsensitiveDict:
+        headers = getattr(self._local, "headers", None)
+        if headers is None:
+            headers = self._local.headers = self._base_headers.copy()
+        return headers
+
+    @headers.setter
+    def headers(self, value):
+        self._base_headers = CaseInsensitiveDict(value)
+        self._local = threading.local()
+
+
+def create_session(limiter=None) -> requests.Session:
+    """DART 요청에 사용할 세션을 만듭니다.
+
+    모든 호스트에 PooledAdapter를, limiter가 있으면 OpenDART API에 RateLimitedAdapter를 연결합니다.
+    """
+    session = ThreadLocalHeadersSession({
+        "User-Agent": USER_AGENT,
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+    })
+    session.mount("http://", PooledAdapter())
+    session.mount("https://", PooledAdapter())
+    if limiter is not None:
+        from .ratelimit import RateLimitedAdapter
+
+        session.mount("https://opendart.fss.or.kr/", RateLimitedAdapter(limiter))
+    return session
+
+
+_shared_session: requests.Session | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_session(limiter=None) -> requests.Session:
+    """프로세스에서 공유하는 세션을 반환합니다. (처음 호출할 때의 limiter를 사용)"""
+    global _shared_session
+    if _shared_session is None:
+        with _shared_lock:
+            if _shared_session is None:
+                _shared_session = create_session(limiter)
+    return _shared_session
+
+
+def http_stats() -> dict:
+    return {
+        "connections": connection_stats.stats(),
+        "dns": {"hits": dns_cache.hits, "misses": dns_cache.misses},
+    }
@@ -0,0 +1,107 @@
+import asyncio
+import logging
+import os
+
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+Fetch = Callable[[int, int], Awaitable[list[Any]]]
+Status = Callable[[int, int], bool | None]
+
+
+def previous_quarter(year: int, quarter: int) -> tuple[int, int]:
+    """직전 분기를 반환합니다."""
+    return (year, quarter - 1) if quarter > 1 else (year - 1, 4)
+
+
+def candidate_periods(year: int, quarter: int, count: int = 5) -> list[tuple[int, int]]:
+    """(year, quarter)부터 과거 방향으로 count개의 분기를 반환합니다."""
+    periods = [(year, quarter)]
+    while len(periods) < count:
+        periods.append(previous_quarter(*periods[-1]))
+    return periods
+
+
+def _retrieve(task: asyncio.Task):
+    """끝난 요청의 예외를 확인합니다."""
+    if not task.cancelled():
+        task.exception()
+
+
+class PeriodResolver:
+    """공시가 존재하는 가장 최근 분기를 찾습니다.
+
+    후보 분기(기본 5개)를 최신 분기부터 순서대로 조회합니다. width가 2 이상이면
+    다음 후보를 width개까지 미리 요청하고, 비어 있지 않은 결과를 찾으면 나머지 요청은
+    취소합니다. 취소한 요청도 토큰과 일일 한도를 사용하므로 기본값은 순차 조회(1)입니다.
+
+    status가 주어지면 요청 전에 공시 제출 여부를 확인하여, 미제출로 알려진
+    분기는 건너뛰고 제출된 것으로 알려진 분기보다 과거는 조회하지 않습니다.
+    제출된 분기를 알고 있으면 그 분기에서 결과가 나오므로 미리 요청하지 않습니다.
+    """
+
+    def __init__(self, max_steps: int | None = None, width: int | None = None):
+        self.max_steps = max_steps or int(os.getenv("OPENDART_PERIOD_STEPS", 5))
+        self.width = width or int(os.getenv("OPENDART_PERIOD_SPECULATION", 1))
+
+    async def resolve(
+        self,
+        fetch: Fetch,
+        year: int,
+        quarter: int,
+        exact: bool = False,
+        status: Status | None = None,
+    ) -> tuple[int, int, list[Any]]:
+        """가장 최근의 비어 있지 않은 (year, quarter, data)를 반환합니다.
+
+        Args:
+            fetch: (year, quarter)를 받아 결과 목록을 반환하는 코루틴 함수
+            year: 시작 연도
+            quarter: 시작 분기
+            exact: True이면 지정한 분기만 조회합니다.
+            status: (year, quarter)의 제출 여부(True/False/None)를 반환하는 함수
+
+        Returns:
+            tuple: (연도, 분기, 결과). 모든 후보가 비어 있으면 마지막 후보의 빈 결과
+        """
+        if exact:
+            if status is not None and status(year, quarter) is False:
+                return year, quarter, []
+            return year, quarter, await fetch(year, quarter)
+
+        periods = []
+        width = self.width
+        for y, q in candidate_periods(year, quarter, self.max_steps):
+            known = status(y, q) if status is not None else None
+            if known is False:
+                continue
+            periods.append((y, q))
+            if known is True:
+                width = 1
+                break
+        if not periods:
+            return year, quarter, []
+
+        tasks: list[asyncio.Task] = []
+
+        def launch():
+            while len(tasks) < len(periods) and sum(not t.done() for t in tasks) < width:
+                y, q = periods[len(tasks)]
+                tasks.append(asyncio.create_task(fetch(y, q)))
+
+        data: list[Any] = []
+        try:
+            for index, (y, q) in enumerate(periods):
+                launch()
+                logger.info(f"fetching period data: {y}Q{q}")
+                data = await tasks[index]
+                if len(data) > 0:
+                    return y, q, data
+            return periods[-1][0], periods[-1][1], data
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                # 기다리지 않은 요청의 예외는 여기서 확인하여 "never retrieved" 경고로 남지 않게 합니다.
+                task.add_done_callback(_retrieve)
@@ -0,0 +1,299 @@
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Awaitable, Callable
+
+from .changefeed import report_period
+from .disclosures import DisclosureStream
+from .filing_index import KST, filing_deadline, period_end
+from .ratelimit import BACKGROUND, kst_today
+
+logger = logging.getLogger(__name__)
+
+# 정기보고서가 제출되면 미리 조회할 보고서 유형 (재무제표, 배당, 임원 보수)
+PREFETCH_REPORTS = (
+    "financial_statements",
+    "dividends",
+    "director_compensation",
+    "total_director_compensation",
+    "top5_director_compensation",
+)
+
+# 제출 기한이 지나도 이 기간까지는 늦은 제출을 확인합니다.
+_GRACE_DAYS = 14
+# 제출 기한 전후 이 기간은 짧은 간격으로 확인합니다. (대형주 제출이 몰리는 시기)
+_PEAK_BEFORE_DAYS = 14
+_PEAK_AFTER_DAYS = 7
+# 워터마크 이하의 공시가 이만큼 이어지면 더 읽지 않습니다.
+_OVERLAP = 20
+# 제출 직후에는 재무 API에 데이터가 아직 없을 수 있으므로 이만큼 다시 시도합니다.
+_MAX_ATTEMPTS = 3
+
+
+def filing_seasons(today: date) -> list[tuple[int, int]]:
+    """오늘 정기보고서 제출을 기다리는 (사업연도, 분기) 목록을 반환합니다.
+
+    보고 기간이 끝난 다음 날부터 제출 기한 + _GRACE_DAYS일까지입니다.
+    예) 5월 1일이면 전년도 사업보고서(4분기, 4/14까지)는 끝났고 1분기 보고서(5/15 기한)만 남습니다.
+    """
+    seasons = []
+    for year in (today.year - 1, today.year):
+        for quarter in (1, 2, 3, 4):
+            if period_end(year, quarter) < today <= filing_deadline(year, quarter) + timedelta(days=_GRACE_DAYS):
+                seasons.append((year, quarter))
+    return seasons
+
+
+def is_peak(today: date, year: int, quarter: int) -> bool:
+    """제출 기한 전후의 집중 제출 기간인지 확인합니다."""
+    deadline = filing_deadline(year, quarter)
+    return deadline - timedelta(days=_PEAK_BEFORE_DAYS) <= today <= deadline + timedelta(days=_PEAK_AFTER_DAYS)
+
+
+@dataclass(slots=True)
+class _Filing:
+    """관심 종목의 제출된 정기보고서와 아직 미리 조회하지 못한 보고서 유형"""
+
+    corp_code: str
+    year: int
+    quarter: int
+    rcept_no: str
+    reports: list[str] = field(default_factory=lambda: list(PREFETCH_REPORTS))
+    attempts: int = 0
+
+
+class FilingPrefetcher:
+    """공시 일정에 맞춰 관심 종목(OPENDART_WATCHLIST)의 정기보고서를 미리 조회합니다.
+
+    - 제출 기간(filing_seasons)에만 동작하며, 제출 기한 전후에는 interval, 그 외에는 idle_interval마다 확인합니다.
+    - 기업별로 조회하지 않고 정기공시(A) 검색 한 번으로 시장 전체의 새 보고서를 읽어 관심 종목만 고릅니다.
+      마지막으로 확인한 접수번호(워터마크) 이후의 페이지만 요청합니다.
+    - 새 보고서가 보이면 재무제표, 배당, 임원 보수를 warm(report, corp_code, year, quarter)으로 조회합니다.
+      이미 제출 확인된 항목(공시 인덱스)은 건너뜁니다.
+    - 하루 요청 수는 budget까지만 사용하고, 백그라운드 몫의 남은 한도가 부족하면 다음 확인으로 미룹니다.
+    - 워터마크와 대기 중인 보고서는 filename에 저장하므로 재시작해도 같은 공시를 다시 읽지 않고,
+      찾았지만 아직 조회하지 못한 보고서도 잃지 않습니다.
+    """
+
+    def __init__(
+        self,
+        client,
+        filing_index,
+        limiter,
+        resolve: Callable[[str], Awaitable[str]],
+        warm: Callable[[str, str, int, int], Awaitable[Any]],
+        watchlist: list[str] | None = None,
+        interval: float | None = None,
+        idle_interval: float | None = None,
+        budget: int | None = None,
+        filename: str | None = None,
+    ):
+        self.client = client
+        self.filing_index = filing_index
+        self.limiter = limiter
+        self.resolve = resolve
+        self.warm = warm
+        if watchlist is None:
+            watchlist = [stock.strip() for stock in os.getenv("OPENDART_WATCHLIST", "").split(",") if stock.strip()]
+        self.watchlist = list(dict.fromkeys(watchlist))
+        self.interval = interval if interval is not None else float(os.getenv("OPENDART_PREFETCH_INTERVAL", "600"))
+        self.idle_interval = idle_interval if idle_interval is not None else float(os.getenv("OPENDART_PREFETCH_IDLE_INTERVAL", "3600"))
+        self.budget = budget if budget is not None else int(os.getenv("OPENDART_PREFETCH_BUDGET", "1000"))
+        self.filename = filename or os.getenv("OPENDART_PREFETCH_FILE", "prefetch.json")
+
+        self.watermark: str | None = None
+        self._corp_codes: dict[str, str] = {}
+        self._pending: dict[tuple[str, int, int], _Filing] = {}
+        self._saved: dict | None = None
+        self._day = kst_today()
+        self._spent = 0
+        self._runs = 0
+        self._found = 0
+        self._warmed = 0
+        self._deferred = 0
+        self._last_run: float | None = None
+        self._last_error: str | None = None
+        self.load()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.watchlist) and self.interval > 0
+
+    def _state(self) -> dict:
+        return {"watermark": self.watermark, "pending": [asdict(filing) for filing in self._pending.values()]}
+
+    def load(self):
+        try:
+            with open(self.filename, "r", encoding="utf-8") as json_file:
+                state = json.load(json_file)
+            filings = [_Filing(**filing) for filing in state.get("pending", [])]
+        except (OSError, ValueError, TypeError):
+            return
+        self.watermark = state.get("watermark")
+        self._pending = {(filing.corp_code, filing.year, filing.quarter): filing for filing in filings}
+        self._saved = self._state()
+
+    def save(self):
+        """워터마크와 대기 중인 보고서를 파일에 원자적으로 저장합니다. 바뀐 내용이 없으면 쓰지 않습니다. (블로킹 호출)"""
+        state = self._state()
+        if state == self._saved:
+            return
+        directory = os.path.dirname(os.path.abspath(self.filename))
+        try:
+            fd, tmp_filename = tempfile.mkstemp(prefix=".prefetch.", suffix=".tmp", dir=directory)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as json_file:
+                    json.dump({**state, "updated_at": time.time()}, json_file)
+                os.replace(tmp_filename, self.filename)
+            except BaseException:
+                os.unlink(tmp_filename)
+                raise
+            self._saved = state
+        except OSError as e:
+            logger.warning(f"미리 조회 워터마크를 저장하지 못했습니다: {e}")
+
+    def next_interval(self, today: date | None = None) -> float:
+        """다음 확인까지 기다릴 시간(초)"""
+        today = today or datetime.now(KST).date()
+        if self._pending or any(is_peak(today, year, quarter) for year, quarter in filing_seasons(today)):
+            return self.interval
+        return max(self.interval, self.idle_interval)
+
+    def _budget_left(self) -> int:
+        day = kst_today()
+        if day != self._day:
+            self._day = day
+            self._spent = 0
+        return max(0, self.budget - self._spent)
+
+    async def _watched(self) -> dict[str, str]:
+        """관심 종목의 {corp_code: 종목} (찾지 못한 종목은 다음 확인 때 다시 찾습니다)"""
+        for stock in self.watchlist:
+            if stock in self._corp_codes:
+                continue
+            try:
+                self._corp_codes[stock] = await self.resolve(stock)
+            except Exception as e:
+                logger.warning(f"관심 종목의 기업코드를 찾지 못했습니다 ({stock}): {e}")
+        return {corp_code: stock for stock, corp_code in self._corp_codes.items() if corp_code}
+
+    async def scan(self, seasons: list[tuple[int, int]], watched: dict[str, str], today: date) -> int:
+        """워터마크 이후의 정기공시에서 관심 종목의 보고서를 찾아 대기 목록에 넣습니다."""
+        start = min(period_end(year, quarter) for year, quarter in seasons) + timedelta(days=1)
+        if self.watermark:
+            start = max(start, datetime.strptime(self.watermark[:8], "%Y%m%d").date())
+        stream = DisclosureStream(self.client, start=min(start, today), end=today, kind="A", prefetch=False)
+
+        found = 0
+        newest = self.watermark
+        old = 0
+        items = stream.__aiter__()
+        try:
+            async for disclosure in items:
+                if newest is None or disclosure.rcept_no > newest:
+                    newest = disclosure.rcept_no
+                if self.watermark is not None and disclosure.rcept_no <= self.watermark:
+                    old += 1
+                    if old >= _OVERLAP:
+                        break
+                    continue
+                old = 0
+                if disclosure.corp_code not in watched:
+                    continue
+                period = report_period(disclosure.report_nm)
+                if period is None or period not in seasons:
+                    continue
+                key = (disclosure.corp_code, *period)
+                if key not in self._pending:
+                    self._pending[key] = _Filing(disclosure.corp_code, *period, disclosure.rcept_no)
+                    found += 1
+                    logger.info(f"관심 종목 공시: {watched[disclosure.corp_code]} {disclosure.report_nm} ({disclosure.rcept_no})")
+        finally:
+            await items.aclose()
+            self._spent += stream.pages
+
+        self.watermark = newest
+        self._found += found
+        return found
+
+    async def warm_pending(self) -> int:
+        """대기 중인 보고서를 남은 예산 안에서 조회합니다. 조회를 마친 보고서 수를 반환합니다."""
+        targets = []
+        for filing in list(self._pending.values()):
+            filing.reports = [
+                report for report in filing.reports
+                if self.filing_index.status(filing.corp_code, report, filing.year, filing.quarter) is not True
+            ]
+            targets.extend((filing, report) for report in filing.reports)
+
+        allowed = min(self._budget_left(), self.limiter.remaining(BACKGROUND))
+        if len(targets) > allowed:
+            self._deferred += len(targets) - allowed
+            targets = targets[:allowed]
+        if targets:
+            self._spent += len(targets)
+            await asyncio.gather(
+                *(self.warm(report, filing.corp_code, filing.year, filing.quarter) for filing, report in targets),
+                return_exceptions=True,
+            )
+
+        warmed = 0
+        for filing, report in targets:
+            if self.filing_index.status(filing.corp_code, report, filing.year, filing.quarter) is True:
+                filing.reports.remove(report)
+                warmed += 1
+        for key, filing in list(self._pending.items()):
+            if filing.reports and any(target is filing for target, _ in targets):
+                filing.attempts += 1
+            if not filing.reports or filing.attempts >= _MAX_ATTEMPTS:
+                # 분기보고서에 배당·보수 항목이 없는 경우 등은 여러 번 시도한 뒤 포기합니다.
+                del self._pending[key]
+        self._warmed += warmed
+        return warmed
+
+    async def run_once(self, today: date | None = None) -> int:
+        """제출 기간이면 새 보고서를 찾아 미리 조회합니다. 조회를 마친 보고서 수를 반환합니다."""
+        today = today or datetime.now(KST).date()
+        self._runs += 1
+        self._last_run = time.time()
+        seasons = filing_seasons(today)
+        if not seasons or self._budget_left() <= 0:
+            return 0
+        try:
+            watched = await self._watched()
+            if watched:
+                await self.scan(seasons, watched, today)
+            warmed = await self.warm_pending()
+        except Exception as e:
+            self._last_error = str(e)
+            raise
+        finally:
+            await asyncio.to_thread(self.save)
+        self._last_error = None
+        if warmed:
+            logger.info(f"관심 종목 보고서 {warmed}건을 미리 조회했습니다 (오늘 {self._spent}/{self.budget}건 사용)")
+        return warmed
+
+    def stats(self) -> dict:
+        today = datetime.now(KST).date()
+        return {
+            "enabled": self.enabled,
+            "watchlist": len(self.watchlist),
+            "seasons": [f"{year}Q{quarter}" for year, quarter in filing_seasons(today)],
+            "watermark": self.watermark,
+            "pending": len(self._pending),
+            "budget": self.budget,
+            "spent": self._spent,
+            "runs": self._runs,
+            "found": self._found,
+            "warmed": self._warmed,
+            "deferred": self._deferred,
+            "last_run": self._last_run,
+            "last_error": self._last_error,
+        }
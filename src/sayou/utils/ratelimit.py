@@ -0,0 +1,664 @@
+import asyncio
+import contextlib
+import contextvars
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from .filing_index import KST
+from .http import PooledAdapter
+
+logger = logging.getLogger(__name__)
+
+# 요청 우선순위: 도구 호출(INTERACTIVE)이 백그라운드 작업(BACKGROUND)보다 먼저 처리됩니다.
+INTERACTIVE = 0
+BACKGROUND = 1
+
+_priority: contextvars.ContextVar[int] = contextvars.ContextVar("opendart_priority", default=INTERACTIVE)
+
+# DART 응답 상태 코드
+STATUS_OK = "000"
+STATUS_NO_DATA = "013"
+STATUS_RATE_LIMIT = "020"
+STATUS_MAINTENANCE = "800"
+STATUS_UNDEFINED = "900"
+
+_STATUS_PATTERN = re.compile(rb'"status"\s*:\s*"(\d{3})"|<status>(\d{3})</status>')
+
+
+@contextlib.contextmanager
+def priority(level: int):
+    """with 블록 안의 DART 요청 우선순위를 지정합니다.
+
+    CrawlerExecutor.run은 컨텍스트를 복사하므로 작업자 스레드에서도 유지됩니다.
+    """
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> int:
+    return _priority.get()
+
+
+def response_status(head: bytes) -> str | None:
+    """DART 응답(JSON 또는 XML) 앞부분에서 상태 코드를 찾습니다."""
+    match = _STATUS_PATTERN.search(head)
+    return (match.group(1) or match.group(2)).decode() if match else None
+
+
+def kst_today() -> str:
+    return datetime.now(KST).strftime("%Y%m%d")
+
+
+class DartApiError(RuntimeError):
+    """DART가 일시적 오류 상태를 응답한 경우
+
+    파서가 빈 결과로 바꾸지 않도록 예외로 전달하여 미제출로 기록되지 않게 합니다.
+    """
+
+    def __init__(self, message: str, status: str | None = None):
+        super().__init__(message)
+        self.status = status
+
+
+class RateLimitError(DartApiError):
+    """요청 제한(020) 또는 일일 요청 한도를 초과한 경우"""
+
+
+class TokenBucket:
+    """우선순위가 있는 토큰 버킷 (스레드 안전, acquire는 블로킹, acquire_async는 비동기)
+
+    백그라운드 요청은 버킷의 reserve 비율만큼 토큰을 남겨 두고 사용하며,
+    대기 중인 도구 호출이 있으면 양보합니다. backoff()가 호출되면 지정된 시간 동안
+    모든 요청을 멈추고, 연속으로 호출될수록 대기 시간이 늘어납니다.
+    """
+
+    def __init__(self, rate: float, burst: int, reserve: float = 0.25, min_backoff: float = 1.0, max_backoff: float = 60.0):
+        self.rate = rate
+        self.burst = burst
+        self.reserve = reserve
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._condition = threading.Condition()
+        self._interactive_waiting = 0
+        self._blocked_until = 0.0
+        self._backoff = 0.0
+        self._acquired = [0, 0]
+        self._waited = 0.0
+        self._backoffs = 0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _take(self, interactive: bool) -> float:
+        """잠금을 잡은 상태에서 토큰을 가져옵니다. 가져왔으면 0, 아니면 기다릴 시간(초)."""
+        now = time.monotonic()
+        self._refill(now)
+        wait = self._blocked_until - now
+        if wait > 0:
+            return wait
+        needed = 1.0 if interactive else 1.0 + self.reserve * self.burst
+        if not interactive and self._interactive_waiting:
+            return 1.0 / self.rate
+        if self._tokens >= needed:
+            self._tokens -= 1.0
+            return 0.0
+        return (needed - self._tokens) / self.rate
+
+    def acquire(self, level: int | None = None) -> float:
+        """토큰 하나를 얻을 때까지 기다립니다. 기다린 시간(초)을 반환합니다."""
+        level = current_priority() if level is None else level
+        interactive = level == INTERACTIVE
+        started = time.monotonic()
+        with self._condition:
+            if interactive:
+                self._interactive_waiting += 1
+            try:
+                while (wait := self._take(interactive)) > 0:
+                    self._condition.wait(wait)
+            finally:
+                if interactive:
+                    self._interactive_waiting -= 1
+                    self._condition.notify_all()
+
+        waited = time.monotonic() - started
+        self._acquired[level] += 1
+        self._waited += waited
+        return waited
+
+    async def acquire_async(self, level: int | None = None) -> float:
+        """acquire()와 같지만 스레드를 막지 않고 이벤트 루프에서 기다립니다."""
+        level = current_priority() if level is None else level
+        interactive = level == INTERACTIVE
+        started = time.monotonic()
+        if interactive:
+            with self._condition:
+                self._interactive_waiting += 1
+        try:
+            while True:
+                with self._condition:
+                    wait = self._take(interactive)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+        finally:
+            if interactive:
+                with self._condition:
+                    self._interactive_waiting -= 1
+                    self._condition.notify_all()
+
+        waited = time.monotonic() - started
+        self._acquired[level] += 1
+        self._waited += waited
+        return waited
+
+    def backoff(self) -> float:
+        """요청을 잠시 멈춥니다. 연속 호출 시 대기 시간을 두 배로 늘립니다."""
+        with self._condition:
+            self._backoff = min(max(self._backoff * 2, self.min_backoff), self.max_backoff)
+            self._blocked_until = time.monotonic() + self._backoff
+            self._tokens = 0.0
+            self._backoffs += 1
+            return self._backoff
+
+    def success(self):
+        self._backoff = 0.0
+
+    def stats(self) -> dict:
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "tokens": round(self._tokens, 2),
+            "interactive": self._acquired[INTERACTIVE],
+            "background": self._acquired[BACKGROUND],
+            "waited_seconds": round(self._waited, 3),
+            "backoffs": self._backoffs,
+            "blocked_for": round(max(0.0, self._blocked_until - time.monotonic()), 3),
+        }
+
+
+class FileQuotaStore:
+    """일일 요청 수를 로컬 파일에 저장합니다. (단일 인스턴스 및 테스트용)
+
+    같은 호스트의 여러 프로세스는 파일 잠금으로 합산합니다.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+
+    def add(self, day: str, delta: int) -> int | None:
+        import fcntl
+
+        with open(self.filename, "a+", encoding="utf-8") as file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+            try:
+                file.seek(0)
+                try:
+                    data = json.loads(file.read() or "{}")
+                except json.JSONDecodeError:
+                    data = {}
+                if data.get("day") != day:
+                    data = {"day": day, "count": 0}
+                data["count"] += delta
+                file.seek(0)
+                file.truncate()
+                json.dump(data, file)
+                file.flush()
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
+        return data["count"]
+
+
+class GCSQuotaStore:
+    """일일 요청 수를 GCS 객체에 저장하여 여러 인스턴스가 공유합니다.
+
+    객체 generation 조건부 쓰기(compare-and-swap)로 동시 갱신을 합산합니다.
+    """
+
+    def __init__(self, bucket_name: str, blob_name: str, retries: int = 5):
+        self.bucket_name = bucket_name
+        self.blob_name = blob_name
+        self.retries = retries
+        self._gcs = None
+
+    @property
+    def gcs(self):
+        if self._gcs is None:
+            from .gcpmanager import GCSManager
+
+            self._gcs = GCSManager(bucket_name=self.bucket_name)
+        return self._gcs
+
+    def add(self, day: str, delta: int) -> int | None:
+        for _ in range(self.retries):
+            content, generation = self.gcs.read_generation(self.blob_name)
+            if generation is None:
+                # 읽는 사이에 다른 인스턴스가 갱신했거나 읽지 못한 경우 다시 시도합니다.
+                logger.debug(f"공유 요청 수 읽기 재시도: {self.blob_name}")
+                continue
+            try:
+                data = json.loads(content) if content else {}
+            except json.JSONDecodeError:
+                data = {}
+            if data.get("day") != day:
+                data = {"day": day, "count": 0}
+            data["count"] += delta
+            if self.gcs.upload_if_generation(json.dumps(data), self.blob_name, generation):
+                return data["count"]
+        logger.warning(f"공유 요청 수를 갱신하지 못했습니다: {self.blob_name}")
+        return None
+
+
+class QuotaCounter:
+    """KST 기준 일일 DART 요청 수를 세고 한도를 적용합니다.
+
+    요청 수는 flush_every건 또는 flush_interval초마다 저장소에 더하며,
+    저장소가 돌려준 합계(다른 인스턴스 포함)로 로컬 값을 맞춥니다.
+    백그라운드 요청은 한도의 background_share까지만 사용할 수 있습니다.
+
+    consume()과 exhaust()는 메모리에서만 세고, 저장소 I/O는 flush()가 잠금 밖에서 처리합니다.
+    (이벤트 루프나 다른 스레드가 저장소 응답을 기다리며 멈추지 않도록)
+    """
+
+    def __init__(self, limit: int, store=None, background_share: float = 0.8, flush_every: int = 50, flush_interval: float = 30.0):
+        self.limit = limit
+        self.store = store
+        self.background_share = background_share
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        # 저장소 I/O는 한 번에 하나만 실행합니다. (_lock과 달리 I/O 동안 잡고 있음)
+        self._flush_lock = threading.Lock()
+        self._day = kst_today()
+        self._count = 0
+        self._pending = 0
+        self._flushed_at = time.monotonic()
+        self._retry_at = 0.0
+        self._exhausted_day: str | None = None
+        self._rejected = 0
+        # 저장소의 오늘 합계는 첫 flush()에서 읽습니다. (import 시 I/O 없음)
+        self._loaded = store is None
+
+    def _rollover(self):
+        day = kst_today()
+        if day != self._day:
+            self._day = day
+            self._count = 0
+            self._pending = 0
+
+    def consume(self, level: int | None = None):
+        """요청 하나를 기록합니다. 한도를 넘으면 RateLimitError를 발생시킵니다. (I/O 없음)"""
+        level = current_priority() if level is None else level
+        with self._lock:
+            self._rollover()
+            limit = self.limit if level == INTERACTIVE else int(self.limit * self.background_share)
+            if self._exhausted_day == self._day or self._count >= limit:
+                self._rejected += 1
+                raise RateLimitError(f"DART 일일 요청 한도를 초과했습니다: {self._count}/{limit}", STATUS_RATE_LIMIT)
+            self._count += 1
+            self._pending += 1
+
+    def due(self) -> bool:
+        """저장소와 맞출 때가 되었는지 확인합니다. (처음 요청, flush_every건, flush_interval초)"""
+        if self.store is None or time.monotonic() < self._retry_at:
+            return False
+        return not self._loaded or self._pending >= self.flush_every or (
+            self._pending > 0 and time.monotonic() - self._flushed_at >= self.flush_interval
+        )
+
+    def remaining(self, level: int = INTERACTIVE) -> int:
+        """오늘 남은 요청 수 (저장소와 마지막으로 맞춘 값 기준)"""
+        self._rollover()
+        if self._exhausted_day == self._day:
+            return 0
+        limit = self.limit if level == INTERACTIVE else int(self.limit * self.background_share)
+        return max(0, limit - self._count)
+
+    def exhaust(self):
+        """DART가 한도 초과를 알려 온 경우 오늘(KST) 남은 요청을 막습니다. (다음 flush()에 저장소에 반영)"""
+        with self._lock:
+            self._rollover()
+            self._exhausted_day = self._day
+            if self.store is not None:
+                # 다른 인스턴스도 한도에 도달하도록 남은 한도를 더하고 바로 저장합니다.
+                self._pending += max(0, self.limit - self._count)
+                self._loaded = False
+            self._count = max(self._count, self.limit)
+
+    def flush(self, force: bool = True):
+        """기록한 요청 수를 저장소에 더하고 합계로 로컬 값을 맞춥니다. (블로킹 호출)
+
+        force=False이면 due()일 때만 저장합니다. 다른 스레드가 저장 중이면 기다리지 않고 넘어갑니다.
+        """
+        if self.store is None or not self._flush_lock.acquire(blocking=False):
+            return
+        try:
+            with self._lock:
+                self._rollover()
+                if not (force and (self._pending or not self._loaded)) and not self.due():
+                    return
+                day, delta = self._day, self._pending
+                self._pending = 0
+            try:
+                total = self.store.add(day, delta)
+            except Exception as e:
+                logger.warning(f"요청 수 저장 실패: {e}")
+                total = None
+            with self._lock:
+                if total is None:
+                    # 저장하지 못한 요청 수는 flush_interval초 뒤에 다시 더합니다.
+                    if self._day == day:
+                        self._pending += delta
+                    self._retry_at = time.monotonic() + self.flush_interval
+                    return
+                self._loaded = True
+                self._flushed_at = time.monotonic()
+                if self._day == day:
+                    self._count = max(self._count, total)
+        finally:
+            self._flush_lock.release()
+
+    def stats(self) -> dict:
+        return {
+            "day": self._day,
+            "count": self._count,
+            "limit": self.limit,
+            "remaining": max(0, self.limit - self._count),
+            "exhausted": self._exhausted_day == self._day,
+            "rejected": self._rejected,
+        }
+
+
+# 키를 사용할 수 없음: 등록되지 않은 키(010), 사용할 수 없는 키(011),
+# 접근할 수 없는 IP(012), 사용자 계정 만료(901)
+INVALID_KEY_STATUSES = {"010", "011", "012", "901"}
+
+
+def key_id(api_key: str) -> str:
+    """로그와 저장소 경로에 쓰는 키 식별자 (키 원문을 노출하지 않음)"""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:8]
+
+
+def _quota_store(api_key: str):
+    """키별 일일 요청 수 저장소를 만듭니다."""
+    kind = os.getenv("OPENDART_QUOTA_STORE", "file")
+    if kind == "gcs":
+        root, ext = os.path.splitext(os.getenv("OPENDART_QUOTA_BLOB", "OpenDart/quota.json"))
+        return GCSQuotaStore(os.getenv("OPENDART_CACHE_BUCKET", "sayouzone-ai-stocks"), f"{root}.{key_id(api_key)}{ext}")
+    if kind == "file":
+        root, ext = os.path.splitext(os.getenv("OPENDART_QUOTA_FILE", "opendart_quota.json"))
+        return FileQuotaStore(f"{root}.{key_id(api_key)}{ext}")
+    return None
+
+
+class KeyRejectedError(RateLimitError):
+    """키 하나가 한도 초과 또는 사용할 수 없는 키로 거절된 경우 (다른 키로 재시도 가능)"""
+
+
+class _ApiKey:
+    def __init__(self, api_key: str, quota: QuotaCounter):
+        self.api_key = api_key
+        self.id = key_id(api_key)
+        self.quota = quota
+        self.disabled: str | None = None
+        self.cooldown_until = 0.0
+        self.consecutive_limits = 0
+
+    def available(self, now: float) -> bool:
+        return self.disabled is None and self.cooldown_until <= now
+
+    def stats(self) -> dict:
+        return {
+            **self.quota.stats(),
+            "disabled": self.disabled,
+            "cooldown": round(max(0.0, self.cooldown_until - time.monotonic()), 3),
+        }
+
+
+class KeyPool:
+    """여러 DART API 키에 요청을 나누고 키별 일일 한도를 관리합니다.
+
+    - 남은 한도가 가장 많은 키를 고르므로 키 사이에 요청이 고르게 분산됩니다.
+    - 020(한도 초과)을 응답한 키는 잠시 쉬게 하고, 연속 exhaust_after회면 오늘(KST) 사용을 멈춥니다.
+    - 010/011/012/901(사용할 수 없는 키)을 응답한 키는 교체될 때까지 제외합니다.
+    """
+
+    def __init__(self, daily_limit: int, background_share: float = 0.8, store_factory=_quota_store, exhaust_after: int = 3, cooldown: float = 60.0):
+        self.daily_limit = daily_limit
+        self.background_share = background_share
+        self.store_factory = store_factory
+        self.exhaust_after = exhaust_after
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._keys: list[_ApiKey] = []
+        self._anonymous = QuotaCounter(daily_limit, None, background_share)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def set_keys(self, api_keys: list[str]):
+        """사용할 키 목록을 설정합니다. 이미 있는 키의 상태는 유지합니다."""
+        with self._lock:
+            existing = {key.api_key: key for key in self._keys}
+            self._keys = [
+                existing.get(api_key) or _ApiKey(
+                    api_key,
+                    QuotaCounter(self.daily_limit, self.store_factory(api_key) if self.store_factory else None, self.background_share),
+                )
+                for api_key in dict.fromkeys(api_keys)
+            ]
+        logger.info(f"DART API 키 {len(self._keys)}개 사용")
+
+    def acquire(self, level: int | None = None) -> str | None:
+        """요청에 사용할 키를 골라 요청 수를 기록합니다. 키가 설정되지 않았으면 None."""
+        level = current_priority() if level is None else level
+        if not self._keys:
+            self._anonymous.consume(level)
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            candidates = [key for key in self._keys if key.available(now)]
+            candidates.sort(key=lambda key: key.quota.remaining(level), reverse=True)
+        for key in candidates:
+            try:
+                key.quota.consume(level)
+                return key.api_key
+            except RateLimitError:
+                continue
+        raise RateLimitError("사용 가능한 DART API 키가 없습니다 (한도 초과 또는 사용할 수 없는 키)", STATUS_RATE_LIMIT)
+
+    def _find(self, api_key: str | None) -> _ApiKey | None:
+        return next((key for key in self._keys if key.api_key == api_key), None)
+
+    def reject(self, api_key: str | None, status: str):
+        """키가 거절된 경우 순환에서 제외합니다."""
+        key = self._find(api_key)
+        if key is None:
+            if status == STATUS_RATE_LIMIT:
+                self._anonymous.exhaust()
+            return
+        if status in INVALID_KEY_STATUSES:
+            key.disabled = status
+            logger.error(f"DART API 키 {key.id}를 사용할 수 없습니다 ({status}), 순환에서 제외합니다.")
+            return
+        key.consecutive_limits += 1
+        if key.consecutive_limits >= self.exhaust_after:
+            key.quota.exhaust()
+            logger.warning(f"DART API 키 {key.id}의 오늘 한도가 소진되었습니다.")
+        else:
+            key.cooldown_until = time.monotonic() + self.cooldown * key.consecutive_limits
+
+    def success(self, api_key: str | None):
+        key = self._find(api_key)
+        if key is not None:
+            key.consecutive_limits = 0
+
+    def remaining(self, level: int = INTERACTIVE) -> int:
+        """사용할 수 있는 키들의 오늘 남은 요청 수 합계"""
+        if not self._keys:
+            return self._anonymous.remaining(level)
+        now = time.monotonic()
+        return sum(key.quota.remaining(level) for key in self._keys if key.available(now))
+
+    def due(self) -> bool:
+        return any(key.quota.due() for key in self._keys)
+
+    def flush(self, force: bool = True):
+        """키별 요청 수를 저장소와 맞춥니다. (블로킹 호출)"""
+        for key in self._keys:
+            key.quota.flush(force)
+
+    def stats(self) -> dict:
+        if not self._keys:
+            return {"anonymous": self._anonymous.stats()}
+        return {key.id: key.stats() for key in self._keys}
+
+
+class RateLimiter:
+    """모든 DART API 요청에 토큰 버킷, 키별 일일 한도, 상태 코드별 backoff를 적용합니다.
+
+    RateLimitedAdapter를 크롤러의 requests 세션에 연결하거나,
+    acquire()(비동기 클라이언트는 acquire_async())/after_response()를 직접 호출하여 사용합니다.
+    """
+
+    def __init__(self, rate: float | None = None, burst: int | None = None, daily_limit: int | None = None, store_factory=_quota_store, exhaust_after: int = 3):
+        self.bucket = TokenBucket(
+            rate or float(os.getenv("OPENDART_RATE", "10")),
+            burst or int(os.getenv("OPENDART_BURST", "20")),
+        )
+        self.keys = KeyPool(
+            daily_limit or int(os.getenv("OPENDART_DAILY_QUOTA", "20000")),
+            background_share=float(os.getenv("OPENDART_BACKGROUND_SHARE", "0.8")),
+            store_factory=store_factory,
+            exhaust_after=exhaust_after,
+        )
+        self._statuses: dict[str, int] = {}
+
+    def set_keys(self, api_keys: list[str]):
+        self.keys.set_keys(api_keys)
+
+    def acquire(self) -> str | None:
+        """요청 하나를 허가받고 사용할 키를 반환합니다. (블로킹 호출)"""
+        level = current_priority()
+        api_key = self.keys.acquire(level)
+        self._flush_due()
+        self.bucket.acquire(level)
+        return api_key
+
+    async def acquire_async(self) -> str | None:
+        """acquire()의 비동기 버전 (토큰 버킷 대기 중 이벤트 루프를 막지 않음)"""
+        level = current_priority()
+        api_key = self.keys.acquire(level)
+        self._flush_due()
+        await self.bucket.acquire_async(level)
+        return api_key
+
+    def _flush_due(self):
+        """저장할 요청 수가 있으면 저장합니다.
+
+        이벤트 루프에서는 기다리지 않고 스레드에서 실행하여, 파일 잠금이나 GCS 응답을
+        기다리는 동안 다른 요청이 멈추지 않게 합니다.
+        """
+        if not self.keys.due():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.keys.flush(force=False)
+            return
+        loop.run_in_executor(None, self.keys.flush, False)
+
+    def flush(self):
+        """남은 요청 수를 저장소에 반영합니다. (블로킹 호출)"""
+        self.keys.flush()
+
+    def after_response(self, api_key: str | None, status_code: int, head: bytes):
+        """응답 상태를 확인하여 backoff하거나 예외를 발생시킵니다.
+
+        Raises:
+            KeyRejectedError: 키가 거절되어 다른 키로 다시 시도할 수 있는 경우
+            DartApiError: DART 일시 오류 (800, 900)
+        """
+        if status_code == 429 or status_code >= 500:
+            delay = self.bucket.backoff()
+            logger.warning(f"DART HTTP {status_code}, {delay:.1f}초 대기")
+            return
+
+        status = response_status(head)
+        if status is not None:
+            self._statuses[status] = self._statuses.get(status, 0) + 1
+
+        if status == STATUS_RATE_LIMIT or status in INVALID_KEY_STATUSES:
+            self.keys.reject(api_key, status)
+            self._flush_due()
+            raise KeyRejectedError(f"DART API 키가 거절되었습니다 ({status})", status)
+        if status in (STATUS_MAINTENANCE, STATUS_UNDEFINED):
+            delay = self.bucket.backoff()
+            raise DartApiError(f"DART 일시 오류 ({status}), {delay:.1f}초 대기", status)
+
+        self.keys.success(api_key)
+        self.bucket.success()
+
+    def remaining(self, level: int = INTERACTIVE) -> int:
+        """오늘 남은 요청 수 (level이 BACKGROUND이면 백그라운드 몫만)"""
+        return self.keys.remaining(level)
+
+    def stats(self) -> dict:
+        return {
+            "bucket": self.bucket.stats(),
+            "keys": self.keys.stats(),
+            "statuses": dict(self._statuses),
+        }
+
+
+def replace_api_key(url: str, api_key: str) -> str:
+    """URL의 crtfc_key 파라미터를 api_key로 바꿉니다."""
+    parts = urlsplit(url)
+    params = parse_qsl(parts.query, keep_blank_values=True)
+    if not any(name == "crtfc_key" for name, _ in params):
+        return url
+    params = [(name, api_key if name == "crtfc_key" else value) for name, value in params]
+    return urlunsplit(parts._replace(query=urlencode(params)))
+
+
+class RateLimitedAdapter(PooledAdapter):
+    """요청 전후에 RateLimiter를 적용하는 requests 어댑터 (연결 풀은 PooledAdapter와 같음)
+
+    요청마다 키 풀에서 고른 키로 crtfc_key를 바꾸고, 키가 거절되면 다른 키로 다시 보냅니다.
+    """
+
+    def __init__(self, limiter: RateLimiter, *args, **kwargs):
+        self.limiter = limiter
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        attempts = max(1, len(self.limiter.keys))
+        for attempt in range(attempts):
+            api_key = self.limiter.acquire()
+            if api_key is not None:
+                request.url = replace_api_key(request.url, api_key)
+            response = super().send(request, **kwargs)
+            head = b""
+            if not kwargs.get("stream"):
+                head = response.content[:256]
+            try:
+                self.limiter.after_response(api_key, response.status_code, head)
+                return response
+            except KeyRejectedError:
+                if attempt + 1 >= attempts:
+                    raise
+                response.close()
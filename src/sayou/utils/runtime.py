@@ -0,0 +1,177 @@
+import logging
+import os
+import threading
+import time
+
+from .config import resolve_api_keys
+from .corp_index import CorpCodeIndex
+from .corp_snapshot import CorpCodeSnapshot, SnapshotError, write_snapshot
+from .http import shared_session
+from .ratelimit import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+class OpenDartRuntime:
+    """OpenDartCrawler와 기업코드 데이터를 처음 사용할 때 초기화합니다.
+
+    모듈 import 시점에는 네트워크나 Secret Manager에 접근하지 않습니다.
+    서버가 포트를 연 뒤 warmup()을 백그라운드에서 호출하면 첫 요청 전에
+    초기화를 마칠 수 있고, ready()로 준비 상태를 확인할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        corpcode_filename: str | None = None,
+        snapshot_filename: str | None = None,
+        snapshot_check_interval: float | None = None,
+        limiter: RateLimiter | None = None,
+    ):
+        self.corpcode_filename = corpcode_filename or os.getenv("OPENDART_CORPCODE_FILE", "corpcode.json")
+        self.snapshot_filename = snapshot_filename or os.getenv("OPENDART_CORP_SNAPSHOT", "corpcode.idx")
+        self.snapshot_check_interval = snapshot_check_interval or float(os.getenv("OPENDART_CORP_SNAPSHOT_CHECK", "30"))
+        self.limiter = limiter
+        self._crawler = None
+        self._api_keys: list[str] | None = None
+        self._corp_index: CorpCodeIndex | CorpCodeSnapshot | None = None
+        self._snapshot_checked_at = 0.0
+        self._lock = threading.Lock()
+        self._keys_lock = threading.Lock()
+        self._index_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._error: str | None = None
+        self._warmup_seconds: float | None = None
+
+    @property
+    def crawler(self):
+        """OpenDartCrawler를 반환합니다. 필요하면 생성합니다. (블로킹 호출)"""
+        if self._crawler is None:
+            with self._lock:
+                if self._crawler is None:
+                    self._crawler = self._create_crawler()
+        return self._crawler
+
+    def _create_crawler(self):
+        from sayou.stock.opendart import OpenDartCrawler
+
+        api_keys = self.ensure_api_keys()
+        # corpcode 파일이 있으면 읽고, 없으면 DART에서 내려받습니다.
+        crawler = OpenDartCrawler(api_key=api_keys[0], corpcode_filename=self.corpcode_filename)
+        # 모든 DART 요청이 keep-alive 연결 풀을 공유하는 세션을 사용합니다.
+        crawler.client.session = shared_session(self.limiter)
+        if self.limiter is not None:
+            # 고정 지연(0.1초) 대신 토큰 버킷으로 DART API 요청을 제한합니다.
+            crawler.client._rate_limit_delay = 0
+        logger.info("OpenDartCrawler 초기화 완료")
+        return crawler
+
+    def ensure_api_keys(self) -> list[str]:
+        """DART API 키 목록을 찾아 limiter에 설정합니다. (블로킹 호출, 처음 한 번만 조회)"""
+        if self._api_keys is None:
+            with self._keys_lock:
+                if self._api_keys is None:
+                    api_keys = resolve_api_keys()
+                    if self.limiter is not None:
+                        # 요청마다 키 풀에서 고른 키로 crtfc_key를 바꿉니다.
+                        self.limiter.set_keys(api_keys)
+                    self._api_keys = api_keys
+        return self._api_keys
+
+    def ensure_corp_data(self):
+        """기업코드 인덱스를 준비합니다. (블로킹 호출)"""
+        if self._corp_index is None:
+            with self._index_lock:
+                if self._corp_index is None:
+                    self._corp_index = self._load_corp_index()
+                    self._ready.set()
+        return self._corp_index
+
+    def _load_corp_index(self):
+        """mmap 스냅샷을 열고, 없으면 corp_data로 스냅샷을 만듭니다.
+
+        스냅샷을 쓸 수 없는 환경(읽기 전용 파일 시스템 등)에서는 메모리 인덱스를 사용합니다.
+        """
+        try:
+            snapshot = CorpCodeSnapshot(self.snapshot_filename)
+            logger.info(f"기업코드 스냅샷 사용: {self.snapshot_filename} ({len(snapshot)}건)")
+            return snapshot
+        except SnapshotError as e:
+            logger.info(f"기업코드 스냅샷을 새로 만듭니다: {e}")
+
+        crawler = self.crawler
+        corp_data = crawler.corp_data
+        if not os.path.exists(self.corpcode_filename):
+            crawler.save_corp_data(self.corpcode_filename)
+        try:
+            write_snapshot(corp_data, self.snapshot_filename)
+            return CorpCodeSnapshot(self.snapshot_filename)
+        except (OSError, SnapshotError) as e:
+            logger.warning(f"기업코드 스냅샷을 저장하지 못해 메모리 인덱스를 사용합니다: {e}")
+            return CorpCodeIndex(corp_data)
+
+    def _check_snapshot(self):
+        """다른 프로세스가 스냅샷 파일을 교체했으면 새 파일을 매핑합니다."""
+        corp_index = self._corp_index
+        if not isinstance(corp_index, CorpCodeSnapshot):
+            return
+        now = time.monotonic()
+        if now - self._snapshot_checked_at < self.snapshot_check_interval:
+            return
+        self._snapshot_checked_at = now
+        if corp_index.changed():
+            try:
+                self._corp_index = CorpCodeSnapshot(self.snapshot_filename)
+                logger.info(f"기업코드 스냅샷을 다시 매핑했습니다: {len(self._corp_index)}건")
+            except SnapshotError as e:
+                logger.warning(f"기업코드 스냅샷 재매핑 실패: {e}")
+
+    def replace_corp_index(self, corp_index: CorpCodeIndex | CorpCodeSnapshot):
+        """갱신된 기업코드 인덱스로 참조를 교체합니다. 진행 중인 조회는 이전 인덱스를 계속 사용합니다."""
+        self._corp_index = corp_index
+        self._ready.set()
+
+    @property
+    def corp_index(self) -> CorpCodeIndex | CorpCodeSnapshot:
+        """기업코드 인덱스를 반환합니다. 준비되지 않았으면 초기화합니다. (블로킹 호출)"""
+        if self._corp_index is None:
+            return self.ensure_corp_data()
+        self._check_snapshot()
+        return self._corp_index
+
+    def resolve_ready(self, stock: str) -> str | None:
+        """인덱스가 준비되어 있으면 바로 corp_code를 찾습니다. 준비되지 않았으면 None.
+
+        이벤트 루프에서 호출하므로 유사 기업명 검색은 하지 않습니다.
+        찾지 못하면 호출자가 작업자 스레드에서 corp_index.resolve()로 다시 찾습니다.
+        """
+        if self._corp_index is None:
+            return None
+        return self.corp_index.resolve(stock, fuzzy=False)
+
+    def warmup(self):
+        """크롤러와 기업코드 데이터를 미리 초기화합니다. (블로킹 호출)"""
+        started = time.perf_counter()
+        try:
+            # 유사 기업명 검색용 역색인도 첫 요청 전에 만들어 둡니다.
+            self.ensure_corp_data().prepare_fuzzy()
+            self._error = None
+        except Exception as e:
+            self._error = str(e)
+            logger.error(f"OpenDart 초기화 실패: {e}")
+            return False
+        self._warmup_seconds = round(time.perf_counter() - started, 3)
+        logger.info(f"OpenDart 초기화 완료 ({self._warmup_seconds}s)")
+        return True
+
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def status(self) -> dict:
+        return {
+            "ready": self.ready(),
+            "crawler": self._crawler is not None,
+            "corp_index": len(self._corp_index) if self._corp_index is not None else None,
+            "corp_snapshot": self._corp_index.stats() if isinstance(self._corp_index, CorpCodeSnapshot) else None,
+            "warmup_seconds": self._warmup_seconds,
+            "error": self._error,
+        }
@@ -0,0 +1,63 @@
+import asyncio
+import logging
+
+from typing import Any, Awaitable, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """동일한 키의 동시 요청을 하나의 업스트림 호출로 합칩니다.
+
+    먼저 들어온 요청이 호출을 시작하고, 같은 키로 진행 중인 호출이 있는 동안
+    들어온 요청은 그 결과(또는 예외)를 함께 받습니다. 키마다 기다리는 요청 수를 세어,
+    한 요청이 취소되어도 다른 요청이 기다리는 동안은 호출을 유지하고
+    마지막 요청이 취소되면 호출도 취소합니다.
+    """
+
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self._waiters: dict[Hashable, int] = {}
+        self._calls = 0
+        self._upstream = 0
+        self._cancelled = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        self._calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            self._upstream += 1
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda t: self._done(key, t))
+        self._waiters[key] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if self._inflight.get(key) is task:
+                self._waiters[key] -= 1
+                if self._waiters[key] == 0 and not task.done():
+                    # 기다리는 요청이 모두 취소되었으면 업스트림 호출도 취소합니다.
+                    # 이후 같은 키의 요청은 취소된 호출에 합류하지 않고 새로 시작합니다.
+                    del self._inflight[key]
+                    del self._waiters[key]
+                    self._cancelled += 1
+                    task.cancel()
+
+    def _done(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+            del self._waiters[key]
+        # 모든 요청이 취소된 뒤 실패한 경우에도 예외가 기록되도록 합니다.
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"single-flight 호출 실패 ({key}): {task.exception()}")
+
+    def stats(self) -> dict:
+        return {
+            "calls": self._calls,
+            "upstream": self._upstream,
+            "saved": self._calls - self._upstream,
+            "cancelled": self._cancelled,
+            "in_flight": len(self._inflight),
+        }
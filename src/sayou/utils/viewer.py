@@ -0,0 +1,176 @@
+import asyncio
+import html
+import logging
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+MAIN_URL = "https://dart.fss.or.kr/dsaf001/main.do"
+VIEWER_URL = "https://dart.fss.or.kr/report/viewer.do"
+PDF_URL = "https://dart.fss.or.kr/pdf/download/pdf.do"
+
+# viewer.do 요청에 필요한 목차 항목
+VIEWER_PARAMS = ("rcpNo", "dcmNo", "eleId", "offset", "length", "dtd")
+
+_TOC_PATTERN = re.compile(r"function makeToc\(\)\s*\{(.*?)\n\s*//js tree", re.DOTALL)
+_NODE_PATTERN = re.compile(r"var\s+(node\d+)\s*=\s*\{\s*\}|(node\d+)\['(\w+)'\]\s*=\s*\"([^\"]*)\"")
+_SPACES = re.compile(r"\s+")
+
+
+def parse_toc(page: str) -> list[dict]:
+    """공시 문서 페이지(main.do)의 makeToc 스크립트에서 목차를 추출합니다.
+
+    node1(장), node2(절) 등 하위 목차도 순서대로 포함하며, level은 노드 깊이입니다.
+
+    Returns:
+        [{"text", "rcpNo", "dcmNo", "eleId", "offset", "length", "dtd", "level", ...}]
+    """
+    match = _TOC_PATTERN.search(page)
+    code = match.group(1) if match else page
+
+    nodes: list[dict] = []
+    current: dict[str, dict] = {}
+    for match in _NODE_PATTERN.finditer(code):
+        if match.group(1):
+            node = current[match.group(1)] = {"level": int(match.group(1)[4:])}
+            nodes.append(node)
+            continue
+        name, field, value = match.group(2), match.group(3), match.group(4)
+        node = current.get(name)
+        if node is None or field in node:
+            # var 선언 없이 같은 변수를 다시 사용하는 경우 새 노드로 봅니다.
+            node = current[name] = {"level": int(name[4:])}
+            nodes.append(node)
+        node[field] = html.unescape(value)
+
+    return [node for node in nodes if node.get("eleId") and node.get("dcmNo")]
+
+
+def _normalize_title(text: str) -> str:
+    return _SPACES.sub("", text).lower()
+
+
+def match_sections(toc: list[dict], queries: list[str]) -> list[dict]:
+    """요청한 목차 항목을 찾습니다. (eleId, 제목 일치, 번호 접두어 "3.", 제목 일부 순)"""
+    titles = [(node, _normalize_title(node.get("text", ""))) for node in toc]
+    matched: dict[str, dict] = {}
+    for query in queries:
+        query = str(query).strip()
+        key = _normalize_title(query)
+        numbered = re.fullmatch(r"[\dIVX]+\.?", query, re.IGNORECASE) is not None
+        candidates = (
+            [node for node in toc if node["eleId"] == query]
+            or [node for node, title in titles if title == key]
+            or [node for node, title in titles if numbered and title.startswith(key.rstrip(".") + ".")]
+            or [node for node, title in titles if key and key in title]
+        )
+        for node in candidates:
+            matched.setdefault(node["eleId"], node)
+    return list(matched.values())
+
+
+def parse_section(page: str) -> dict:
+    """viewer.do 응답에서 표와 본문 텍스트를 추출합니다. (표 내용은 본문에서 제외)"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(page, "lxml")
+    for tag in soup(["script", "style"]):
+        tag.decompose()
+
+    tables = []
+    for table in soup.find_all("table"):
+        rows = []
+        for tr in table.find_all("tr"):
+            row = [_SPACES.sub(" ", cell.get_text(" ", strip=True)) for cell in tr.find_all(["td", "th"])]
+            if any(row):
+                rows.append(row)
+        if rows:
+            tables.append(rows)
+        table.decompose()
+
+    body = soup.body or soup
+    lines = [line for line in body.get_text("\n", strip=True).splitlines() if line.strip()]
+    return {"text": "\n".join(lines), "tables": tables}
+
+
+class DocumentViewer:
+    """공시 문서를 목차 단위로 조회합니다.
+
+    전체 문서를 내려받지 않고 목차(main.do)에서 찾은 항목만 viewer.do로 가져옵니다.
+    여러 항목은 동시에 조회합니다. 원본 페이지는 클라이언트의 DocumentStore에 (rcpNo, eleId)별로
+    저장하고, 파싱한 결과는 프로세스 내 LRU에만 둡니다.
+    공시 문서는 제출 후 바뀌지 않으므로 캐시 항목의 신선도는 확인하지 않습니다.
+    """
+
+    def __init__(self, client, cache, executor, flights, concurrency: int | None = None):
+        self.client = client
+        self.cache = cache
+        self.executor = executor
+        self.flights = flights
+        self.concurrency = concurrency or int(os.getenv("OPENDART_VIEWER_CONCURRENCY", "4"))
+        self._semaphore: asyncio.Semaphore | None = None
+        self._fetched = 0
+        self._cached = 0
+
+    @staticmethod
+    def _key(rcp_no: str, ele_id: str | None = None) -> str:
+        return f"viewer/{rcp_no}/toc" if ele_id is None else f"viewer/{rcp_no}/{ele_id}"
+
+    async def _page(self, url: str, params: dict, rcp_no: str, name: str, referer: str | None = None) -> str:
+        # DART 웹사이트는 API 한도와 별개이므로 동시 요청 수만 제한합니다.
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            self._fetched += 1
+            return await self.client.get_page(url, params=params, referer=referer, rcept_no=rcp_no, name=name)
+
+    async def _cached_or(self, key: str, fetch):
+        entry = self.cache.get_local(key)
+        if entry is not None:
+            self._cached += 1
+            return entry["data"]
+
+        async def load():
+            data = await fetch()
+            self.cache.put(key, data)
+            return data
+
+        return await self.flights.do(key, load)
+
+    async def toc(self, rcp_no: str) -> list[dict]:
+        """공시 문서의 목차를 반환합니다."""
+        rcp_no = rcp_no.strip()
+
+        async def fetch():
+            page = await self._page(MAIN_URL, {"rcpNo": rcp_no}, rcp_no, "main.html")
+            toc = parse_toc(page)
+            if not toc:
+                raise ValueError(f"공시 문서의 목차를 찾을 수 없습니다: {rcp_no}")
+            return toc
+
+        return await self._cached_or(self._key(rcp_no), fetch)
+
+    async def section(self, node: dict) -> dict:
+        """목차 항목 하나의 내용을 조회합니다."""
+        rcp_no, ele_id = node["rcpNo"], node["eleId"]
+
+        async def fetch():
+            params = {name: node[name] for name in VIEWER_PARAMS if name in node}
+            name = f"viewer/{node['dcmNo']}/{ele_id}.html"
+            page = await self._page(VIEWER_URL, params, rcp_no, name, referer=f"{MAIN_URL}?rcpNo={rcp_no}")
+            return await self.executor.run(parse_section, page)
+
+        content = await self._cached_or(self._key(rcp_no, ele_id), fetch)
+        return {"rcpNo": rcp_no, "eleId": ele_id, "title": node.get("text"), **content}
+
+    async def sections(self, rcp_no: str, queries: list[str]) -> list[dict]:
+        """요청한 목차 항목들을 동시에 조회합니다."""
+        toc = await self.toc(rcp_no)
+        nodes = match_sections(toc, queries)
+        if not nodes:
+            raise ValueError(f"목차에서 찾을 수 없습니다: {', '.join(map(str, queries))}")
+        return list(await asyncio.gather(*(self.section(node) for node in nodes)))
+
+    def stats(self) -> dict:
+        return {"fetched": self._fetched, "cached": self._cached}
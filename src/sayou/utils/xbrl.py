@@ -0,0 +1,289 @@
+import contextlib
+import io
+import logging
+import mmap
+import os
+import zipfile
+
+from typing import IO, Iterator
+
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+XBRLI = "http://www.xbrl.org/2003/instance"
+XBRLDI = "http://xbrl.org/2006/xbrldi"
+LINK = "http://www.xbrl.org/2003/linkbase"
+XLINK = "http://www.w3.org/1999/xlink"
+XSI_NIL = "{http://www.w3.org/2001/XMLSchema-instance}nil"
+LABEL_ROLE = "http://www.xbrl.org/2003/role/label"
+XML_LANG = "{http://www.w3.org/XML/1998/namespace}lang"
+
+FACT_COLUMNS = (
+    "concept",       # DART account_id 형식 (예: ifrs-full_Revenue)
+    "label",         # 표준 레이블 (패키지의 레이블 링크베이스, 없으면 fill_labels로 채운 DART 계정명, 그래도 없으면 None)
+    "context",
+    "period_start",  # 기간 시작일 (instant이면 None)
+    "period_end",    # 기간 종료일 또는 시점
+    "instant",
+    "dimensions",    # "축=멤버;..." (없으면 "")
+    "unit",
+    "decimals",
+    "value",         # 원문 값
+    "amount",        # 숫자 값 (숫자가 아니면 None)
+)
+
+
+class FactTable:
+    """XBRL 팩트의 열 지향 표 (열 이름 → 값 목록)
+
+    행마다 dict를 만들지 않고 열 목록으로 모아 두며, 필요할 때 DataFrame으로 바꿉니다.
+    """
+
+    def __init__(self, columns: dict[str, list] | None = None):
+        self.columns = columns if columns is not None else {name: [] for name in FACT_COLUMNS}
+
+    def __len__(self) -> int:
+        return len(self.columns["concept"])
+
+    def fill_labels(self, labels: dict[str, str]) -> int:
+        """레이블이 없는 팩트에 labels(개념 → 레이블)의 값을 채웁니다. 채운 팩트 수를 반환합니다.
+
+        패키지의 레이블 링크베이스에는 회사 확장 개념만 있는 경우가 많아
+        ifrs-full_*, dart_* 같은 표준 개념은 레이블이 비어 있습니다.
+        """
+        filled = 0
+        column = self.columns["label"]
+        for index, (concept, label) in enumerate(zip(self.columns["concept"], column)):
+            if label is None and concept in labels:
+                column[index] = labels[concept]
+                filled += 1
+        return filled
+
+    def rows(self) -> Iterator[dict]:
+        names = list(self.columns)
+        for values in zip(*(self.columns[name] for name in names)):
+            yield dict(zip(names, values))
+
+    def to_frame(self):
+        import pandas as pd
+
+        return pd.DataFrame(self.columns, columns=list(self.columns))
+
+
+class _MappedFile(io.RawIOBase):
+    """mmap을 zipfile이 읽을 수 있는 파일 객체로 감쌉니다. (Python 3.13 미만의 mmap에는 seekable()이 없음)"""
+
+    def __init__(self, buffer: mmap.mmap):
+        self._buffer = buffer
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        return self._buffer.read(size)
+
+    def readinto(self, target) -> int:
+        data = self._buffer.read(len(target))
+        target[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        self._buffer.seek(offset, whence)
+        return self._buffer.tell()
+
+    def tell(self) -> int:
+        return self._buffer.tell()
+
+
+@contextlib.contextmanager
+def open_package(source: bytes | bytearray | memoryview | str | os.PathLike) -> Iterator[zipfile.ZipFile]:
+    """ZIP 패키지를 엽니다. 경로는 메모리 매핑하고, bytes는 복사하지 않고 그대로 읽습니다.
+
+    디스크에 압축을 풀지 않으므로 메모리 파일 시스템(Cloud Run)에서도 추가 공간이 필요하지 않습니다.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            with zipfile.ZipFile(_MappedFile(buffer)) as package:
+                yield package
+        return
+    with zipfile.ZipFile(io.BytesIO(source)) as package:
+        yield package
+
+
+def iter_members(package: zipfile.ZipFile, suffixes: tuple[str, ...]) -> Iterator[tuple[str, IO[bytes]]]:
+    """이름이 suffixes로 끝나는 파일을 하나씩 스트림으로 엽니다. (압축은 읽는 만큼만 풉니다)"""
+    for info in package.infolist():
+        if info.is_dir() or not info.filename.lower().endswith(suffixes):
+            continue
+        with package.open(info) as stream:
+            yield info.filename, stream
+
+
+def _iter_top_level(stream: IO[bytes]) -> Iterator[etree._Element]:
+    """루트 바로 아래 요소를 하나씩 반환하고, 처리한 요소는 메모리에서 지웁니다."""
+    depth = 0
+    for event, element in etree.iterparse(stream, events=("start", "end"), huge_tree=True, remove_comments=True):
+        if event == "start":
+            depth += 1
+            continue
+        depth -= 1
+        if depth != 1:
+            continue
+        yield element
+        element.clear()
+        parent = element.getparent()
+        while element.getprevious() is not None:
+            del parent[0]
+
+
+def _local(tag: str) -> str:
+    return tag.rpartition("}")[2]
+
+
+def _concept(element: etree._Element) -> str:
+    prefix = element.prefix
+    local = _local(element.tag)
+    return f"{prefix}_{local}" if prefix else local
+
+
+def _parse_context(element: etree._Element) -> tuple:
+    """(period_start, period_end, instant, dimensions)"""
+    start = end = None
+    instant = False
+    dimensions = []
+    for child in element.iter():
+        name = _local(child.tag) if isinstance(child.tag, str) else ""
+        if name == "instant":
+            end, instant = (child.text or "").strip(), True
+        elif name == "startDate":
+            start = (child.text or "").strip()
+        elif name == "endDate":
+            end = (child.text or "").strip()
+        elif name in ("explicitMember", "typedMember"):
+            value = (child.text or "").strip() if name == "explicitMember" else "".join(child.itertext()).strip()
+            dimensions.append(f"{child.get('dimension')}={value}")
+    return start, end, instant, ";".join(sorted(dimensions))
+
+
+def _parse_unit(element: etree._Element) -> str:
+    measures = [(child.text or "").strip().rpartition(":")[2] for child in element.iter(f"{{{XBRLI}}}measure")]
+    if element.find(f"{{{XBRLI}}}divide") is not None and len(measures) == 2:
+        return f"{measures[0]}/{measures[1]}"
+    return "*".join(measures)
+
+
+def _amount(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def parse_instance(stream: IO[bytes], labels: dict[str, str] | None = None) -> FactTable:
+    """XBRL 인스턴스 문서를 점진적으로 파싱하여 팩트 표를 만듭니다."""
+    contexts: dict[str, tuple] = {}
+    units: dict[str, str] = {}
+    # 같은 태그가 반복되므로 개념 이름은 태그별로 한 번만 만듭니다.
+    names: dict[str, str] = {}
+    concepts, context_refs, unit_refs, decimals, values = [], [], [], [], []
+
+    for element in _iter_top_level(stream):
+        if not isinstance(element.tag, str):
+            continue
+        if element.tag == f"{{{XBRLI}}}context":
+            contexts[element.get("id")] = _parse_context(element)
+        elif element.tag == f"{{{XBRLI}}}unit":
+            units[element.get("id")] = _parse_unit(element)
+        elif element.get("contextRef") is not None:
+            concept = names.get(element.tag)
+            if concept is None:
+                concept = names[element.tag] = _concept(element)
+            concepts.append(concept)
+            context_refs.append(element.get("contextRef"))
+            unit_refs.append(element.get("unitRef"))
+            decimals.append(element.get("decimals"))
+            values.append(None if element.get(XSI_NIL) == "true" else (element.text or "").strip())
+
+    # 문맥과 단위는 문서 어디에나 올 수 있으므로 마지막에 연결합니다.
+    missing = (None, None, False, "")
+    periods = [contexts.get(ref, missing) for ref in context_refs]
+    labels = labels or {}
+    return FactTable({
+        "concept": concepts,
+        "label": [labels.get(concept) for concept in concepts],
+        "context": context_refs,
+        "period_start": [period[0] for period in periods],
+        "period_end": [period[1] for period in periods],
+        "instant": [period[2] for period in periods],
+        "dimensions": [period[3] for period in periods],
+        "unit": [units.get(ref) if ref else None for ref in unit_refs],
+        "decimals": decimals,
+        "value": values,
+        "amount": [_amount(value) for value in values],
+    })
+
+
+def parse_labels(stream: IO[bytes], lang: str = "ko") -> dict[str, str]:
+    """레이블 링크베이스에서 개념별 표준 레이블을 찾습니다."""
+    locators: dict[str, str] = {}
+    resources: dict[str, str] = {}
+    arcs: list[tuple[str, str]] = []
+    tags = (f"{{{LINK}}}loc", f"{{{LINK}}}label", f"{{{LINK}}}labelArc")
+    for _, element in etree.iterparse(stream, events=("end",), tag=tags, huge_tree=True):
+        name = _local(element.tag)
+        if name == "loc":
+            locators[element.get(f"{{{XLINK}}}label")] = element.get(f"{{{XLINK}}}href", "").rpartition("#")[2]
+        elif name == "label":
+            role = element.get(f"{{{XLINK}}}role", LABEL_ROLE)
+            element_lang = element.get(XML_LANG, lang)
+            if role == LABEL_ROLE and element_lang.startswith(lang):
+                resources[element.get(f"{{{XLINK}}}label")] = (element.text or "").strip()
+        else:
+            arcs.append((element.get(f"{{{XLINK}}}from"), element.get(f"{{{XLINK}}}to")))
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+
+    labels = {}
+    for source, target in arcs:
+        concept, text = locators.get(source), resources.get(target)
+        if concept and text:
+            labels.setdefault(concept, text)
+    return labels
+
+
+def statement_labels(records: list[dict]) -> dict[str, str]:
+    """DART 재무제표 조회 결과에서 표준 계정 ID별 계정명을 찾습니다. (fill_labels에 사용)"""
+    labels = {}
+    for record in records:
+        account_id, account_nm = record.get("account_id"), record.get("account_nm")
+        # 표준 계정을 사용하지 않은 행의 account_id는 "-표준계정코드 미사용-"입니다.
+        if account_id and account_nm and "_" in account_id and not account_id.startswith("-"):
+            labels.setdefault(account_id, account_nm.strip())
+    return labels
+
+
+def parse_package(source: bytes | bytearray | memoryview | str | os.PathLike, lang: str = "ko") -> FactTable:
+    """XBRL ZIP 패키지에서 팩트 표를 만듭니다.
+
+    레이블 링크베이스(*_lab-ko.xml)를 먼저 읽고, 인스턴스 문서(*.xbrl)를 스트리밍으로 파싱합니다.
+    인스턴스가 여러 개이면 하나의 표로 합칩니다.
+    """
+    with open_package(source) as package:
+        labels: dict[str, str] = {}
+        for _, stream in iter_members(package, (f"_lab-{lang}.xml",)):
+            labels.update(parse_labels(stream, lang))
+
+        tables = [parse_instance(stream, labels) for _, stream in iter_members(package, (".xbrl",))]
+
+    if not tables:
+        raise ValueError("XBRL 인스턴스 문서(.xbrl)가 없는 패키지입니다.")
+    if len(tables) == 1:
+        return tables[0]
+    return FactTable({name: [value for table in tables for value in table.columns[name]] for name in FACT_COLUMNS})
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+재무제표 결과 변환 벤치마크 (행 단위 vs 열 지향)
+
+단일회사 전체 재무제표 응답과 같은 형식의 데이터 클래스 목록을 만들어
+도구 결과(JSON)로 변환하는 시간을 비교합니다.
+
+- rows: 행마다 item.to_dict()를 호출하고 json.dumps로 직렬화 (기존 방식)
+- columnar: utils.columnar로 열 단위 변환 (금액 열은 int64)
+
+    python tests/bench_columnar.py --rows 5000 --runs 7
+"""
+
+import argparse
+import gc
+import json
+import random
+import statistics
+import sys
+import time
+
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SOURCE_DIR = ROOT / "src" / "sayou"
+sys.path.insert(0, str(SOURCE_DIR))
+
+
+def make_items(rows: int, seed: int = 0) -> list:
+    """fnlttSinglAcntAll 응답과 같은 형식의 SingleFinancialStatementData 목록을 만듭니다."""
+    from sayou.stock.opendart.models import SingleFinancialStatementData
+
+    rng = random.Random(seed)
+    statements = [("BS", "재무상태표"), ("IS", "손익계산서"), ("CIS", "포괄손익계산서"), ("CF", "현금흐름표"), ("SCE", "자본변동표")]
+
+    def amount():
+        value = rng.choice([None, "-", "", rng.randint(-10**14, 10**15)])
+        return f"{value:,}" if isinstance(value, int) else value
+
+    items = []
+    for index in range(rows):
+        sj_div, sj_nm = statements[index % len(statements)]
+        items.append(SingleFinancialStatementData(**{
+            "rcept_no": "20250311001085",
+            "reprt_code": "11011",
+            "bsns_year": "2024",
+            "corp_code": "00126380",
+            "sj_div": sj_div,
+            "sj_nm": sj_nm,
+            "account_id": f"ifrs-full_Account{index}",
+            "account_nm": f"계정과목 {index}",
+            "account_detail": "-",
+            "thstrm_nm": "제 56 기",
+            "thstrm_amount": amount(),
+            "thstrm_add_amount": amount(),
+            "frmtrm_nm": "제 55 기",
+            "frmtrm_amount": amount(),
+            "bfefrmtrm_nm": "제 54 기",
+            "bfefrmtrm_amount": amount(),
+            "ord": str(index + 1),
+            "currency": "KRW",
+        }))
+    return items
+
+
+def row_path(items: list) -> str:
+    records = [item.to_dict() for item in items]
+    return json.dumps(records, ensure_ascii=False)
+
+
+def columnar_records_path(items: list) -> str:
+    from utils.columnar import to_records
+
+    return json.dumps(to_records(items), ensure_ascii=False)
+
+
+def measure(func, items: list, runs: int) -> list[float]:
+    func(items)  # 준비 (import, 캐시)
+    results = []
+    for _ in range(runs):
+        gc.collect()
+        started = time.perf_counter()
+        func(items)
+        results.append(time.perf_counter() - started)
+    return results
+
+
+def summary(label: str, results: list[float], baseline: float | None = None):
+    median = statistics.median(results)
+    speedup = f", x{baseline / median:5.2f}" if baseline else ""
+    print(f"{label:<20} median {median * 1000:8.1f} ms, min {min(results) * 1000:8.1f} ms{speedup}")
+    return median
+
+
+def main():
+    parser = argparse.ArgumentParser(description="재무제표 결과 변환 벤치마크")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args()
+
+    try:
+        items = make_items(args.rows)
+    except ImportError as e:
+        print(f"sayou-stock이 필요합니다: {e}")
+        sys.exit(1)
+
+    print(f"{'='*60}")
+    print(f"재무제표 {args.rows}행 → 도구 결과/JSON 변환")
+    print('='*60)
+
+    baseline = summary("rows (to_dict)", measure(row_path, items, args.runs))
+    summary("columnar records", measure(columnar_records_path, items, args.runs), baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+OpenDart MCP 서버 cold start 벤치마크
+
+opendarts 모듈을 새 프로세스에서 import하는 데 걸리는 시간을 측정합니다.
+--baseline으로 git 리비전을 지정하면 해당 리비전의 src/sayou를 임시 디렉토리에
+풀어 같은 방식으로 측정하여 비교합니다.
+
+    python tests/bench_startup.py --runs 5 --baseline 62ddf24
+"""
+
+import argparse
+import io
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SOURCE_DIR = ROOT / "src" / "sayou"
+
+IMPORT_SNIPPET = """
+import time
+started = time.perf_counter()
+import opendarts
+print(time.perf_counter() - started)
+"""
+
+
+def measure_import(source_dir: Path, runs: int, timeout: float) -> list[float | None]:
+    """새 프로세스에서 opendarts import 시간을 runs회 측정합니다. 실패하면 None."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(source_dir)
+    results = []
+    for _ in range(runs):
+        try:
+            completed = subprocess.run(
+                [sys.executable, "-c", IMPORT_SNIPPET],
+                cwd=source_dir,
+                env=env,
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+            )
+        except subprocess.TimeoutExpired:
+            results.append(None)
+            continue
+        if completed.returncode != 0:
+            last_line = (completed.stderr.strip().splitlines() or ["?"])[-1]
+            print(f"  import 실패: {last_line}")
+            results.append(None)
+            continue
+        results.append(float(completed.stdout.strip().splitlines()[-1]))
+    return results
+
+
+def extract_revision(revision: str, destination: Path) -> Path:
+    """git 리비전의 src/sayou를 destination에 풉니다."""
+    archive = subprocess.run(
+        ["git", "archive", "--format=tar", revision, "src/sayou"],
+        cwd=ROOT,
+        capture_output=True,
+        check=True,
+    ).stdout
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        tar.extractall(destination)
+    return destination / "src" / "sayou"
+
+
+def summary(label: str, results: list[float | None]):
+    values = [value for value in results if value is not None]
+    failed = len(results) - len(values)
+    if not values:
+        print(f"{label:<10} 측정 실패 ({failed}/{len(results)}회 실패)")
+        return
+    print(
+        f"{label:<10} median {statistics.median(values) * 1000:8.1f} ms, "
+        f"min {min(values) * 1000:8.1f} ms, max {max(values) * 1000:8.1f} ms "
+        f"({failed}회 실패)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="opendarts import 시간 벤치마크")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--baseline", help="비교할 git 리비전 (예: 62ddf24)")
+    args = parser.parse_args()
+
+    print(f"{'='*60}")
+    print("opendarts import 시간 (새 프로세스)")
+    print('='*60)
+
+    current = measure_import(SOURCE_DIR, args.runs, args.timeout)
+    summary("current", current)
+
+    if args.baseline:
+        with tempfile.TemporaryDirectory() as tmp:
+            baseline_dir = extract_revision(args.baseline, Path(tmp))
+            baseline = measure_import(baseline_dir, args.runs, args.timeout)
+        summary(args.baseline, baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+AsyncOpenDartClient 동작 테스트 (정기보고서·재무정보 API 직접 호출, sayou-stock 모델 고정)
+
+    python -m pytest tests/tests_aio_client.py -q
+    python tests/tests_aio_client.py
+"""
+
+import asyncio
+import dataclasses
+import importlib.metadata
+import sys
+import threading
+
+from pathlib import Path
+
+import httpx
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "sayou"))
+
+from utils.aio_client import API_URL, ENDPOINTS, REPORT_CODES, SAYOU_STOCK_VERSION, AsyncOpenDartClient
+
+# ENDPOINTS의 메서드가 sayou-stock에서 사용하는 API 분류
+STATUSES = {
+    "dividends": ("ReportStatus", "DIVIDENDS"),
+    "director_compensation": ("ReportStatus", "DIRECTOR_COMPENSATION"),
+    "total_director_compensation": ("ReportStatus", "TOTAL_DIRECTOR_COMPENSATION"),
+    "top5_director_compensation": ("ReportStatus", "TOP5_DIRECTOR_COMPENSATION"),
+    "single_company_main_accounts": ("FinanceStatus", "SINGLE_COMPANY_MAIN_ACCOUNTS"),
+    "multi_company_main_accounts": ("FinanceStatus", "MULTI_COMPANY_MAIN_ACCOUNTS"),
+    "financial_statements": ("FinanceStatus", "SINGLE_COMPANY_FINANCIAL_STATEMENT"),
+    "single_company_key_financial_indicators": ("FinanceStatus", "SINGLE_COMPANY_KEY_FINANCIAL_INDICATOR"),
+    "multi_company_key_financial_indicators": ("FinanceStatus", "MULTI_COMPANY_KEY_FINANCIAL_INDICATOR"),
+}
+
+DIVIDENDS = {
+    "status": "000",
+    "message": "정상",
+    "list": [
+        {
+            "rcept_no": "20260515000001",
+            "corp_cls": "Y",
+            "corp_code": "00126380",
+            "corp_name": "삼성전자",
+            "se": "주당액면가액(원)",
+            "thstrm": "100",
+            "frmtrm": "100",
+            "lwfr": "100",
+            "stlm_dt": "2026-03-31",
+            # 모델에 없는 필드는 버립니다.
+            "new_field": "x",
+        }
+    ],
+}
+
+
+class Crawler:
+    """스레드에서 실행되는지 기록하는 가짜 OpenDartCrawler"""
+
+    def __init__(self):
+        self.calls = []
+
+    def reports(self, corp_code, year, quarter, api_no=-1):
+        self.calls.append((corp_code, year, quarter, api_no, threading.current_thread() is threading.main_thread()))
+        return ["report"]
+
+
+class Runtime:
+    limiter = None
+
+    def __init__(self):
+        self.crawler = Crawler()
+
+    def ensure_api_keys(self):
+        return ["test-key"]
+
+
+def make_client(handler) -> AsyncOpenDartClient:
+    client = AsyncOpenDartClient(Runtime())
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_pinned_sayou_stock_version():
+    # 모델과 엔드포인트를 확인한 버전이 설치되어 있고 pyproject.toml에도 고정되어 있어야 합니다.
+    assert importlib.metadata.version("sayou-stock") == SAYOU_STOCK_VERSION
+    assert f'"sayou-stock=={SAYOU_STOCK_VERSION}"' in (ROOT / "pyproject.toml").read_text(encoding="utf-8")
+
+
+def test_endpoints_match_sayou_stock():
+    models = pytest.importorskip("sayou.stock.opendart.models")
+    from sayou.stock.opendart.utils import quarters
+
+    assert set(STATUSES) == set(ENDPOINTS)
+    for method, (path, model_name, _) in ENDPOINTS.items():
+        status_class, member = STATUSES[method]
+        assert getattr(getattr(models, status_class), member).url == f"{API_URL}/{path}", method
+        names = {field.name for field in dataclasses.fields(getattr(models, model_name))}
+        assert {"rcept_no", "corp_code", "corp_name"} <= names, model_name
+    assert REPORT_CODES == {int(quarter): code for quarter, code in quarters.items()}
+
+
+def test_periodic_request_and_parsing():
+    pytest.importorskip("sayou.stock.opendart.models")
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=DIVIDENDS)
+
+    async def main():
+        client = make_client(handler)
+        items = await client.call("dividends", "00126380", year=2026, quarter=1)
+        await client.aclose()
+        return items
+
+    items = asyncio.run(main())
+    assert requests[0].url.path == "/api/alotMatter.json"
+    assert dict(requests[0].url.params) == {
+        "crtfc_key": "test-key",
+        "corp_code": "00126380",
+        "bsns_year": "2026",
+        "reprt_code": "11013",
+    }
+    assert type(items[0]).__name__ == "DividendsData"
+    assert (items[0].rcept_no, items[0].thstrm) == ("20260515000001", "100")
+
+
+def test_financial_statements_use_crawler_defaults():
+    pytest.importorskip("sayou.stock.opendart.models")
+    params = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        params.append(dict(request.url.params))
+        return httpx.Response(200, json={"status": "013", "message": "조회된 데이타가 없습니다."})
+
+    async def main():
+        client = make_client(handler)
+        assert await client.financial_statements("00126380", 2025, 4) == []
+        assert await client.call("single_company_key_financial_indicators", "00126380", 2025, 2) == []
+        await client.aclose()
+
+    asyncio.run(main())
+    assert (params[0]["fs_div"], params[0]["reprt_code"]) == ("OFS", "11011")
+    assert (params[1]["idx_cl_code"], params[1]["reprt_code"]) == ("M210000", "11012")
+
+
+def test_other_methods_run_crawler_in_thread():
+    async def main():
+        client = make_client(lambda request: httpx.Response(500))
+        result = await client.reports("00126380", 2025, 4, 2)
+        await client.aclose()
+        return client, result
+
+    client, result = asyncio.run(main())
+    assert result == ["report"]
+    assert client.runtime.crawler.calls == [("00126380", 2025, 4, 2, False)]
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: ok")
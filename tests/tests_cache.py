@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+ResponseCache 동작 테스트 (LRU, 신선도, GCS 적재, 카운터)
+
+    python -m pytest tests/tests_cache.py -q
+    python tests/tests_cache.py
+"""
+
+import json
+import sys
+import threading
+import time
+
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "sayou"))
+
+from utils.cache import SCHEMA_VERSION, ResponseCache
+
+
+class GCS:
+    """GCSManager의 파일 메서드만 가진 메모리 저장소"""
+
+    def __init__(self):
+        self.files: dict[str, str] = {}
+
+    def read_file(self, blob_name: str) -> str | None:
+        return self.files.get(blob_name)
+
+    def upload_file(self, content, blob_name: str, content_type: str | None = None) -> bool:
+        self.files[blob_name] = content
+        return True
+
+    def delete(self, blob_name: str) -> bool:
+        return self.files.pop(blob_name, None) is not None
+
+
+def make_cache(**kwargs) -> tuple[ResponseCache, GCS]:
+    cache = ResponseCache(use_gcs=True, prefix="test/cache", **kwargs)
+    cache._gcs = GCS()
+    return cache, cache._gcs
+
+
+def test_zero_ttl_is_respected():
+    cache, _ = make_cache(fresh_ttl=0, max_stale=3600)
+    assert cache.fresh_ttl == 0
+    entry = cache.put("dividends/00126380/2025Q4", [{"rcept_no": "1"}])
+    # fresh_ttl=0이면 저장하자마자 오래된 항목입니다.
+    assert not cache.is_fresh(entry)
+    assert cache.get("dividends/00126380/2025Q4") is entry
+    assert cache.stats()["stale_hits"] == 1
+
+
+def test_remote_entries_are_versioned_and_loaded():
+    cache, gcs = make_cache()
+    key = cache.key("financial_statements", " 00126380 ", 2025, 4)
+    entry = cache.put(key, [{"thstrm_amount": 1000}])
+    assert cache.put_remote(key, entry)
+    assert list(gcs.files) == [f"test/cache/v{SCHEMA_VERSION}/financial_statements/00126380/2025Q4.json"]
+
+    # 다른 인스턴스는 GCS에서 읽어 LRU에 적재합니다.
+    other, _ = make_cache()
+    other._gcs = gcs
+    assert other.get(key)["data"] == [{"thstrm_amount": 1000}]
+    assert other.get(key)["data"] == [{"thstrm_amount": 1000}]
+    stats = other.stats()
+    assert (stats["remote_hits"], stats["memory_hits"], stats["misses"]) == (1, 1, 0)
+
+    # 버전이 없는 이전 경로의 항목은 읽지 않습니다.
+    gcs.files["test/cache/dividends/00126380/2025Q4.json"] = json.dumps({"stored_at": time.time(), "data": [1]})
+    assert other.get(cache.key("dividends", "00126380", 2025, 4)) is None
+    assert other.stats()["misses"] == 1
+
+
+def test_expired_entries_are_not_used():
+    cache, gcs = make_cache(max_stale=60)
+    key = cache.key("dividends", "00126380", 2025, 4)
+    gcs.files[cache._blob_name(key)] = json.dumps({"stored_at": time.time() - 120, "data": [1]})
+    assert cache.get(key) is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_evicts_oldest():
+    cache, _ = make_cache(maxsize=2)
+    for index in range(3):
+        cache.put(f"key{index}", [index])
+    assert cache.get_local("key0") is None
+    assert cache.get_local("key2")["data"] == [2]
+    assert cache.invalidate("key2") and not cache.invalidate("key2")
+    assert cache.stats()["invalidated"] == 1
+
+
+def test_counters_are_consistent_across_threads():
+    cache, _ = make_cache()
+    cache.put("local", [1])
+    threads_count, lookups = 8, 500
+
+    def worker():
+        for _ in range(lookups):
+            cache.get_local("local")
+            cache.get_remote("missing")
+
+    threads = [threading.Thread(target=worker) for _ in range(threads_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = cache.stats()
+    assert stats["memory_hits"] == threads_count * lookups
+    assert stats["misses"] == threads_count * lookups
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: ok")
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+ChangeFeed 동작 테스트 (워터마크, 캐시 무효화)
+
+    python -m pytest tests/tests_changefeed.py -q
+    python tests/tests_changefeed.py
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "sayou"))
+
+from utils.cache import ResponseCache
+from utils.changefeed import PERIODIC_REPORTS, ChangeFeed, report_period
+from utils.filing_index import KST, FilingIndex
+
+TODAY = datetime.now(KST).strftime("%Y%m%d")
+
+
+class Client:
+    """공시검색(list.json) 응답을 최신순으로 돌려주는 가짜 클라이언트"""
+
+    def __init__(self, disclosures: list[dict]):
+        self.disclosures = disclosures
+        self.requests: list[dict] = []
+
+    async def get_json(self, url: str, params: dict) -> dict:
+        self.requests.append(params)
+        items = [
+            item for item in self.disclosures
+            if params.get("pblntf_ty") is None or item.get("kind", "A") == params["pblntf_ty"]
+        ]
+        items.sort(key=lambda item: item["rcept_no"], reverse=True)
+        page_count = params["page_count"]
+        total_page = max(1, -(-len(items) // page_count))
+        start = (params["page_no"] - 1) * page_count
+        return {
+            "status": "000",
+            "total_page": total_page,
+            "total_count": len(items),
+            "list": items[start:start + page_count],
+        }
+
+
+class Executor:
+    """작업자 풀 대신 바로 실행합니다."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def run(self, func, *args):
+        self.calls.append(func.__name__)
+        return func(*args)
+
+    def submit(self, func, *args):
+        return func(*args)
+
+
+class Cache(ResponseCache):
+    """GCS 삭제 요청을 기록하는 캐시"""
+
+    def __init__(self):
+        super().__init__(use_gcs=False)
+        self.deleted: list[str] = []
+
+    def delete_remote(self, key: str) -> bool:
+        self.deleted.append(key)
+        return True
+
+
+def disclosure(rcept_no: str, corp_code: str, report_nm: str, kind: str = "A") -> dict:
+    return {"rcept_no": rcept_no, "rcept_dt": rcept_no[:8], "corp_code": corp_code, "report_nm": report_nm, "kind": kind}
+
+
+def make_feed(client: Client, directory: str) -> tuple[ChangeFeed, Cache, FilingIndex]:
+    cache = Cache()
+    filing_index = FilingIndex(f"{directory}/filing_index.json")
+    feed = ChangeFeed(client, cache, filing_index, interval=1, filename=f"{directory}/changefeed.json", prefetch=False)
+    return feed, cache, filing_index
+
+
+def test_report_period():
+    assert report_period("사업보고서 (2025.12)") == (2025, 4)
+    assert report_period("[기재정정]반기보고서 (2026.06)") == (2026, 2)
+    assert report_period("분기보고서 (2026.03)") == (2026, 1)
+    assert report_period("분기보고서 (2026.09)") == (2026, 3)
+    assert report_period("주요사항보고서(유상증자결정)") is None
+
+
+def test_first_poll_records_watermark_only():
+    async def main():
+        with tempfile.TemporaryDirectory() as directory:
+            client = Client([disclosure(f"{TODAY}000010", "00126380", "분기보고서 (2026.09)")])
+            feed, cache, _ = make_feed(client, directory)
+            assert await feed.poll(Executor()) == []
+            assert feed.watermark == f"{TODAY}000010"
+            assert cache.deleted == []
+
+            # 저장한 워터마크를 다시 읽습니다.
+            feed, _, _ = make_feed(client, directory)
+            assert feed.watermark == f"{TODAY}000010"
+            assert sorted(os.listdir(directory)) == ["changefeed.json"]
+
+    asyncio.run(main())
+
+
+def test_poll_invalidates_new_periodic_reports():
+    async def main():
+        with tempfile.TemporaryDirectory() as directory:
+            client = Client([disclosure(f"{TODAY}000010", "00126380", "분기보고서 (2026.09)")])
+            feed, cache, filing_index = make_feed(client, directory)
+            await feed.poll(Executor())
+
+            key = cache.key("financial_statements", "00164779", 2026, 3)
+            cache.put(key, [{"rcept_no": "1"}])
+            filing_index.mark_filed("00164779", "financial_statements", 2026, 3, "1")
+            filing_index.mark_not_filed("00164779", "dividends", 2026, 3)
+
+            client.disclosures.append(disclosure(f"{TODAY}000020", "00164779", "분기보고서 (2026.09)"))
+            executor = Executor()
+            changes = await feed.poll(executor)
+
+            assert {change.report for change in changes} == {"financial_statements", "dividends"}
+            assert cache.get_local(key) is None
+            assert filing_index.status("00164779", "financial_statements", 2026, 3) is None
+            # GCS 항목은 이 인스턴스가 조회한 적이 없어도 모든 보고서 유형의 키로 지웁니다.
+            assert sorted(cache.deleted) == sorted(cache.key(report, "00164779", 2026, 3) for report in PERIODIC_REPORTS)
+            assert executor.calls == ["delete_remote"] * len(PERIODIC_REPORTS) + ["save"]
+            assert feed.watermark == f"{TODAY}000020"
+
+            # 같은 공시는 다시 처리하지 않습니다.
+            assert await feed.poll(Executor()) == []
+
+    asyncio.run(main())
+
+
+def test_exchange_filings_do_not_hide_periodic_reports():
+    async def main():
+        with tempfile.TemporaryDirectory() as directory:
+            client = Client([disclosure(f"{TODAY}000010", "00126380", "분기보고서 (2026.09)")])
+            feed, cache, filing_index = make_feed(client, directory)
+            await feed.poll(Executor())
+
+            # 거래소 공시의 접수번호(YYYYMMDD80xxxx)는 같은 날 DART 공시보다 큽니다.
+            client.disclosures.append(disclosure(f"{TODAY}800076", "00126380", "영업(잠정)실적(공정공시)", kind="I"))
+            await feed.poll(Executor())
+            assert all(params.get("pblntf_ty") == "A" for params in client.requests)
+            assert feed.watermark == f"{TODAY}000010"
+
+            filing_index.mark_filed("00164779", "financial_statements", 2026, 3, "1")
+            client.disclosures.append(disclosure(f"{TODAY}000030", "00164779", "분기보고서 (2026.09)"))
+            changes = await feed.poll(Executor())
+            assert [change.report for change in changes] == ["financial_statements"]
+
+    asyncio.run(main())
+
+
+def test_exchange_watermark_is_reset_on_load():
+    with tempfile.TemporaryDirectory() as directory:
+        Path(f"{directory}/changefeed.json").write_text(f'{{"watermark": "{TODAY}800076"}}')
+        feed, _, _ = make_feed(Client([]), directory)
+        assert feed.watermark == f"{TODAY}000000"
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: ok")
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+DART API 키 조회 테스트 (환경 변수, 키 파일, 여러 키)
+
+    python -m pytest tests/tests_config.py -q
+    python tests/tests_config.py
+"""
+
+import os
+import sys
+import tempfile
+
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "sayou"))
+
+from utils.config import resolve_api_key, resolve_api_keys
+
+NAMES = ("DART_API_KEY", "DART_API_KEY_FILE", "DART_API_KEYS")
+
+
+def with_env(values: dict, func):
+    """values로 환경 변수를 바꿔 func를 실행하고 원래대로 돌립니다."""
+    saved = {name: os.environ.pop(name, None) for name in NAMES}
+    os.environ.update(values)
+    try:
+        return func()
+    finally:
+        for name in NAMES:
+            os.environ.pop(name, None)
+            if saved[name] is not None:
+                os.environ[name] = saved[name]
+
+
+def test_key_file_does_not_touch_environment():
+    with tempfile.TemporaryDirectory() as directory:
+        key_file = f"{directory}/dart_api_key"
+        Path(key_file).write_text("file-key\n", encoding="utf-8")
+
+        def check():
+            assert resolve_api_key() == "file-key"
+            # 찾은 키를 환경 변수에 쓰지 않습니다.
+            assert "DART_API_KEY" not in os.environ
+
+        with_env({"DART_API_KEY_FILE": key_file}, check)
+
+
+def test_environment_key_comes_first():
+    with tempfile.TemporaryDirectory() as directory:
+        key_file = f"{directory}/dart_api_key"
+        Path(key_file).write_text("file-key", encoding="utf-8")
+        assert with_env({"DART_API_KEY": "env-key", "DART_API_KEY_FILE": key_file}, resolve_api_key) == "env-key"
+
+
+def test_multiple_keys_are_split():
+    assert with_env({"DART_API_KEYS": "key-a, key-b\nkey-c"}, resolve_api_keys) == ["key-a", "key-b", "key-c"]
+    assert with_env({"DART_API_KEY": "key-a,key-b"}, resolve_api_keys) == ["key-a", "key-b"]
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: ok")
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+기업코드 조회 테스트 (CorpCodeIndex, CorpCodeSnapshot의 종목 코드·기업명·유사 기업명 검색, 스냅샷 형식)
+
+    python -m pytest tests/tests_corp_index.py -q
+    python tests/tests_corp_index.py
+"""
+
+import os
+import sys
+import tempfile
+
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "sayou"))
+
+from utils.corp_index import AmbiguousCorpError, CorpCodeIndex
+from utils.corp_snapshot import CorpCodeSnapshot, SnapshotError, write_snapshot
+
+RECORDS = [
+    {"corp_code": "00126380", "corp_name": "삼성전자", "corp_eng_name": "SAMSUNG ELECTRONICS CO,.LTD", "stock_code": "005930", "modify_date": "20250101"},
+    {"corp_code": "00126371", "corp_name": "삼성전기", "corp_eng_name": "SAMSUNG ELECTRO-MECHANICS CO., LTD.", "stock_code": "009150", "modify_date": "20250101"},
+    {"corp_code": "01133217", "corp_name": "카카오뱅크", "corp_eng_name": "KakaoBank Corp.", "stock_code": "323410", "modify_date": "20250101"},
+    {"corp_code": "01244601", "corp_name": "카카오페이", "corp_eng_name": "KakaoPay Corp.", "stock_code": "377300", "modify_date": "20250101"},
+    {"corp_code": "00434003", "corp_name": "다코", "corp_eng_name": "Daco corporation", "stock_code": "", "modify_date": "20170630"},
+]
+
+
+def indexes():
+    """메모리 인덱스와 스냅샷에 같은 검사를 실행합니다."""
+    directory = tempfile.TemporaryDirectory()
+    filename = f"{directory.name}/corpcode.idx"
+    write_snapshot(RECORDS, filename)
+    return directory, [CorpCodeIndex(RECORDS), CorpCodeSnapshot(filename)]
+
+
+def test_exact_lookups():
+    directory, corp_indexes = indexes()
+    with directory:
+        for corp_index in corp_indexes:
+            assert corp_index.resolve("005930") == "00126380"
+            assert corp_index.resolve("005930.KS") == "00126380"
+            assert corp_index.resolve("00126371") == "00126371"
+            assert corp_index.resolve("(주)삼성전자") == "00126380"
+            assert corp_index.resolve("kakaopay") == "01244601"
+            # 비상장 기업은 listed_only=False일 때만 이름으로 찾습니다.
+            assert corp_index.resolve("다코") is None
+            assert corp_index.resolve("다코", listed_only=False) == "00434003"
+
+
+def test_clear_fuzzy_match_is_used():
+    directory, corp_indexes = indexes()
+    with directory:
+        for corp_index in corp_indexes:
+            assert corp_index.resolve("카카오뱅ㅋ") == "01133217"
+            assert corp_index.resolve("삼성전자기") == "00126380"
+
+
+def test_fuzzy_search_is_skipped_when_disabled():
+    directory, corp_indexes = indexes()
+    with directory:
+        for corp_index in corp_indexes:
+            assert corp_index.resolve("카카오뱅ㅋ", fuzzy=False) is None
+            assert corp_index._trigrams is None
+
+
+def test_ambiguous_fuzzy_match_raises_with_candidates():
+    directory, corp_indexes = indexes()
+    with directory:
+        for corp_index in corp_indexes:
+            # 삼성전자와 삼성전기의 점수가 같으므로 어느 쪽도 고르지 않습니다.
+            with pytest.raises(AmbiguousCorpError) as error:
+                corp_index.resolve("삼성전X")
+            assert {candidate["corp_code"] for candidate in error.value.candidates} == {"00126380", "00126371"}
+            assert "삼성전자(005930)" in str(error.value)
+            assert isinstance(error.value, ValueError)
+
+            assert corp_index.resolve("완전히다른이름") is None
+
+
+def test_snapshot_round_trip():
+    with tempfile.TemporaryDirectory() as directory:
+        filename = f"{directory}/corpcode.idx"
+        # 빈 corp_code는 버리고, 문자열의 앞뒤 공백은 지웁니다.
+        assert write_snapshot(RECORDS + [{"corp_code": " ", "corp_name": "없음"}], filename) == len(RECORDS)
+        snapshot = CorpCodeSnapshot(filename)
+        assert len(snapshot) == len(RECORDS)
+        assert list(snapshot.records()) == sorted(RECORDS, key=lambda record: record["corp_code"])
+        assert snapshot.get("00434003") == RECORDS[-1]
+        assert snapshot.get("99999999") is None
+        assert snapshot.stats()["listed"] == 4
+        assert not snapshot.changed()
+
+        # 다시 쓰면 새 파일로 교체되고, 임시 파일은 남지 않습니다.
+        write_snapshot(RECORDS[:1], filename)
+        assert snapshot.changed()
+        assert os.listdir(directory) == ["corpcode.idx"]
+        assert len(CorpCodeSnapshot(filename)) == 1
+
+
+def test_snapshot_rejects_other_formats():
+    with tempfile.TemporaryDirectory() as directory:
+        filename = f"{directory}/corpcode.idx"
+        with pytest.raises(SnapshotError):
+            CorpCodeSnapshot(filename)
+
+        write_snapshot(RECORDS, filename)
+        data = bytearray(Path(filename).read_bytes())
+        # 버전이 다르거나 잘린 파일은 열지 않습니다.
+        Path(filename).write_bytes(bytes(data[:8]) + b"\x09\x00" + bytes(data[10:]))
+        with pytest.raises(SnapshotError):
+            CorpCodeSnapshot(filename)
+        Path(filename).write_bytes(bytes(data[:-1]))
+        with pytest.raises(SnapshotError):
+            CorpCodeSnapshot(filename)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: ok")
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+CorpCodeRefresher 동작 테스트 (기업코드 목록 비교와 스냅샷 교체)
+
+    python -m pytest tests/tests_corp_refresh.py -q
+    python tests/tests_corp_refresh.py
+"""
+
+import io
+import sys
+import tempfile
+import zipfile
+
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "sayou"))
+
+from utils.corp_refresh import CorpCodeRefresher, diff_corp_codes
+from utils.corp_snapshot import CorpCodeSnapshot, write_snapshot
+
+RECORDS = [
+    {"corp_code": "00126380", "corp_name": "삼성전자", "corp_eng_name": "SAMSUNG ELECTRONICS CO,.LTD", "stock_code": "005930", "modify_date": "20250101"},
+    {"corp_code": "00164779", "corp_name": "에스케이하이닉스", "corp_eng_name": "SK hynix Inc.", "stock_code": "000660", "modify_date": "20250101"},
+    # 비상장 기업도 공시를 냅니다.
+    {"corp_code": "00434003", "corp_name": "다코", "corp_eng_name": "Daco corporation", "stock_code": "", "modify_date": "20170630"},
+    {"corp_code": "00430964", "corp_name": "굿앤엘에스", "corp_eng_name": "Good & LS Co.,Ltd.", "stock_code": "", "modify_date": "20170630"},
+]
+
+
+def corp_code_zip(records: list[dict]) -> bytes:
+    """DART corpCode.xml 응답과 같은 형식의 ZIP을 만듭니다."""
+    items = "".join(
+        "<list>" + "".join(f"<{name}>{escape(value)}</{name}>" for name, value in record.items()) + "</list>"
+        for record in records
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("CORPCODE.xml", f'<?xml version="1.0" encoding="UTF-8"?><result>{items}</result>')
+    return buffer.getvalue()
+
+
+class Runtime:
+    """스냅샷 파일과 인덱스 참조만 가진 가짜 런타임"""
+
+    def __init__(self, snapshot_filename: str):
+        self.snapshot_filename = snapshot_filename
+        self.corp_index = CorpCodeSnapshot(snapshot_filename)
+
+    def replace_corp_index(self, corp_index):
+        self.corp_index = corp_index
+
+
+class Refresher(CorpCodeRefresher):
+    def __init__(self, runtime, records: list[dict]):
+        super().__init__(runtime, interval=3600)
+        self.content = corp_code_zip(records)
+
+    def download(self) -> bytes:
+        return self.content
+
+
+def make_runtime(directory: str, records: list[dict]) -> Runtime:
+    filename = f"{directory}/corpcode.idx"
+    write_snapshot(records, filename)
+    return Runtime(filename)
+
+
+def test_unchanged_list_keeps_unlisted_companies():
+    with tempfile.TemporaryDirectory() as directory:
+        runtime = make_runtime(directory, RECORDS)
+        diff = Refresher(runtime, RECORDS).refresh(force=True)
+        assert diff is not None and not diff
+        assert runtime.corp_index.get("00434003")["corp_name"] == "다코"
+        assert runtime.corp_index.resolve("굿앤엘에스", listed_only=False) == "00430964"
+
+
+def test_refresh_applies_changes_to_full_list():
+    with tempfile.TemporaryDirectory() as directory:
+        runtime = make_runtime(directory, RECORDS)
+        records = [dict(record) for record in RECORDS[1:]]
+        # 상장 폐지로 종목코드가 없어져도 기업코드는 남습니다.
+        records[0].update(stock_code="", modify_date="20260101")
+        records.append({"corp_code": "01234567", "corp_name": "새회사", "corp_eng_name": "", "stock_code": "", "modify_date": "20261001"})
+
+        diff = Refresher(runtime, records).refresh(force=True)
+        assert diff.summary() == {"added": 1, "modified": 1, "removed": 1}
+        assert diff.removed == ["00126380"]
+
+        corp_index = runtime.corp_index
+        assert len(corp_index) == 4
+        assert corp_index.get("00164779")["stock_code"] == ""
+        assert corp_index.get("00434003") is not None
+        assert corp_index.get("01234567")["corp_name"] == "새회사"
+        # 교체된 스냅샷 파일을 다시 열어도 같은 내용입니다.
+        assert [record["corp_code"] for record in CorpCodeSnapshot(runtime.snapshot_filename).records()] == [
+            "00164779", "00430964", "00434003", "01234567",
+        ]
+
+
+def test_recent_snapshot_is_not_downloaded_again():
+    with tempfile.TemporaryDirectory() as directory:
+        runtime = make_runtime(directory, RECORDS)
+        refresher = Refresher(runtime, RECORDS[:1])
+        assert refresher.refresh() is None
+        assert len(runtime.corp_index) == 4
+
+
+def test_diff_detects_modified_fields():
+    with tempfile.TemporaryDirectory() as directory:
+        current = make_runtime(directory, RECORDS).corp_index
+        renamed = [dict(record) for record in RECORDS]
+        renamed[0]["corp_name"] = "삼성전자(주)"
+        diff = diff_corp_codes(current, iter(renamed))
+        assert [record["corp_code"] for record in diff.modified] == ["00126380"]
+        assert not diff.added and not diff.removed
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: ok")
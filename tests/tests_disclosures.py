@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+DisclosureStream 동작 테스트 (페이지 조회, 요청 페이지 한도와 cursor)
+
+    python -m pytest tests/tests_disclosures.py -q
+    python tests/tests_disclosures.py
+"""
+
+import asyncio
+import sys
+
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "sayou"))
+
+from utils.disclosures import DisclosureStream, date_windows, decode_cursor, search_disclosures
+
+
+class Client:
+    """공시검색(list.json) 응답을 흉내 내는 가짜 클라이언트 (요청 파라미터를 기록합니다)"""
+
+    def __init__(self, total: int):
+        # 최신 공시부터 접수번호가 작아집니다.
+        self.rows = [
+            {"rcept_no": f"20260930{total - index:06d}", "rcept_dt": "20260930", "corp_code": "00126380", "report_nm": f"보고서 {index}"}
+            for index in range(total)
+        ]
+        self.requests: list[dict] = []
+
+    async def get_json(self, url: str, params: dict) -> dict:
+        self.requests.append(params)
+        await asyncio.sleep(0)
+        page, count = params["page_no"], params["page_count"]
+        if not self.rows:
+            return {"status": "013", "message": "조회된 데이타가 없습니다."}
+        return {
+            "status": "000",
+            "total_count": len(self.rows),
+            "total_page": (len(self.rows) + count - 1) // count,
+            "list": self.rows[(page - 1) * count:page * count],
+        }
+
+
+def stream(client, **kwargs) -> DisclosureStream:
+    pytest.importorskip("sayou.stock.opendart.models")
+    return DisclosureStream(client, corp_code="00126380", start="2026-01-01", end="2026-09-30", **kwargs)
+
+
+def test_limit_stops_requesting_pages():
+    async def main():
+        client = Client(250)
+        results = await search_disclosures(stream(client, page_count=100, prefetch=False), limit=120)
+        assert len(results) == 120
+        assert [params["page_no"] for params in client.requests] == [1, 2]
+
+    asyncio.run(main())
+
+
+def test_max_pages_returns_cursor_and_resumes():
+    async def main():
+        client = Client(45)
+        first = stream(client, page_count=10, max_pages=2)
+        results = await search_disclosures(first, limit=100)
+        # 두 페이지를 모두 반환하고 세 번째 페이지는 요청하지 않습니다.
+        assert len(results) == 20
+        assert len(client.requests) == 2
+        assert first.cursor == "20260101-20260930-3"
+
+        rest = []
+        cursor = first.cursor
+        while cursor:
+            resumed = stream(client, page_count=10, max_pages=2, cursor=cursor)
+            rest += await search_disclosures(resumed, limit=100)
+            cursor = resumed.cursor
+        # 이어서 조회한 결과는 빠지거나 겹치지 않습니다.
+        assert [item.rcept_no for item in results + rest] == [row["rcept_no"] for row in client.rows]
+        assert len(client.requests) == 5
+
+    asyncio.run(main())
+
+
+def test_prefetch_counts_against_budget():
+    async def main():
+        client = Client(100)
+        first = stream(client, page_count=10, max_pages=3)
+        results = await search_disclosures(first, limit=1000)
+        assert len(results) == 30
+        assert len(client.requests) == 3
+        assert decode_cursor(first.cursor) == (date(2026, 1, 1), date(2026, 9, 30), 4)
+
+    asyncio.run(main())
+
+
+def test_no_cursor_when_results_complete():
+    async def main():
+        client = Client(15)
+        first = stream(client, page_count=10, max_pages=2)
+        assert len(await search_disclosures(first, limit=100)) == 15
+        assert first.cursor is None
+
+    asyncio.run(main())
+
+
+def test_market_search_cursor_continues_older_windows():
+    async def main():
+        client = Client(5)
+        pytest.importorskip("sayou.stock.opendart.models")
+        first = DisclosureStream(client, start="2026-01-01", end="2026-09-30", page_count=10, max_pages=1)
+        await search_disclosures(first, limit=100)
+        windows = date_windows(date(2026, 1, 1), date(2026, 9, 30), 90)
+        # 첫 구간을 다 읽은 뒤 다음 구간의 첫 페이지부터 이어서 조회합니다.
+        assert first.cursor == f"20260101-{windows[1][1]:%Y%m%d}-1"
+
+        resumed = DisclosureStream(client, cursor=first.cursor, page_count=10, max_pages=1)
+        await search_disclosures(resumed, limit=100)
+        assert client.requests[-1]["end_de"] == f"{windows[1][1]:%Y%m%d}"
+        assert client.requests[-1]["bgn_de"] == f"{windows[1][0]:%Y%m%d}"
+
+    asyncio.run(main())
+
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(ValueError):
+        DisclosureStream(Client(0), cursor="2026-01-01")
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: ok")
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+DocumentStore 동작 테스트 (내용 주소 저장, 참조와 객체의 일관성)
+
+    python -m pytest tests/tests_docstore.py -q
+    python tests/tests_docstore.py
+"""
+
+import asyncio
+import hashlib
+import sys
+import tempfile
+
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "sayou"))
+
+from utils.docstore import DocumentStore
+
+
+class GCS:
+    """GCSManager의 객체 저장 메서드만 가진 메모리 저장소 (failing 경로의 쓰기는 실패합니다)"""
+
+    def __init__(self):
+        self.blobs: dict[str, bytes] = {}
+        self.failing: set[str] = set()
+
+    def read_bytes(self, blob_name: str) -> bytes | None:
+        return self.blobs.get(blob_name)
+
+    def upload_if_generation(self, content, blob_name: str, generation: int, content_type: str = "application/json") -> bool:
+        if any(part in blob_name for part in self.failing):
+            return False
+        if generation == 0 and blob_name in self.blobs:
+            return False
+        self.blobs[blob_name] = content.encode("utf-8") if isinstance(content, str) else bytes(content)
+        return True
+
+    def exists(self, blob_name: str) -> bool | None:
+        return blob_name in self.blobs
+
+
+class Executor:
+    """작업자 풀 대신 바로 실행합니다."""
+
+    async def run(self, func, *args):
+        return func(*args)
+
+    def submit(self, func, *args):
+        return func(*args)
+
+
+def make_store(directory: str, gcs: GCS, **kwargs) -> DocumentStore:
+    store = DocumentStore(root=directory, use_gcs=True, prefix="docstore", executor=Executor(), **kwargs)
+    store._gcs = gcs
+    return store
+
+
+def test_same_content_is_stored_once():
+    with tempfile.TemporaryDirectory() as directory:
+        gcs = GCS()
+        store = make_store(directory, gcs)
+        first = store.put("20260101000001", "document.zip", b"PK\x03\x04 same content")
+        second = store.put("20260101000002", "document.zip", b"PK\x03\x04 same content")
+        assert first["sha256"] == second["sha256"] == hashlib.sha256(b"PK\x03\x04 same content").hexdigest()
+        # 압축 형식은 다시 압축하지 않습니다.
+        assert first["encoding"] == "identity"
+
+        objects = [name for name in gcs.blobs if "/objects/" in name]
+        refs = sorted(name for name in gcs.blobs if "/refs/" in name)
+        assert len(objects) == 1
+        assert refs == ["docstore/refs/20260101000001/document.zip.json", "docstore/refs/20260101000002/document.zip.json"]
+        assert store.stats()["deduplicated"] == 2
+
+
+def test_remote_read_restores_local_copy():
+    with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+        gcs = GCS()
+        make_store(first, gcs).put("20260101000001", "main.html", "<html>본문</html>".encode("utf-8"), "text/html")
+
+        # 다른 인스턴스는 GCS에서 읽어 로컬에 적재합니다.
+        store = make_store(second, gcs)
+        assert store.get("20260101000001", "main.html") == "<html>본문</html>".encode("utf-8")
+        assert store.get("20260101000001", "main.html") is not None
+        assert (store.stats()["remote_hits"], store.stats()["local_hits"]) == (1, 1)
+
+
+def test_ref_is_not_written_when_object_upload_fails():
+    with tempfile.TemporaryDirectory() as directory:
+        gcs = GCS()
+        gcs.failing.add("/objects/")
+        store = make_store(directory, gcs)
+        ref, blob = store.put_local("20260101000001", "main.html", b"<html></html>")
+        assert store.put_remote("20260101000001", "main.html", ref, blob) is False
+        assert gcs.blobs == {}
+        assert store.stats()["remote_failures"] == 1
+        assert store.stats()["deduplicated"] == 0
+
+        # 객체를 저장할 수 있게 되면 참조도 씁니다.
+        gcs.failing.clear()
+        assert store.put_remote("20260101000001", "main.html", ref, blob) is True
+        assert any("/refs/" in name for name in gcs.blobs)
+
+
+def test_corrupt_local_object_is_fetched_again():
+    with tempfile.TemporaryDirectory() as directory:
+        gcs = GCS()
+        store = make_store(directory, gcs)
+        ref = store.put("20260101000001", "main.html", b"<html>original</html>")
+        Path(store._object_path(ref["sha256"])).write_bytes(b"broken")
+        # 손상된 로컬 객체는 버리고 GCS에서 다시 읽습니다.
+        assert store.get("20260101000001", "main.html") == b"<html>original</html>"
+        assert store.stats()["corrupt"] == 1
+
+
+def test_read_through_fetches_once():
+    async def main():
+        with tempfile.TemporaryDirectory() as directory:
+            store = make_store(directory, GCS())
+            calls = []
+
+            async def fetch():
+                calls.append(1)
+                await asyncio.sleep(0.01)
+                return b"<html>fetched</html>"
+
+            results = await asyncio.gather(*(store.read_through("20260101000001", "main.html", fetch) for _ in range(3)))
+            assert results == [b"<html>fetched</html>"] * 3
+            assert await store.read_through("20260101000001", "main.html", fetch) == b"<html>fetched</html>"
+            assert len(calls) == 1
+
+    asyncio.run(main())
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: ok")
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+CrawlerExecutor 동작 테스트 (백그라운드 작업 실패 기록)
+
+    python -m pytest tests/tests_executor.py -q
+    python tests/tests_executor.py
+"""
+
+import logging
+import sys
+
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "sayou"))
+
+from utils.executor import CrawlerExecutor
+
+
+class Records(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_submit_logs_failures():
+    handler = Records()
+    logger = logging.getLogger("utils.executor")
+    logger.addHandler(handler)
+    executor = CrawlerExecutor(max_workers=1)
+    try:
+        def upload():
+            raise OSError("bucket unavailable")
+
+        future = executor.submit(upload)
+        assert isinstance(future.exception(timeout=5), OSError)
+        executor.submit(lambda: None).result(timeout=5)
+        executor.shutdown(wait=True)
+
+        # 실패한 작업만 예외와 함께 기록합니다.
+        assert executor.stats()["failed"] == 1
+        assert len(handler.records) == 1
+        assert "upload" in handler.records[0].getMessage()
+        assert handler.records[0].exc_info[0] is OSError
+    finally:
+        logger.removeHandler(handler)
+        executor.shutdown()
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: ok")
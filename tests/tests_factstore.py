@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+FactStore 동작 테스트 (저장, 조회 조건, 최근 공시 우선)
+
+    python -m pytest tests/tests_factstore.py -q
+    python tests/tests_factstore.py
+"""
+
+import os
+import sys
+import tempfile
+
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "sayou"))
+
+pytest.importorskip("pyarrow.dataset")
+
+from utils.factstore import FactStore
+from utils.xbrl import FACT_COLUMNS, FactTable
+
+
+def fact(concept: str, label: str | None, start: str, end: str, amount: float, dimensions: str = "") -> dict:
+    return {
+        "concept": concept, "label": label, "context": f"C{end}{dimensions}",
+        "period_start": start, "period_end": end, "instant": False,
+        "dimensions": dimensions, "unit": "KRW", "decimals": "-6",
+        "value": str(int(amount)), "amount": amount,
+    }
+
+
+def table(*facts: dict) -> FactTable:
+    return FactTable({name: [item[name] for item in facts] for name in FACT_COLUMNS})
+
+
+# 2024년 사업보고서 (당기 2024, 전기 2023)
+REPORT_2024 = table(
+    fact("ifrs-full_Revenue", "매출액", "2024-01-01", "2024-12-31", 300.0),
+    fact("ifrs-full_Revenue", "매출액", "2023-01-01", "2023-12-31", 250.0),
+    fact("ifrs-full_Revenue", "매출액", "2024-01-01", "2024-12-31", 120.0, "ifrs-full:SegmentsAxis=DSMember"),
+    fact("ifrs-full_ProfitLoss", "당기순이익", "2024-01-01", "2024-12-31", 30.0),
+)
+# 2025년 사업보고서 (전기 2024 값을 재작성)
+REPORT_2025 = table(
+    fact("ifrs-full_Revenue", "매출액", "2025-01-01", "2025-12-31", 330.0),
+    fact("ifrs-full_Revenue", "매출액", "2024-01-01", "2024-12-31", 310.0),
+)
+
+
+def test_put_and_filings():
+    with tempfile.TemporaryDirectory() as directory:
+        store = FactStore(directory)
+        assert not store.has("00126380", "20250311000001")
+        assert store.put("00126380", "20250311000001", 2024, 4, REPORT_2024) == 4
+        assert store.has("00126380", "20250311000001")
+        assert os.listdir(f"{directory}/00126380") == ["20250311000001.parquet"]
+
+        # 새 인스턴스는 디렉터리에서 저장된 공시를 읽습니다.
+        assert FactStore(directory).filings("00126380") == {"20250311000001"}
+        assert store.stats()["facts"] == 4
+
+        with pytest.raises(ValueError):
+            store.put("../etc", "20250311000001", 2024, 4, REPORT_2024)
+        with pytest.raises(ValueError):
+            store.put("00126380", "../20250311000001", 2024, 4, REPORT_2024)
+
+
+def test_latest_filing_wins():
+    with tempfile.TemporaryDirectory() as directory:
+        store = FactStore(directory)
+        # 저장 순서와 상관없이 접수번호가 큰 공시의 값을 사용합니다.
+        store.put("00126380", "20260310000001", 2025, 4, REPORT_2025)
+        store.put("00126380", "20250311000001", 2024, 4, REPORT_2024)
+
+        rows = store.query("00126380", ["ifrs-full_Revenue"])
+        assert [(row["period_end"], row["amount"], row["rcept_no"]) for row in rows] == [
+            ("2023-12-31", 250.0, "20250311000001"),
+            ("2024-12-31", 310.0, "20260310000001"),
+            ("2025-12-31", 330.0, "20260310000001"),
+        ]
+        assert "corp_code" not in rows[0] and "context" not in rows[0]
+
+
+def test_query_filters():
+    with tempfile.TemporaryDirectory() as directory:
+        store = FactStore(directory)
+        store.put("00126380", "20250311000001", 2024, 4, REPORT_2024)
+
+        # 레이블로도 조회하고, 기간 종료일의 연도로 거릅니다.
+        rows = store.query("00126380", ["매출액", "당기순이익"], start_year=2024, end_year=2024)
+        assert [(row["concept"], row["amount"]) for row in rows] == [
+            ("ifrs-full_ProfitLoss", 30.0),
+            ("ifrs-full_Revenue", 300.0),
+        ]
+
+        # 차원이 있는 값은 dimensions=True일 때만 반환합니다.
+        rows = store.query("00126380", ["ifrs-full_Revenue"], start_year=2024, dimensions=True)
+        assert [row["dimensions"] for row in rows] == ["", "ifrs-full:SegmentsAxis=DSMember"]
+
+        assert store.query("00126380", ["ifrs-full_Assets"]) == []
+        assert store.query("00164779", ["ifrs-full_Revenue"]) == []
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: ok")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+FilingIndex 동작 테스트 (제출 여부, 미제출 만료, 저장, 동시 조회)
+
+    python -m pytest tests/tests_filing_index.py -q
+    python tests/tests_filing_index.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "sayou"))
+
+from utils.filing_index import KST, FilingIndex, negative_ttl
+
+
+def test_status_and_expiry():
+    with tempfile.TemporaryDirectory() as directory:
+        index = FilingIndex(f"{directory}/filing_index.json")
+        index.mark_filed("00126380", "dividends", 2025, 4, "20260310000001")
+        index.mark_not_filed("00126380", "dividends", 2026, 1)
+        assert index.status("00126380", "dividends", 2025, 4) is True
+        assert index.status("00126380", "dividends", 2026, 1) is False
+        assert index.status("00126380", "dividends", 2025, 3) is None
+
+        # 만료된 미제출 항목은 지우고 알 수 없음으로 처리합니다.
+        index._entries["00126380:dividends:2026Q1"]["expires_at"] = time.time() - 1
+        assert index.status("00126380", "dividends", 2026, 1) is None
+        assert index.stats()["entries"] == 1
+
+
+def test_negative_ttl_follows_filing_calendar():
+    # 보고 기간 중에는 기간 종료일까지, 제출 기한 전후에는 15분입니다.
+    assert negative_ttl(2026, 1, datetime(2026, 3, 31, 23, 0, tzinfo=KST)) == 3600.0
+    assert negative_ttl(2026, 1, datetime(2026, 5, 14, tzinfo=KST)) == 15 * 60.0
+    assert negative_ttl(2024, 4, datetime(2026, 1, 1, tzinfo=KST)) == 7 * 86400.0
+
+
+def test_save_round_trip_and_dirty():
+    with tempfile.TemporaryDirectory() as directory:
+        filename = f"{directory}/filing_index.json"
+        index = FilingIndex(filename, save_interval=0)
+        assert not index.dirty
+        index.mark_filed("00126380", "financial_statements", 2025, 4, "20260310000001")
+        assert index.dirty
+        index.save()
+        assert not index.dirty
+        assert os.listdir(directory) == ["filing_index.json"]
+        with open(filename, encoding="utf-8") as json_file:
+            assert json.load(json_file)["00126380:financial_statements:2025Q4"]["rcept_no"] == "20260310000001"
+
+        reloaded = FilingIndex(filename)
+        assert reloaded.lookup("00126380", "financial_statements", 2025, 4)["rcept_no"] == "20260310000001"
+        assert not reloaded.dirty
+
+
+def test_concurrent_lookups_and_updates():
+    with tempfile.TemporaryDirectory() as directory:
+        index = FilingIndex(f"{directory}/filing_index.json")
+        errors = []
+
+        def writer():
+            for quarter in range(2000):
+                index.mark_not_filed("00126380", "dividends", 2000 + quarter // 4, quarter % 4 + 1)
+
+        def reader():
+            try:
+                for _ in range(2000):
+                    index.lookup("00126380", "dividends", 2000, 1)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        stats = index.stats()
+        assert stats["hits"] + stats["misses"] == 4 * 2000
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: ok")
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+BQManager.load_dataframe 테스트 (임시 테이블 + MERGE, 실패 시 로컬 중복 제거)
+
+    python -m pytest tests/tests_gcpmanager.py -q
+    python tests/tests_gcpmanager.py
+"""
+
+import sys
+
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "sayou"))
+
+pytest.importorskip("google.cloud.bigquery")
+
+import pandas as pd
+
+from google.cloud import bigquery, exceptions
+
+from utils.gcpmanager import BQManager
+
+TARGET = "sayouzone-ai.stocks.dividends"
+SCHEMA = [
+    bigquery.SchemaField("corp_code", "STRING"),
+    bigquery.SchemaField("year", "INTEGER"),
+    bigquery.SchemaField("dps", "FLOAT"),
+]
+
+
+class Job:
+    def __init__(self, frame: pd.DataFrame | None = None, error: Exception | None = None):
+        self.frame = frame
+        self.error = error
+        self.num_dml_affected_rows = 1
+
+    def result(self):
+        if self.error:
+            raise self.error
+        return self
+
+    def to_dataframe(self) -> pd.DataFrame:
+        return self.frame
+
+
+class Client:
+    """BigQuery 클라이언트 호출을 기록하는 가짜 클라이언트"""
+
+    def __init__(self, existing: pd.DataFrame | None = None, merge_error: Exception | None = None):
+        self.tables = {TARGET: bigquery.Table(TARGET, schema=SCHEMA)}
+        self.existing = existing
+        self.merge_error = merge_error
+        self.loads: list[tuple[str, pd.DataFrame]] = []
+        self.queries: list[str] = []
+        self.deleted: list[str] = []
+        self.updated: list[list[str]] = []
+
+    def get_table(self, table_id: str) -> bigquery.Table:
+        if table_id not in self.tables:
+            raise exceptions.NotFound(table_id)
+        return self.tables[table_id]
+
+    def create_table(self, table: bigquery.Table):
+        self.tables[f"{table.project}.{table.dataset_id}.{table.table_id}"] = table
+
+    def update_table(self, table: bigquery.Table, fields: list[str]) -> bigquery.Table:
+        self.updated.append([field.name for field in table.schema])
+        return table
+
+    def load_table_from_dataframe(self, dataframe: pd.DataFrame, destination: str, job_config=None) -> Job:
+        self.loads.append((destination, dataframe))
+        if destination != TARGET:
+            # 새 열(자동 감지)은 임시 테이블의 스키마에 추가됩니다.
+            known = {field.name for field in self.tables[destination].schema}
+            self.tables[destination].schema = list(self.tables[destination].schema) + [
+                bigquery.SchemaField(name, "STRING") for name in dataframe.columns if name not in known
+            ]
+        return Job()
+
+    def query(self, query: str, job_config=None) -> Job:
+        self.queries.append(query)
+        if query.startswith("MERGE"):
+            return Job(error=self.merge_error)
+        return Job(frame=self.existing)
+
+    def delete_table(self, table_id: str, not_found_ok: bool = False):
+        self.deleted.append(table_id)
+        self.tables.pop(table_id, None)
+
+
+def manager(client: Client) -> BQManager:
+    bq = BQManager.__new__(BQManager)
+    bq.project_id = "sayouzone-ai"
+    bq.dataset_id = "stocks"
+    bq._tables = {}
+    bq.bq_client = client
+    return bq
+
+
+def test_merge_query():
+    query = BQManager._merge_query(TARGET, f"{TARGET}_staging", ["corp_code", "year", "dps"], ["corp_code", "year"], upsert=False)
+    assert query == (
+        f"MERGE `{TARGET}` T\nUSING `{TARGET}_staging` S\n"
+        "ON T.`corp_code` IS NOT DISTINCT FROM S.`corp_code` AND T.`year` IS NOT DISTINCT FROM S.`year`\n"
+        "WHEN NOT MATCHED THEN INSERT (`corp_code`, `year`, `dps`) VALUES (S.`corp_code`, S.`year`, S.`dps`)"
+    )
+
+    # upsert는 같은 키의 행을 하나만 남기고, 키가 아닌 열을 갱신합니다.
+    query = BQManager._merge_query(TARGET, f"{TARGET}_staging", ["corp_code", "year", "dps"], ["corp_code", "year"], upsert=True)
+    assert "ROW_NUMBER() OVER (PARTITION BY `corp_code`, `year`)" in query
+    assert "WHEN MATCHED THEN UPDATE SET `dps` = S.`dps`\n" in query
+
+
+def test_load_dataframe_merges_through_staging_table():
+    client = Client()
+    frame = pd.DataFrame({"corp_code": ["00126380"], "year": [2025], "dps": [1444.0], "note": ["결산배당"]})
+    assert manager(client).load_dataframe(frame, "dividends", deduplicate_on=["corp_code", "year"])
+
+    staging_id, loaded = client.loads[0]
+    assert staging_id.startswith(f"{TARGET}_staging_")
+    assert loaded is frame
+    # 임시 테이블에서 자동 감지된 새 열은 대상 테이블에도 추가합니다.
+    assert client.updated == [["corp_code", "year", "dps", "note"]]
+    assert client.queries[0].startswith(f"MERGE `{TARGET}` T\nUSING `{staging_id}` S\n")
+    assert "`note`" in client.queries[0]
+    assert client.deleted == [staging_id]
+
+
+def test_merge_failure_falls_back_to_key_query():
+    existing = pd.DataFrame({"corp_code": ["00126380"], "year": [2024]})
+    client = Client(existing=existing, merge_error=RuntimeError("MERGE quota"))
+    frame = pd.DataFrame({"corp_code": ["00126380", "00126380"], "year": [2024, 2025], "dps": [1446.0, 1444.0]})
+    assert manager(client).load_dataframe(frame, "dividends", deduplicate_on=["corp_code", "year"])
+
+    # 임시 테이블은 실패해도 삭제하고, 이미 있는 키의 행만 빼고 적재합니다.
+    staging_id = client.loads[0][0]
+    assert client.deleted == [staging_id]
+    assert client.queries[1].startswith("SELECT DISTINCT `corp_code`, `year`")
+    destination, loaded = client.loads[1]
+    assert destination == TARGET
+    assert loaded["year"].tolist() == [2025]
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: ok")
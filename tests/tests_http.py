@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+공유 HTTP 세션 테스트 (스레드별 headers, 어댑터 공유)
+
+    python -m pytest tests/tests_http.py -q
+    python tests/tests_http.py
+"""
+
+import sys
+import threading
+
+from pathlib import Path
+
+import requests
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "sayou"))
+
+from utils.http import USER_AGENT, PooledAdapter, create_session
+
+
+def prepared_referer(session: requests.Session) -> str | None:
+    """session.headers를 적용한 요청의 Referer"""
+    return session.prepare_request(requests.Request("GET", "https://dart.fss.or.kr/")).headers.get("Referer")
+
+
+def test_referer_does_not_leak_between_threads():
+    session = create_session()
+    barrier = threading.Barrier(2)
+    results = {}
+
+    def worker(name: str, referer: str | None):
+        barrier.wait()
+        # OpenDartClient._get과 같이 referer가 있으면 세션 headers를 바꿉니다.
+        if referer:
+            session.headers.update({"Referer": referer})
+        barrier.wait()
+        results[name] = prepared_referer(session)
+
+    threads = [
+        threading.Thread(target=worker, args=("viewer", "https://dart.fss.or.kr/dsaf001/main.do?rcpNo=1")),
+        threading.Thread(target=worker, args=("api", None)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == {"viewer": "https://dart.fss.or.kr/dsaf001/main.do?rcpNo=1", "api": None}
+    assert "Referer" not in session.headers
+
+
+def test_threads_share_defaults_and_adapters():
+    session = create_session()
+    adapters = []
+    user_agents = []
+
+    def worker():
+        adapters.append(session.get_adapter("https://opendart.fss.or.kr/api/list.json"))
+        user_agents.append(session.headers["User-Agent"])
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    worker()
+
+    assert user_agents == [USER_AGENT, USER_AGENT]
+    assert adapters[0] is adapters[1] and isinstance(adapters[0], PooledAdapter)
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: ok")
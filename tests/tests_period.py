@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+PeriodResolver 동작 테스트 (최근 분기 탐색, 요청 취소)
+
+    python -m pytest tests/tests_period.py -q
+    python tests/tests_period.py
+"""
+
+import asyncio
+import gc
+import sys
+
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "sayou"))
+
+from utils.period import PeriodResolver, candidate_periods
+
+
+class Fetch:
+    """분기별 결과를 돌려주는 가짜 조회 함수 (동시 요청 수와 취소 여부를 기록합니다)"""
+
+    def __init__(self, data: dict, delays: dict | None = None, errors: set | None = None):
+        self.data = data
+        self.delays = delays or {}
+        self.errors = errors or set()
+        self.calls: list[tuple[int, int]] = []
+        self.cancelled: list[tuple[int, int]] = []
+        self.running = 0
+        self.max_running = 0
+
+    async def __call__(self, year: int, quarter: int) -> list:
+        period = (year, quarter)
+        self.calls.append(period)
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delays.get(period, 0.01))
+        except asyncio.CancelledError:
+            self.cancelled.append(period)
+            raise
+        finally:
+            self.running -= 1
+        if period in self.errors:
+            raise RuntimeError(f"fetch failed: {year}Q{quarter}")
+        return self.data.get(period, [])
+
+
+def test_candidate_periods():
+    assert candidate_periods(2026, 2, 4) == [(2026, 2), (2026, 1), (2025, 4), (2025, 3)]
+
+
+def test_newest_non_empty_period_wins():
+    async def main():
+        fetch = Fetch(
+            {(2026, 1): ["2026Q1"], (2025, 4): ["2025Q4"]},
+            delays={(2026, 3): 0.05, (2025, 4): 1.0, (2025, 3): 1.0},
+        )
+        result = await PeriodResolver(max_steps=5, width=5).resolve(fetch, 2026, 3)
+        assert result == (2026, 1, ["2026Q1"])
+        # 과거 분기는 동시에 시작했지만 결과를 찾은 뒤 취소합니다.
+        assert len(fetch.calls) == 5
+        await asyncio.sleep(0.01)
+        assert sorted(fetch.cancelled) == [(2025, 3), (2025, 4)]
+
+    asyncio.run(main())
+
+
+def test_default_is_sequential():
+    async def main():
+        fetch = Fetch({(2026, 2): ["2026Q2"], (2026, 1): ["2026Q1"]})
+        result = await PeriodResolver(max_steps=5).resolve(fetch, 2026, 3)
+        assert result == (2026, 2, ["2026Q2"])
+        # 결과를 찾은 분기보다 과거는 요청하지 않습니다.
+        assert fetch.calls == [(2026, 3), (2026, 2)]
+        assert fetch.max_running == 1
+
+    asyncio.run(main())
+
+
+def test_known_filed_period_disables_speculation():
+    async def main():
+        fetch = Fetch({(2026, 1): ["2026Q1"]})
+        status = {(2026, 1): True}
+        resolver = PeriodResolver(max_steps=5, width=5)
+        result = await resolver.resolve(fetch, 2026, 3, status=lambda y, q: status.get((y, q)))
+        assert result == (2026, 1, ["2026Q1"])
+        assert fetch.calls == [(2026, 3), (2026, 2), (2026, 1)]
+        assert fetch.max_running == 1
+
+    asyncio.run(main())
+
+
+def test_all_empty_returns_oldest_candidate():
+    async def main():
+        result = await PeriodResolver(max_steps=3).resolve(Fetch({}), 2026, 1)
+        assert result == (2025, 3, [])
+
+    asyncio.run(main())
+
+
+def test_status_skips_unfiled_and_stops_at_filed():
+    async def main():
+        fetch = Fetch({(2026, 1): ["2026Q1"]})
+        status = {(2026, 3): False, (2026, 2): None, (2026, 1): True}
+        result = await PeriodResolver(max_steps=5).resolve(fetch, 2026, 3, status=lambda y, q: status.get((y, q)))
+        assert result == (2026, 1, ["2026Q1"])
+        # 미제출 분기는 조회하지 않고, 제출된 분기보다 과거는 조회하지 않습니다.
+        assert sorted(fetch.calls) == [(2026, 1), (2026, 2)]
+
+    asyncio.run(main())
+
+
+def test_exact_fetches_only_requested_period():
+    async def main():
+        fetch = Fetch({(2025, 4): ["2025Q4"]})
+        resolver = PeriodResolver(max_steps=5)
+        assert await resolver.resolve(fetch, 2026, 1, exact=True) == (2026, 1, [])
+        assert fetch.calls == [(2026, 1)]
+        assert await resolver.resolve(fetch, 2025, 4, exact=True, status=lambda y, q: False) == (2025, 4, [])
+        assert fetch.calls == [(2026, 1)]
+
+    asyncio.run(main())
+
+
+def test_width_limits_concurrent_requests():
+    async def main():
+        fetch = Fetch({(2025, 3): ["2025Q3"]})
+        result = await PeriodResolver(max_steps=5, width=2).resolve(fetch, 2026, 3)
+        assert result == (2025, 3, ["2025Q3"])
+        assert fetch.max_running == 2
+        assert len(fetch.calls) == 5
+
+    asyncio.run(main())
+
+
+def test_abandoned_failures_are_retrieved():
+    async def main():
+        loop = asyncio.get_running_loop()
+        unhandled = []
+        loop.set_exception_handler(lambda loop, context: unhandled.append(context))
+
+        # 결과를 찾은 뒤 끝나는 과거 분기 요청이 실패해도 경고를 남기지 않습니다.
+        fetch = Fetch({(2026, 3): ["2026Q3"]}, delays={(2026, 3): 0.05}, errors={(2026, 2), (2026, 1)})
+        result = await PeriodResolver(max_steps=3, width=3).resolve(fetch, 2026, 3)
+        assert result == (2026, 3, ["2026Q3"])
+        del fetch
+        await asyncio.sleep(0.05)
+        gc.collect()
+        assert unhandled == []
+
+    asyncio.run(main())
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: ok")
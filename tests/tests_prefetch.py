@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+FilingPrefetcher 동작 테스트 (제출 기간, 워터마크와 대기 목록 저장)
+
+    python -m pytest tests/tests_prefetch.py -q
+    python tests/tests_prefetch.py
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+
+from datetime import date
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "sayou"))
+
+from utils.prefetch import PREFETCH_REPORTS, FilingPrefetcher, filing_seasons
+
+# 1분기 보고서 제출 기간 (기한 5월 15일)
+TODAY = date(2026, 5, 10)
+
+
+class Client:
+    """공시검색(list.json) 응답을 최신순으로 돌려주는 가짜 클라이언트"""
+
+    def __init__(self, disclosures: list[dict]):
+        self.disclosures = sorted(disclosures, key=lambda item: item["rcept_no"], reverse=True)
+        self.requests = 0
+
+    async def get_json(self, url: str, params: dict) -> dict:
+        self.requests += 1
+        return {"status": "000", "total_page": 1, "total_count": len(self.disclosures), "list": self.disclosures}
+
+
+class FilingIndex:
+    def __init__(self):
+        self.filed: set[tuple] = set()
+
+    def status(self, corp_code: str, report: str, year: int, quarter: int) -> bool | None:
+        return True if (corp_code, report, year, quarter) in self.filed else None
+
+
+class Limiter:
+    def remaining(self, level: int) -> int:
+        return 1000
+
+
+def make_prefetcher(client: Client, filing_index: FilingIndex, filename: str, warmed: list) -> FilingPrefetcher:
+    async def resolve(stock: str) -> str:
+        return {"005930": "00126380"}.get(stock)
+
+    async def warm(report: str, corp_code: str, year: int, quarter: int):
+        warmed.append(report)
+        if report == "financial_statements":
+            filing_index.filed.add((corp_code, report, year, quarter))
+
+    return FilingPrefetcher(
+        client, filing_index, Limiter(), resolve=resolve, warm=warm,
+        watchlist=["005930"], interval=1, idle_interval=1, budget=100, filename=filename,
+    )
+
+
+def test_filing_seasons():
+    assert filing_seasons(TODAY) == [(2026, 1)]
+    assert filing_seasons(date(2026, 8, 1)) == [(2026, 2)]
+
+
+def test_watermark_and_pending_survive_restart():
+    async def main():
+        with tempfile.TemporaryDirectory() as directory:
+            filename = f"{directory}/prefetch.json"
+            client = Client([
+                {"rcept_no": "20260508000001", "corp_code": "00126380", "report_nm": "분기보고서 (2026.03)"},
+                {"rcept_no": "20260508000002", "corp_code": "00999999", "report_nm": "분기보고서 (2026.03)"},
+            ])
+            filing_index = FilingIndex()
+            warmed = []
+            prefetcher = make_prefetcher(client, filing_index, filename, warmed)
+            assert await prefetcher.run_once(TODAY) == 1
+            assert sorted(warmed) == sorted(PREFETCH_REPORTS)
+            assert os.listdir(directory) == ["prefetch.json"]
+
+            # 다시 시작해도 워터마크와 아직 조회하지 못한 보고서가 남아 있습니다.
+            restarted = make_prefetcher(client, filing_index, filename, warmed)
+            assert restarted.watermark == "20260508000002"
+            pending = restarted._pending[("00126380", 2026, 1)]
+            assert pending.reports == [report for report in PREFETCH_REPORTS if report != "financial_statements"]
+            assert pending.attempts == 1
+
+            # 워터마크 이후의 공시가 없으므로 대기 목록만 다시 시도합니다.
+            warmed.clear()
+            await restarted.run_once(TODAY)
+            assert "financial_statements" not in warmed
+            assert restarted._pending[("00126380", 2026, 1)].attempts == 2
+
+    asyncio.run(main())
+
+
+def test_unreadable_state_file_is_ignored():
+    with tempfile.TemporaryDirectory() as directory:
+        filename = f"{directory}/prefetch.json"
+        Path(filename).write_text("{broken", encoding="utf-8")
+        prefetcher = make_prefetcher(Client([]), FilingIndex(), filename, [])
+        assert prefetcher.watermark is None and not prefetcher._pending
+
+        prefetcher.watermark = "20260508000001"
+        prefetcher.save()
+        with open(filename, encoding="utf-8") as json_file:
+            assert json.load(json_file)["watermark"] == "20260508000001"
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: ok")
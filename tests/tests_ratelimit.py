@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+RateLimiter 동작 테스트 (우선순위, 일일 한도, 키 순환)
+
+    python -m pytest tests/tests_ratelimit.py -q
+    python tests/tests_ratelimit.py
+"""
+
+import asyncio
+import sys
+import threading
+import time
+
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "sayou"))
+
+from utils import ratelimit
+from utils.ratelimit import (
+    BACKGROUND,
+    INTERACTIVE,
+    KeyPool,
+    KeyRejectedError,
+    QuotaCounter,
+    RateLimiter,
+    RateLimitError,
+    TokenBucket,
+    key_id,
+)
+
+
+class Store:
+    """요청 수를 메모리에 더하는 가짜 저장소 (delay초 동안 응답을 기다립니다)"""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.count = 0
+        self.deltas: list[int] = []
+        self._lock = threading.Lock()
+
+    def add(self, day: str, delta: int) -> int | None:
+        time.sleep(self.delay)
+        if self.fail:
+            raise OSError("store unavailable")
+        with self._lock:
+            self.count += delta
+            self.deltas.append(delta)
+            return self.count
+
+
+def test_background_keeps_reserve():
+    # 백그라운드 요청은 1 + reserve * burst = 3개의 토큰이 있어야 가져갑니다.
+    bucket = TokenBucket(rate=10, burst=4, reserve=0.5)
+    assert bucket.acquire(BACKGROUND) < 0.01
+    assert bucket.acquire(BACKGROUND) < 0.01
+    # 남은 토큰 2개는 도구 호출 몫입니다.
+    assert bucket.acquire(INTERACTIVE) < 0.01
+    assert bucket.acquire(BACKGROUND) >= 0.1
+
+
+def test_background_yields_to_waiting_interactive():
+    async def main():
+        bucket = TokenBucket(rate=20, burst=4, reserve=0.25)
+        for _ in range(4):
+            bucket.acquire(INTERACTIVE)
+
+        order = []
+
+        async def acquire(level: int):
+            await bucket.acquire_async(level)
+            order.append(level)
+
+        # 백그라운드 요청이 먼저 기다려도 도구 호출이 먼저 토큰을 받습니다.
+        background = asyncio.create_task(acquire(BACKGROUND))
+        await asyncio.sleep(0)
+        await asyncio.gather(acquire(INTERACTIVE), background)
+        assert order == [INTERACTIVE, BACKGROUND]
+
+    asyncio.run(main())
+
+
+def test_quota_limit_and_background_share():
+    quota = QuotaCounter(10, background_share=0.5)
+    for _ in range(5):
+        quota.consume(BACKGROUND)
+    with pytest.raises(RateLimitError):
+        quota.consume(BACKGROUND)
+    assert quota.remaining(BACKGROUND) == 0
+
+    # 도구 호출은 전체 한도까지 사용할 수 있습니다.
+    for _ in range(5):
+        quota.consume(INTERACTIVE)
+    with pytest.raises(RateLimitError):
+        quota.consume(INTERACTIVE)
+    assert quota.stats()["rejected"] == 2
+
+
+def test_quota_rolls_over_at_kst_midnight():
+    today = ratelimit.kst_today
+    ratelimit.kst_today = lambda: "20260930"
+    try:
+        quota = QuotaCounter(2)
+        quota.consume(INTERACTIVE)
+        quota.exhaust()
+        with pytest.raises(RateLimitError):
+            quota.consume(INTERACTIVE)
+
+        # 날짜(KST)가 바뀌면 요청 수와 소진 상태를 초기화합니다.
+        ratelimit.kst_today = lambda: "20261001"
+        quota.consume(INTERACTIVE)
+        stats = quota.stats()
+        assert (stats["day"], stats["count"], stats["exhausted"]) == ("20261001", 1, False)
+    finally:
+        ratelimit.kst_today = today
+
+
+def test_quota_flush_and_exhaust_update_store():
+    store = Store()
+    quota = QuotaCounter(100, store, flush_every=10)
+    for _ in range(3):
+        quota.consume(INTERACTIVE)
+    # 처음에는 저장소의 오늘 합계를 읽어야 합니다.
+    assert quota.due()
+    quota.flush(force=False)
+    assert store.deltas == [3]
+    assert not quota.due()
+
+    # 다른 인스턴스가 사용한 요청 수를 반영합니다.
+    store.count += 50
+    quota.consume(INTERACTIVE)
+    quota.flush()
+    assert quota.remaining() == 100 - 54
+
+    # 한도 초과를 알리면 남은 한도를 저장소에 더해 다른 인스턴스도 멈추게 합니다.
+    quota.exhaust()
+    assert quota.due()
+    quota.flush(force=False)
+    assert store.count == 100
+    with pytest.raises(RateLimitError):
+        quota.consume(INTERACTIVE)
+
+
+def test_quota_flush_failure_is_retried_later():
+    store = Store(fail=True)
+    quota = QuotaCounter(100, store, flush_interval=30.0)
+    quota.consume(INTERACTIVE)
+    quota.flush()
+    # 저장하지 못한 요청 수는 남겨 두고 flush_interval초 동안 다시 시도하지 않습니다.
+    assert quota._pending == 1
+    assert not quota.due()
+
+    store.fail = False
+    quota.flush()
+    assert store.deltas == [1]
+
+
+def test_key_pool_spreads_requests():
+    pool = KeyPool(100, store_factory=None)
+    pool.set_keys(["key-a", "key-b"])
+    assert [pool.acquire(INTERACTIVE) for _ in range(4)] == ["key-a", "key-b", "key-a", "key-b"]
+
+
+def test_key_pool_fails_over_exhausted_and_invalid_keys():
+    pool = KeyPool(100, store_factory=None, exhaust_after=3, cooldown=0.0)
+    pool.set_keys(["key-a", "key-b", "key-c"])
+
+    # 020을 연속 세 번 받은 키는 오늘 사용하지 않습니다.
+    for _ in range(3):
+        pool.reject("key-a", "020")
+    assert pool.stats()[key_id("key-a")]["exhausted"] is True
+    assert {pool.acquire(INTERACTIVE) for _ in range(10)} == {"key-b", "key-c"}
+
+    # 사용할 수 없는 키는 바로 제외합니다.
+    pool.reject("key-b", "011")
+    assert {pool.acquire(INTERACTIVE) for _ in range(5)} == {"key-c"}
+
+    pool.reject("key-c", "901")
+    with pytest.raises(RateLimitError):
+        pool.acquire(INTERACTIVE)
+    assert pool.remaining() == 0
+
+
+def test_key_pool_cooldown_after_rate_limit():
+    pool = KeyPool(100, store_factory=None, exhaust_after=3, cooldown=60.0)
+    pool.set_keys(["key-a", "key-b"])
+    pool.reject("key-a", "020")
+    assert {pool.acquire(INTERACTIVE) for _ in range(4)} == {"key-b"}
+
+    # 정상 응답을 받으면 연속 횟수를 초기화합니다.
+    pool.success("key-a")
+    pool.reject("key-a", "020")
+    assert pool.stats()[key_id("key-a")]["exhausted"] is False
+
+
+def test_limiter_rejects_key_and_fails_over():
+    limiter = RateLimiter(rate=1000, burst=100, daily_limit=100, store_factory=None, exhaust_after=1)
+    limiter.set_keys(["key-a", "key-b"])
+    api_key = limiter.acquire()
+    with pytest.raises(KeyRejectedError):
+        limiter.after_response(api_key, 200, b'{"status":"020","message":"limit"}')
+    assert limiter.acquire() != api_key
+    limiter.after_response("key-b", 200, b'{"status":"000"}')
+    assert limiter.stats()["statuses"] == {"020": 1, "000": 1}
+
+
+def test_limiter_flushes_off_the_event_loop():
+    async def main():
+        store = Store(delay=0.2)
+        limiter = RateLimiter(rate=1000, burst=100, daily_limit=1000, store_factory=lambda api_key: store)
+        limiter.set_keys(["key-a"])
+        started = time.monotonic()
+        for _ in range(20):
+            await limiter.acquire_async()
+        # 저장소 응답(0.2초)을 기다리지 않습니다.
+        assert time.monotonic() - started < 0.1
+        return limiter, store
+
+    limiter, store = asyncio.run(main())
+    limiter.flush()
+    assert store.count == 20
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: ok")
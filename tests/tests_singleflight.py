@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+SingleFlight 동작 테스트 (요청 병합, 취소 전파)
+
+    python -m pytest tests/tests_singleflight.py -q
+    python tests/tests_singleflight.py
+"""
+
+import asyncio
+import sys
+
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "sayou"))
+
+from utils.singleflight import SingleFlight
+
+
+class Upstream:
+    """호출 수와 취소 여부를 기록하는 가짜 업스트림 호출"""
+
+    def __init__(self, delay: float = 0.05, result="data"):
+        self.delay = delay
+        self.result = result
+        self.started = 0
+        self.finished = 0
+        self.cancelled = 0
+
+    async def __call__(self):
+        self.started += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        self.finished += 1
+        return self.result
+
+
+def test_concurrent_calls_share_one_upstream():
+    async def main():
+        flights = SingleFlight()
+        upstream = Upstream()
+        results = await asyncio.gather(*(flights.do("key", upstream) for _ in range(5)))
+        assert results == ["data"] * 5
+        assert upstream.started == 1
+        assert flights.stats()["saved"] == 4
+        assert flights.stats()["in_flight"] == 0
+
+    asyncio.run(main())
+
+
+def test_last_waiter_cancel_cancels_upstream():
+    async def main():
+        flights = SingleFlight()
+        upstream = Upstream(delay=1.0)
+        first = asyncio.create_task(flights.do("key", upstream))
+        second = asyncio.create_task(flights.do("key", upstream))
+        await asyncio.sleep(0.01)
+
+        first.cancel()
+        await asyncio.sleep(0.01)
+        # 다른 요청이 기다리는 동안에는 호출을 유지합니다.
+        assert upstream.cancelled == 0
+
+        second.cancel()
+        await asyncio.sleep(0.01)
+        assert upstream.cancelled == 1
+        assert upstream.finished == 0
+        assert flights.stats()["cancelled"] == 1
+        assert flights.stats()["in_flight"] == 0
+
+    asyncio.run(main())
+
+
+def test_call_after_cancel_starts_new_upstream():
+    async def main():
+        flights = SingleFlight()
+        upstream = Upstream(delay=0.05)
+        waiter = asyncio.create_task(flights.do("key", upstream))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await asyncio.sleep(0.01)
+        # 취소된 호출에 합류하지 않고 새 호출을 시작합니다.
+        assert await flights.do("key", upstream) == "data"
+        assert upstream.started == 2
+        assert upstream.finished == 1
+
+    asyncio.run(main())
+
+
+def test_error_is_shared_by_waiters():
+    async def main():
+        flights = SingleFlight()
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream failed")
+
+        results = await asyncio.gather(*(flights.do("key", failing) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert flights.stats()["upstream"] == 1
+
+    asyncio.run(main())
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: ok")
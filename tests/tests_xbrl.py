@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+XBRL 패키지 파싱 테스트 (팩트, 문맥, 레이블)
+
+    python -m pytest tests/tests_xbrl.py -q
+    python tests/tests_xbrl.py
+"""
+
+import io
+import sys
+import zipfile
+
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src" / "sayou"))
+
+from utils.xbrl import parse_package, statement_labels
+
+INSTANCE = """<?xml version="1.0" encoding="UTF-8"?>
+<xbrli:xbrl xmlns:xbrli="http://www.xbrl.org/2003/instance"
+    xmlns:xbrldi="http://xbrl.org/2006/xbrldi"
+    xmlns:iso4217="http://www.xbrl.org/2003/iso4217"
+    xmlns:ifrs-full="http://xbrl.ifrs.org/taxonomy/2023-03-23/ifrs-full"
+    xmlns:entity00126380="http://dart.fss.or.kr/entity00126380">
+  <ifrs-full:Revenue contextRef="CFY2025" unitRef="KRW" decimals="-6">300870903000000</ifrs-full:Revenue>
+  <entity00126380:SegmentNote contextRef="CFY2025_DS" unitRef="KRW" decimals="-6">111000000</entity00126380:SegmentNote>
+  <xbrli:context id="CFY2025">
+    <xbrli:entity><xbrli:identifier scheme="http://dart.fss.or.kr">00126380</xbrli:identifier></xbrli:entity>
+    <xbrli:period><xbrli:startDate>2025-01-01</xbrli:startDate><xbrli:endDate>2025-12-31</xbrli:endDate></xbrli:period>
+  </xbrli:context>
+  <xbrli:context id="CFY2025_DS">
+    <xbrli:entity>
+      <xbrli:identifier scheme="http://dart.fss.or.kr">00126380</xbrli:identifier>
+      <xbrli:segment><xbrldi:explicitMember dimension="ifrs-full:SegmentsAxis">entity00126380:DSMember</xbrldi:explicitMember></xbrli:segment>
+    </xbrli:entity>
+    <xbrli:period><xbrli:startDate>2025-01-01</xbrli:startDate><xbrli:endDate>2025-12-31</xbrli:endDate></xbrli:period>
+  </xbrli:context>
+  <xbrli:unit id="KRW"><xbrli:measure>iso4217:KRW</xbrli:measure></xbrli:unit>
+</xbrli:xbrl>
+"""
+
+# 패키지의 레이블 링크베이스에는 회사 확장 개념만 있습니다.
+LABELS = """<?xml version="1.0" encoding="UTF-8"?>
+<link:linkbase xmlns:link="http://www.xbrl.org/2003/linkbase" xmlns:xlink="http://www.w3.org/1999/xlink">
+  <link:labelLink xlink:type="extended" xlink:role="http://www.xbrl.org/2003/role/link">
+    <link:loc xlink:type="locator" xlink:href="entity00126380.xsd#entity00126380_SegmentNote" xlink:label="loc_1"/>
+    <link:label xlink:type="resource" xlink:label="label_1" xlink:role="http://www.xbrl.org/2003/role/label" xml:lang="ko">부문 주석</link:label>
+    <link:label xlink:type="resource" xlink:label="label_1" xlink:role="http://www.xbrl.org/2003/role/terseLabel" xml:lang="ko">부문</link:label>
+    <link:labelArc xlink:type="arc" xlink:from="loc_1" xlink:to="label_1"/>
+  </link:labelLink>
+</link:linkbase>
+"""
+
+
+def package() -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("entity00126380_2025-12-31.xbrl", INSTANCE)
+        zf.writestr("entity00126380_2025-12-31_lab-ko.xml", LABELS)
+    return buffer.getvalue()
+
+
+def test_parse_facts_and_contexts():
+    rows = {row["concept"]: row for row in parse_package(package()).rows()}
+    revenue = rows["ifrs-full_Revenue"]
+    assert (revenue["period_start"], revenue["period_end"], revenue["instant"]) == ("2025-01-01", "2025-12-31", False)
+    assert (revenue["unit"], revenue["decimals"], revenue["amount"]) == ("KRW", "-6", 300870903000000.0)
+    assert rows["entity00126380_SegmentNote"]["dimensions"] == "ifrs-full:SegmentsAxis=entity00126380:DSMember"
+
+
+def test_standard_concepts_get_statement_labels():
+    table = parse_package(package())
+    labels = {row["concept"]: row["label"] for row in table.rows()}
+    # 패키지에는 표준 개념의 레이블이 없습니다.
+    assert labels == {"ifrs-full_Revenue": None, "entity00126380_SegmentNote": "부문 주석"}
+
+    statements = [
+        {"account_id": "ifrs-full_Revenue", "account_nm": "매출액 "},
+        {"account_id": "-표준계정코드 미사용-", "account_nm": "기타"},
+        {"account_id": "entity00126380_SegmentNote", "account_nm": "다른 이름"},
+    ]
+    assert table.fill_labels(statement_labels(statements)) == 1
+    labels = {row["concept"]: row["label"] for row in table.rows()}
+    # 패키지의 레이블은 바꾸지 않습니다.
+    assert labels == {"ifrs-full_Revenue": "매출액", "entity00126380_SegmentNote": "부문 주석"}
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"{name}: ok")